@@ -1,3 +1,25 @@
-from ja_timex.timex import TimexParser  # noqa
+from typing import TYPE_CHECKING, Any
 
-__all__ = ["timex"]
+if TYPE_CHECKING:
+    from ja_timex.timex import TimexParser  # noqa
+
+__all__ = ["timex", "TimexParser", "warmup"]
+
+
+def __getattr__(name: str) -> Any:
+    # import ja_timexの時点ではパーサーやパターンを読み込まず、TimexParserが参照された時点で読み込む
+    if name == "TimexParser":
+        from ja_timex.timex import TimexParser
+
+        return TimexParser
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def warmup() -> None:
+    """パターンの生成、和暦の辞書の読み込み、正規表現のコンパイルを事前に行う
+
+    これらは通常は初回のパース時に行われる。起動時にまとめてコストを払いたいサーバーなどで用いる。
+    """
+    from ja_timex.timex import TimexParser
+
+    TimexParser().prepare()
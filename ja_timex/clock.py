@@ -0,0 +1,58 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Optional
+
+
+class Clock(ABC):
+    """現在日時を返す時計
+
+    年が特定できない日付表現を日時に変換する際に、現在日時の代わりに用いる。
+    """
+
+    @abstractmethod
+    def now(self) -> datetime:
+        pass
+
+    @abstractmethod
+    def freeze(self) -> "FrozenClock":
+        """この時計の現在日時で固定した時計を返す
+
+        Returns:
+            FrozenClock: 固定した時計
+        """
+        pass
+
+
+class SystemClock(Clock):
+    """システムの現在日時を、ローカルのタイムゾーンで返す時計"""
+
+    def now(self) -> datetime:
+        return datetime.now().astimezone()
+
+    def freeze(self) -> "FrozenClock":
+        # 現在日時は最初に必要になった時点で一度だけ取得する
+        return FrozenClock(base_clock=self)
+
+
+class FrozenClock(Clock):
+    """常に同じ日時を返す時計
+
+    nowを指定しない場合は、最初にnow()が呼ばれた時点のbase_clockの日時で固定する。
+    一度のパースで得られた時間情報表現に同じ時計を共有させることで、時計の読み取りを一度にし、結果を揃える。
+
+    Args:
+        now (Optional[datetime]): 固定する日時
+        base_clock (Optional[Clock]): nowを指定しない場合に日時を取得する時計。Noneの場合はSystemClock
+    """
+
+    def __init__(self, now: Optional[datetime] = None, base_clock: Optional[Clock] = None) -> None:
+        self._now = now
+        self.base_clock = base_clock
+
+    def now(self) -> datetime:
+        if self._now is None:
+            self._now = (self.base_clock or SystemClock()).now()
+        return self._now
+
+    def freeze(self) -> "FrozenClock":
+        return self
@@ -0,0 +1,131 @@
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# type_codeとTIMEXのtypeの対応。これ以外のtypeはTimexColumns.type_namesの末尾に追加される
+default_type_names = ("DATE", "TIME", "DURATION", "SET")
+
+
+@dataclass
+class TimexColumns:
+    """複数の文字列から抽出した時間情報表現を列ごとに保持する
+
+    i番目の時間情報表現は、各列のi番目の要素で表される。
+    数値の列は標準ライブラリのarrayで保持するため、NumPyやpyarrowがなくても利用できる。
+
+    doc_id: 入力文字列のインデックス
+    start, end: 数字を規格化した文字列中でのspan
+    raw_start, raw_end: 規格化前の入力文字列中でのspan
+    type_code: type_names上のtypeのインデックス
+    """
+
+    doc_id: array = field(default_factory=lambda: array("q"))
+    start: array = field(default_factory=lambda: array("q"))
+    end: array = field(default_factory=lambda: array("q"))
+    raw_start: array = field(default_factory=lambda: array("q"))
+    raw_end: array = field(default_factory=lambda: array("q"))
+    type_code: array = field(default_factory=lambda: array("b"))
+    value: List[str] = field(default_factory=list)
+    text: List[str] = field(default_factory=list)
+    mod: List[Optional[str]] = field(default_factory=list)
+    freq: List[Optional[str]] = field(default_factory=list)
+    quant: List[Optional[str]] = field(default_factory=list)
+    type_names: List[str] = field(default_factory=lambda: list(default_type_names))
+
+    def __len__(self) -> int:
+        return len(self.doc_id)
+
+    def type_code_of(self, type_name: str) -> int:
+        """typeに対応するtype_codeを返す。未知のtypeの場合はtype_namesに追加する
+
+        Args:
+            type_name (str): TIMEXのtype
+
+        Returns:
+            int: type_code
+        """
+        try:
+            return self.type_names.index(type_name)
+        except ValueError:
+            self.type_names.append(type_name)
+            return len(self.type_names) - 1
+
+    @property
+    def type(self) -> List[str]:
+        return [self.type_names[type_code] for type_code in self.type_code]
+
+    def to_dict(self) -> Dict[str, List[Any]]:
+        """列名から値のリストへの辞書に変換する
+
+        Returns:
+            Dict[str, List[Any]]: 列ごとの値
+        """
+        return {
+            "doc_id": self.doc_id.tolist(),
+            "start": self.start.tolist(),
+            "end": self.end.tolist(),
+            "raw_start": self.raw_start.tolist(),
+            "raw_end": self.raw_end.tolist(),
+            "type": self.type,
+            "value": self.value,
+            "text": self.text,
+            "mod": self.mod,
+            "freq": self.freq,
+            "quant": self.quant,
+        }
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """列名からNumPyの配列への辞書に変換する
+
+        数値の列はコピーせずにarrayのバッファを共有する。文字列の列はobject型の配列となる。
+
+        Returns:
+            Dict[str, numpy.ndarray]: 列ごとの配列
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("to_numpy() requires numpy. Please install it with `pip install numpy`.")
+
+        columns = {
+            "doc_id": np.frombuffer(self.doc_id, dtype=np.int64),
+            "start": np.frombuffer(self.start, dtype=np.int64),
+            "end": np.frombuffer(self.end, dtype=np.int64),
+            "raw_start": np.frombuffer(self.raw_start, dtype=np.int64),
+            "raw_end": np.frombuffer(self.raw_end, dtype=np.int64),
+            "type_code": np.frombuffer(self.type_code, dtype=np.int8),
+        }
+        for name in ["value", "text", "mod", "freq", "quant"]:
+            strings = np.empty(len(self), dtype=object)
+            strings[:] = getattr(self, name)
+            columns[name] = strings
+        return columns
+
+    def to_arrow(self) -> Any:
+        """pyarrowのRecordBatchに変換する
+
+        typeの列はtype_namesを辞書とするDictionaryArrayとなる。
+
+        Returns:
+            pyarrow.RecordBatch: 列ごとの値を持つRecordBatch
+        """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("to_arrow() requires pyarrow. Please install it with `pip install pyarrow`.")
+
+        arrays = [
+            pa.array(self.doc_id, type=pa.int64()),
+            pa.array(self.start, type=pa.int64()),
+            pa.array(self.end, type=pa.int64()),
+            pa.array(self.raw_start, type=pa.int64()),
+            pa.array(self.raw_end, type=pa.int64()),
+            pa.DictionaryArray.from_arrays(pa.array(self.type_code, type=pa.int8()), pa.array(self.type_names)),
+            pa.array(self.value, type=pa.string()),
+            pa.array(self.text, type=pa.string()),
+            pa.array(self.mod, type=pa.string()),
+            pa.array(self.freq, type=pa.string()),
+            pa.array(self.quant, type=pa.string()),
+        ]
+        names = ["doc_id", "start", "end", "raw_start", "raw_end", "type", "value", "text", "mod", "freq", "quant"]
+        return pa.RecordBatch.from_arrays(arrays, names=names)
@@ -0,0 +1,377 @@
+import re
+from abc import ABC, abstractmethod
+from itertools import chain
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple, Type, Union
+
+from ja_timex.pattern.place import Pattern
+from ja_timex.regex_backend import RegexBackend, get_regex_backend
+from ja_timex.util import build_trie_regex, default_max_repeat, get_max_width, is_window_searchable
+
+# all_patternsを平坦化した(type_name, Pattern)の組
+PatternEntry = Tuple[str, Pattern]
+
+
+class KeywordMatcher:
+    """固定の文字列のみにマッチするパターンを、文字列の1回の走査でまとめて抽出する
+
+    「先日」「毎週」のようなパターンの正規表現をそれぞれfinditerで適用する代わりに、
+    すべてのパターンの文字列をまとめたトライ木で出現位置を探す。
+    出現位置ではそのパターンの正規表現をmatchで適用するため、得られるre.Matchはfinditerの結果と同じになる。
+
+    Args:
+        entry2keywords (Dict[int, List[str]]): パターンのインデックスから、そのパターンがマッチする文字列への辞書
+        regex_backend (Optional[RegexBackend]): 正規表現のバックエンド。Noneの場合はre
+    """
+
+    def __init__(self, entry2keywords: Dict[int, List[str]], regex_backend: Optional[RegexBackend] = None) -> None:
+        self.entry2keywords = entry2keywords
+        self.regex_backend = get_regex_backend(regex_backend)
+
+        # 文字ごとのトライ木。空文字列のキーには、そこで終わる文字列にマッチするパターンのインデックスを持つ
+        self.trie: Dict[str, Any] = {}
+        for entry_i, keywords in entry2keywords.items():
+            for keyword in keywords:
+                node = self.trie
+                for char in keyword:
+                    node = node.setdefault(char, {})
+                node.setdefault("", []).append(entry_i)
+        self.max_keyword_length = max(
+            (len(keyword) for keywords in entry2keywords.values() for keyword in keywords), default=0
+        )
+        # いずれかの文字列が出現する位置を探すための正規表現
+        self.locator = (
+            self.regex_backend.compile(
+                build_trie_regex(keyword for keywords in entry2keywords.values() for keyword in keywords)
+            )
+            if entry2keywords
+            else None
+        )
+
+    def find(self, processed_text: str) -> Dict[int, List[int]]:
+        """文字列が出現する位置を、重なりを含めてすべて探す
+
+        Args:
+            processed_text (str): 数字を規格化した入力文字列
+
+        Returns:
+            Dict[int, List[int]]: パターンのインデックスから、出現位置のリストへの辞書
+        """
+        entry2positions: Dict[int, List[int]] = {}
+        if self.locator is None:
+            return entry2positions
+        locate = self.locator.search
+        position = 0
+        while True:
+            located = locate(processed_text, position)
+            if located is None:
+                break
+            position = located.start()
+
+            # 同じ位置から始まる、長さの異なる文字列をすべて取得する
+            node = self.trie
+            for char in processed_text[position : position + self.max_keyword_length]:
+                child = node.get(char)
+                if child is None:
+                    break
+                node = child
+                for entry_i in node.get("", []):
+                    entry2positions.setdefault(entry_i, []).append(position)
+            position += 1
+        return entry2positions
+
+    def extract(self, processed_text: str, entries: List[PatternEntry]) -> Dict[int, List[re.Match]]:
+        """各パターンについて、finditerと同じ重ならないマッチの列を返す
+
+        Args:
+            processed_text (str): 数字を規格化した入力文字列
+            entries (List[PatternEntry]): 抽出に用いる(type_name, Pattern)の組
+
+        Returns:
+            Dict[int, List[re.Match]]: パターンのインデックスから、マッチのリストへの辞書
+        """
+        entry2matches = {}
+        for entry_i, positions in self.find(processed_text).items():
+            match = entries[entry_i][1].compile(self.regex_backend).match
+            re_matches = []
+            next_start_i = 0
+            for position in positions:
+                # finditerと同様に、同じパターンの前回のマッチと重なる位置は無視する
+                if position < next_start_i:
+                    continue
+                re_match = match(processed_text, position)
+                if re_match is None:
+                    # 直前が数字のため、パターンの後読みによってマッチしない
+                    continue
+                re_matches.append(re_match)
+                next_start_i = re_match.end()
+            entry2matches[entry_i] = re_matches
+        return entry2matches
+
+
+class BaseExtractor(ABC):
+    """正規表現のパターンを文字列に適用し、時間情報表現の候補を抽出する
+
+    抽出結果は {"type_name": str, "re_match": re.Match, "pattern": Pattern} のリストで、
+    all_patternsに登録された順(type_name順、パターン順、出現位置順)に並ぶ。
+    TimexParser._drop_duplicatesは同じ長さの候補をこの順序で優先するため、
+    どのExtractorも同じ順序で候補を返す必要がある。
+
+    固定の文字列のみにマッチするパターンは、正規表現を個別に適用せずにKeywordMatcherでまとめて抽出する。
+
+    Args:
+        all_patterns (Dict[str, List[Pattern]]): type_nameからPatternのリストへの辞書
+        use_keyword_matcher (bool): Falseの場合は、すべてのパターンに正規表現を適用する
+        regex_backend (Union[None, str, RegexBackend]): 正規表現のバックエンド。Noneの場合はre
+    """
+
+    # KeywordMatcherの対象とするパターンの、マッチする文字列の数の上限
+    max_keywords_per_pattern = 16
+
+    def __init__(
+        self,
+        all_patterns: Dict[str, List[Pattern]],
+        use_keyword_matcher: bool = True,
+        regex_backend: Union[None, str, RegexBackend] = None,
+    ) -> None:
+        self.regex_backend = get_regex_backend(regex_backend)
+        self.entries: List[PatternEntry] = [
+            (type_name, pattern) for type_name, patterns in all_patterns.items() for pattern in patterns
+        ]
+        self.entry_required_chars = [pattern.required_chars for _, pattern in self.entries]
+        self.all_required_chars: FrozenSet[str] = frozenset().union(*self.entry_required_chars)
+
+        entry2keywords = {}
+        if use_keyword_matcher:
+            for entry_i, (_, pattern) in enumerate(self.entries):
+                keywords = pattern.literal_strings(self.max_keywords_per_pattern)
+                if keywords is not None:
+                    entry2keywords[entry_i] = keywords
+        self.keyword_matcher = KeywordMatcher(entry2keywords, self.regex_backend)
+
+    def select_entries(self, processed_text: str) -> List[int]:
+        """入力文字列にマッチし得るパターンのみを選択する
+
+        パターンの必須の文字が入力文字列に含まれていない場合は、正規表現を適用するまでもなくマッチしない。
+        文字集合は入力文字列ごとに一度だけ作成する。
+
+        Args:
+            processed_text (str): 数字を規格化した入力文字列
+
+        Returns:
+            List[int]: マッチし得るパターンのself.entries上のインデックス
+        """
+        text_chars = set(processed_text)
+        return [i for i, required_chars in enumerate(self.entry_required_chars) if required_chars <= text_chars]
+
+    def select_entries_batch(
+        self, processed_text: str, text_spans: List[Tuple[int, int]]
+    ) -> List[Tuple[int, List[int]]]:
+        """連結した文字列の区間ごとに、マッチし得るパターンを選択する
+
+        区間ごとにselect_entriesを呼ぶ代わりに、必須の文字からそれを含む区間の集合への索引を作り、
+        パターンごとに必須の文字の集合の積を取る。
+
+        Args:
+            processed_text (str): 数字を規格化した文字列を連結したもの
+            text_spans (List[Tuple[int, int]]): 連結した文字列中での各文字列の範囲
+
+        Returns:
+            List[Tuple[int, List[int]]]: マッチし得るパターンのインデックスと、そのパターンを適用する区間のインデックスの組
+        """
+        char2span_indices: Dict[str, Set[int]] = {char: set() for char in self.all_required_chars}
+        for span_i, (start_i, end_i) in enumerate(text_spans):
+            for char in self.all_required_chars.intersection(processed_text[start_i:end_i]):
+                char2span_indices[char].add(span_i)
+
+        all_span_indices = list(range(len(text_spans)))
+        selected_entries = []
+        for entry_i, required_chars in enumerate(self.entry_required_chars):
+            if not required_chars:
+                selected_entries.append((entry_i, all_span_indices))
+                continue
+            span_indices = set.intersection(*(char2span_indices[char] for char in required_chars))
+            if span_indices:
+                selected_entries.append((entry_i, sorted(span_indices)))
+        return selected_entries
+
+    @abstractmethod
+    def extract(self, processed_text: str) -> List[Dict]:
+        pass
+
+    def extract_batch(self, processed_text: str, text_spans: List[Tuple[int, int]]) -> List[Dict]:
+        """区切り文字で連結した複数の文字列から、それぞれの範囲内で抽出する
+
+        各パターンは、必須の文字をすべて含む文字列の範囲のみにfinditer(processed_text, start, end)で適用するため、
+        文字列ごとにextractを呼んだ場合と同じ候補を、パターンの選択とコンパイル済みの正規表現の取得を一度だけ行って得られる。
+        re.Matchの位置は連結した文字列に対するものとなる。
+
+        Args:
+            processed_text (str): 数字を規格化した文字列を、いずれのパターンにもマッチしない区切り文字で連結したもの
+            text_spans (List[Tuple[int, int]]): 連結した文字列中での各文字列の範囲
+
+        Returns:
+            List[Dict]: 抽出結果
+        """
+        all_extracts = []
+
+        # 固定の文字列は区切り文字をまたがないため、連結した文字列全体を一度だけ走査する
+        entry2keyword_matches = self.keyword_matcher.extract(processed_text, self.entries)
+        for entry_i, span_indices in self.select_entries_batch(processed_text, text_spans):
+            type_name, pattern = self.entries[entry_i]
+            re_matches: Iterable[re.Match]
+            if entry_i in self.keyword_matcher.entry2keywords:
+                re_matches = entry2keyword_matches.get(entry_i, [])
+            else:
+                finditer = pattern.compile(self.regex_backend).finditer
+                re_matches = chain.from_iterable(
+                    finditer(processed_text, *text_spans[span_i]) for span_i in span_indices
+                )
+            for re_match in re_matches:
+                all_extracts.append({"type_name": type_name, "re_match": re_match, "pattern": pattern})
+        return all_extracts
+
+
+class LoopExtractor(BaseExtractor):
+    """パターンごとに文字列全体をfinditerで走査する"""
+
+    def extract(self, processed_text: str) -> List[Dict]:
+        all_extracts = []
+
+        entry2keyword_matches = self.keyword_matcher.extract(processed_text, self.entries)
+        # マッチし得るパターンの正規表現を順に適用していく
+        for entry_i in self.select_entries(processed_text):
+            type_name, pattern = self.entries[entry_i]
+            # 文字列中からのパターン検知
+            re_matches: Iterable[re.Match]
+            if entry_i in self.keyword_matcher.entry2keywords:
+                re_matches = entry2keyword_matches.get(entry_i, [])
+            else:
+                re_matches = pattern.compile(self.regex_backend).finditer(processed_text)
+            for re_match in re_matches:
+                all_extracts.append({"type_name": type_name, "re_match": re_match, "pattern": pattern})
+        return all_extracts
+
+
+class AnchoredExtractor(BaseExtractor):
+    """パターンの必須の文字(アンカー)の周辺の範囲のみを探索する
+
+    入力文字列を一度走査してアンカーとなる文字の出現位置を記録し、各パターンはアンカーを含み得る範囲のみをsearchで探索する。
+    マッチは必ず必須の文字を含み、その長さはpattern.max_width以下であるため、
+    アンカーの位置pに対してマッチの開始位置は[p - max_width + 1, p]の範囲に限られる。
+    時間情報表現の少ない長い文章では、文字列全体を走査するLoopExtractorより探索する範囲が小さくなる。
+
+    必須の文字を持たないパターン、範囲を限定すると結果が変わり得るパターン(util.is_window_searchable)、
+    および数字の連続がmax_widthの計算で仮定した長さを超える入力文字列での上限のない繰り返しを含むパターンは、
+    LoopExtractorと同様に文字列全体を走査する。
+    """
+
+    def __init__(
+        self,
+        all_patterns: Dict[str, List[Pattern]],
+        use_keyword_matcher: bool = True,
+        regex_backend: Union[None, str, RegexBackend] = None,
+    ) -> None:
+        super().__init__(all_patterns, use_keyword_matcher, regex_backend)
+
+        # アンカーを用いて探索するパターンと、上限のない繰り返しを含むかどうか
+        self.entry_anchorable = [
+            bool(pattern.required_chars) and is_window_searchable(pattern.parsed) for _, pattern in self.entries
+        ]
+        self.entry_unbounded = [
+            get_max_width(pattern.parsed, max_repeat=default_max_repeat + 1) > pattern.max_width
+            for _, pattern in self.entries
+        ]
+        anchor_chars = sorted(
+            {
+                char
+                for (_, pattern), anchorable in zip(self.entries, self.entry_anchorable)
+                if anchorable
+                for char in pattern.required_chars
+            }
+        )
+        self.anchor_locator = (
+            self.regex_backend.compile(f"[{''.join(re.escape(char) for char in anchor_chars)}]")
+            if anchor_chars
+            else None
+        )
+        # max_widthの計算で仮定した長さを超える数字の連続
+        self.long_digits_locator = self.regex_backend.compile(f"[0-9]{{{default_max_repeat + 1},}}")
+
+    def find_anchors(self, processed_text: str) -> Dict[str, List[int]]:
+        """アンカーとなる文字の出現位置を、文字ごとに記録する
+
+        Args:
+            processed_text (str): 数字を規格化した入力文字列
+
+        Returns:
+            Dict[str, List[int]]: 文字から、出現位置のリストへの辞書
+        """
+        char2positions: Dict[str, List[int]] = {}
+        if self.anchor_locator is None:
+            return char2positions
+        for anchor_match in self.anchor_locator.finditer(processed_text):
+            char2positions.setdefault(anchor_match.group(), []).append(anchor_match.start())
+        return char2positions
+
+    def extract(self, processed_text: str) -> List[Dict]:
+        all_extracts = []
+
+        char2positions = self.find_anchors(processed_text)
+        has_long_digits = self.long_digits_locator.search(processed_text) is not None
+        entry2keyword_matches = self.keyword_matcher.extract(processed_text, self.entries)
+        for entry_i in self.select_entries(processed_text):
+            type_name, pattern = self.entries[entry_i]
+            re_matches: Iterable[re.Match]
+            if entry_i in self.keyword_matcher.entry2keywords:
+                re_matches = entry2keyword_matches.get(entry_i, [])
+            elif self.entry_anchorable[entry_i] and not (has_long_digits and self.entry_unbounded[entry_i]):
+                # 出現回数の最も少ない必須の文字をアンカーとする
+                anchor_positions = min((char2positions.get(char, []) for char in pattern.required_chars), key=len)
+                re_matches = self._search_around(processed_text, pattern, anchor_positions)
+            else:
+                re_matches = pattern.compile(self.regex_backend).finditer(processed_text)
+            for re_match in re_matches:
+                all_extracts.append({"type_name": type_name, "re_match": re_match, "pattern": pattern})
+        return all_extracts
+
+    def _search_around(self, processed_text: str, pattern: Pattern, anchor_positions: List[int]) -> List[re.Match]:
+        # finditerと同じ重ならないマッチの列を、アンカーの周辺の範囲のみを探索して求める
+        search = pattern.compile(self.regex_backend).search
+        max_width = pattern.max_width
+        text_length = len(processed_text)
+        re_matches = []
+        next_start_i = 0
+        for window_start_i, window_end_i in self._merge_windows(anchor_positions, max_width):
+            # マッチの開始位置はwindow_end_iより前で、終了位置はwindow_end_i - 1 + max_width以下となる
+            end_pos = min(text_length, window_end_i - 1 + max_width)
+            position = max(window_start_i, next_start_i)
+            while position < window_end_i:
+                re_match = search(processed_text, position, end_pos)
+                if re_match is None or re_match.start() >= window_end_i:
+                    break
+                re_matches.append(re_match)
+                position = next_start_i = re_match.end()
+        return re_matches
+
+    @staticmethod
+    def _merge_windows(anchor_positions: List[int], max_width: int) -> Iterator[Tuple[int, int]]:
+        # アンカーを含むマッチの開始位置の範囲[start, end)を、重なるものをまとめて返す
+        window_start_i = window_end_i = -1
+        for position in anchor_positions:
+            start_i = max(0, position - max_width + 1)
+            if start_i <= window_end_i:
+                window_end_i = position + 1
+                continue
+            if window_end_i >= 0:
+                yield window_start_i, window_end_i
+            window_start_i, window_end_i = start_i, position + 1
+        if window_end_i >= 0:
+            yield window_start_i, window_end_i
+
+
+# すべてのパターンを1つの選択(alternation)に結合して一度に走査する方式は、パターンごとの重ならないマッチの列を再現するために
+# 各位置で先読みによる判定が必要となり、先頭の文字ごとにパターンをまとめてもreではLoopExtractorより遅いため提供しない
+extractors: Dict[str, Type[BaseExtractor]] = {
+    "loop": LoopExtractor,
+    "anchored": AnchoredExtractor,
+}
@@ -1,14 +1,24 @@
 import re
+from array import array
 from dataclasses import dataclass
-from typing import Tuple
+from typing import FrozenSet, List, Optional, Tuple, cast
 
-import mojimoji
+from ja_timex.structures import CacheInfo, LRUCache
 
 zero = {"零": 0}
 char2int = {"〇": 0, "一": 1, "二": 2, "三": 3, "四": 4, "五": 5, "六": 6, "七": 7, "八": 8, "九": 9}
 char2power_allow_head = {"十": 1, "百": 2, "千": 3}
 char2power = {"万": 4, "億": 8, "兆": 12, "京": 16, "垓": 20}
 char_int_table = str.maketrans({k: str(v) for k, v in char2int.items()})
+kansuji_pattern = re.compile("[〇一二三四五六七八九十百千万億兆京垓]+")
+
+# 全角数字と、数字の間に入る全角の,や.を半角にする
+zen_to_han_digits = list(zip("０１２３４５６７８９", "0123456789"))
+# 全角の,や.を先頭に置き、その位置でのみ前後の数字を確認する
+comma_inside_digits_pattern = re.compile("，(?<=[0-9]，)(?=[0-9])")
+period_inside_digits_pattern = re.compile("．(?<=[0-9]．)(?=[0-9])")
+# 3桁ごとにカンマで区切られた数字。カンマを含まない数字にはマッチしない
+comma_separated_number_pattern = re.compile("[0-9]{1,3}(,[0-9]{3})+(?![0-9])")
 
 
 @dataclass
@@ -57,7 +67,10 @@ def kansuji2number(text: str) -> str:
 
 
 class NumberNormalizer:
-    def __init__(self) -> None:
+    def __init__(self, kansuji_cache_size: int = 1024) -> None:
+        # 同じ漢数字は繰り返し現れるため、変換結果をキャッシュする
+        self.kansuji_cache = LRUCache(maxsize=kansuji_cache_size)
+
         self.ignore_kansuji_phrase = {
             "一": [
                 IgnorePhrase(pattern="一時的", relative_position_to_ref=(0, 3)),
@@ -69,6 +82,22 @@ class NumberNormalizer:
             "十": [IgnorePhrase(pattern="不十分", relative_position_to_ref=(-1, 2))],
         }
 
+    def context_chars(self) -> FrozenSet[str]:
+        """規格化の結果が前後の文字に依存し得る文字の集合
+
+        数字、漢数字、数字の間に入る,や.、および慣用句に含まれる文字からなる。
+        これらに含まれない文字の直後で文字列を分けた場合は、それぞれを規格化して連結しても文字列全体を規格化した結果と同じになる。
+
+        Returns:
+            FrozenSet[str]: 前後の文字に依存し得る文字の集合
+        """
+        chars = set("0123456789０１２３４５６７８９,.，．")
+        chars |= set(zero) | set(char2int) | set(char2power_allow_head) | set(char2power)
+        for ignore_phrases in self.ignore_kansuji_phrase.values():
+            for ignore_phrase in ignore_phrases:
+                chars |= set(ignore_phrase.pattern)
+        return frozenset(chars)
+
     def normalize(self, text: str) -> str:
         text = self._normalize_zen_to_han(text)
         text = self._normalize_kansuji(text)
@@ -76,10 +105,83 @@ class NumberNormalizer:
 
         return text
 
+    def normalize_with_offsets(self, text: str) -> Tuple[str, array]:
+        """規格化した文字列と、その各位置に対応する入力文字列上の位置を返す
+
+        offsets[i]は規格化後のi文字目に対応する入力文字列上の位置で、offsets[len(規格化後の文字列)]は入力文字列の長さとなる。
+        漢数字を置換した箇所では、置換後のすべての文字が置換前の漢数字の先頭の位置に対応する。
+
+        e.g. "二十一時" -> ("21時", array("i", [0, 0, 3, 4]))
+
+        Args:
+            text (str): 入力文字列
+
+        Returns:
+            Tuple[str, array]: 規格化した文字列と位置の対応
+        """
+        offsets = array("i", range(len(text) + 1))
+
+        # 全角から半角への変換は1文字ずつの置換のため、位置は変わらない
+        text = self._normalize_zen_to_han(text)
+        text = self._normalize_kansuji(text, offsets)
+        text = self._remove_comma_inside_digits(text, offsets)
+
+        return text, offsets
+
+    def normalize_batch(self, texts: List[str], separator: str = "\x00") -> List[str]:
+        """複数の文字列をまとめて規格化する
+
+        全角から半角への変換は文字単位で独立しているため、連結した文字列に対して一度だけ行う。
+        それ以降の処理は文字列ごとに行い、normalize()を個別に呼んだ場合と同じ結果を返す。
+
+        Args:
+            texts (List[str]): 入力文字列のリスト
+            separator (str): 連結に用いる区切り文字
+
+        Returns:
+            List[str]: 規格化した文字列のリスト
+        """
+        return [text for text, _ in self._normalize_batch(texts, separator, with_offsets=False)]
+
+    def normalize_batch_with_offsets(self, texts: List[str], separator: str = "\x00") -> List[Tuple[str, array]]:
+        """複数の文字列をまとめて規格化し、それぞれの位置の対応を返す
+
+        Args:
+            texts (List[str]): 入力文字列のリスト
+            separator (str): 連結に用いる区切り文字
+
+        Returns:
+            List[Tuple[str, array]]: 規格化した文字列と位置の対応のリスト
+        """
+        # with_offsets=Trueの場合、offsetsは必ず存在する
+        return [
+            (text, cast(array, offsets)) for text, offsets in self._normalize_batch(texts, separator, with_offsets=True)
+        ]
+
+    def _normalize_batch(
+        self, texts: List[str], separator: str, with_offsets: bool
+    ) -> List[Tuple[str, Optional[array]]]:
+        if not texts:
+            return []
+        if any(separator in text for text in texts):
+            # 区切り文字を含む場合は分割できないため、個別に変換する
+            han_texts = [self._normalize_zen_to_han(text) for text in texts]
+        else:
+            han_texts = self._normalize_zen_to_han(separator.join(texts)).split(separator)
+
+        results = []
+        for text in han_texts:
+            offsets = array("i", range(len(text) + 1)) if with_offsets else None
+            text = self._normalize_kansuji(text, offsets)
+            text = self._remove_comma_inside_digits(text, offsets)
+            results.append((text, offsets))
+        return results
+
     def _normalize_zen_to_han(self, text: str) -> str:
         """半角数字に正規化する
 
-        全角文字の数字および全角内に含まれる句点および句読点を、すべて半角にする
+        全角文字の数字および数字の間に含まれる全角の句点および句読点を、すべて半角にする。
+        いずれも1文字ずつの置換のため、文字列中の位置は変わらない。
 
         Args:
             text (str): 入力文字列
@@ -87,56 +189,105 @@ class NumberNormalizer:
         Returns:
             str: 半角に正規化した文字列
         """
-        text = mojimoji.zen_to_han(text, kana=False, ascii=False)
-
-        # 数字の間にはいる,や.の全角文字を半角にする
-        re_match = re.search("[0-9][，．][0-9]", text)
-        if re_match:
-            number_start_i, number_end_i = re_match.span()
-            replaced_text = re_match.group().replace("，", ",").replace("．", ".")
-            text = text[:number_start_i] + replaced_text + text[number_end_i:]
+        # str.translateは非ASCII文字列に対して1文字ずつ辞書を引くため、数字ごとのstr.replaceの方が速い
+        for zen_digit, han_digit in zen_to_han_digits:
+            if zen_digit in text:
+                text = text.replace(zen_digit, han_digit)
 
-        return text
+        # 数字の間にはいる,や.の全角文字を半角にする。置換を文字列で与えることで、マッチごとにPythonの関数を呼ばない
+        text = comma_inside_digits_pattern.sub(",", text)
+        return period_inside_digits_pattern.sub(".", text)
 
-    def _normalize_kansuji(self, text: str) -> str:
+    def _normalize_kansuji(self, text: str, offsets: Optional[array] = None) -> str:
         """漢数字をアラビア数字に正規化する
 
+        置換後の文字列は区間ごとにリストに追加して最後に連結するため、漢数字の数によらず文字列の長さに対して線形時間で処理する。
+        慣用句の判定は置換前の入力文字列に対して行う。
+
         Args:
             text (str): 入力文字列
+            offsets (Optional[array]): 与えられた場合は、置換に合わせて位置の対応を更新する
 
         Returns:
             [str]: アラビア数字に正規化した文字列
         """
-        for re_iter in re.finditer("[〇一二三四五六七八九十百千万億兆京垓]+", text):
+        pieces = []
+        new_offsets = array("i")
+        last_end_i = 0
+        for re_iter in kansuji_pattern.finditer(text):
             start_i, end_i = re_iter.span()
-            replace_text = kansuji2number(re_iter.group())
+            kansuji = re_iter.group()
 
             # 慣用句などの無視すべき表現をチェックする
             should_ignore = False
-            if re_iter.group() in self.ignore_kansuji_phrase:
-                for ignore_phrase in self.ignore_kansuji_phrase[re_iter.group()]:
+            if kansuji in self.ignore_kansuji_phrase:
+                for ignore_phrase in self.ignore_kansuji_phrase[kansuji]:
                     text_start_i = start_i + ignore_phrase.relative_position_to_ref[0]
                     text_end_i = start_i + ignore_phrase.relative_position_to_ref[1]
                     if text[text_start_i:text_end_i] == ignore_phrase.pattern:
                         should_ignore = True
 
             if not should_ignore:
-                text = text[:start_i] + replace_text + text[end_i:]
-        return text
+                replace_text = self._kansuji2number(kansuji)
+                pieces.append(text[last_end_i:start_i])
+                pieces.append(replace_text)
+                if offsets is not None:
+                    new_offsets.extend(offsets[last_end_i:start_i])
+                    new_offsets.extend(array("i", [offsets[start_i]]) * len(replace_text))
+                last_end_i = end_i
+
+        if last_end_i == 0:
+            return text
+
+        pieces.append(text[last_end_i:])
+        if offsets is not None:
+            new_offsets.extend(offsets[last_end_i:])
+            offsets[:] = new_offsets
+        return "".join(pieces)
+
+    def _kansuji2number(self, text: str) -> str:
+        number = self.kansuji_cache.get(text)
+        if number is None:
+            number = kansuji2number(text)
+            self.kansuji_cache.put(text, number)
+        return number
+
+    def kansuji_cache_info(self) -> CacheInfo:
+        """漢数字の変換結果のキャッシュの統計情報を返す
 
-    def _remove_comma_inside_digits(self, text: str) -> str:
+        Returns:
+            CacheInfo: ヒット数、ミス数、削除数、最大件数、現在の件数
+        """
+        return self.kansuji_cache.cache_info()
+
+    def _remove_comma_inside_digits(self, text: str, offsets: Optional[array] = None) -> str:
         """可読性のために挿入されるカンマを削除する
 
         Args:
             text (str): 入力文字列
+            offsets (Optional[array]): 与えられた場合は、削除に合わせて位置の対応を更新する
 
         Returns:
             str: カンマを削除した文字列
         """
-        re_match = re.search("(([0-9]{1,3}(,[0-9]{3})*)(?![0-9]))", text)
-        if re_match:
+        pieces = []
+        new_offsets = array("i")
+        last_end_i = 0
+        for re_match in comma_separated_number_pattern.finditer(text):
+            number = re_match.group()
             number_start_i, number_end_i = re_match.span()
-            replaced_text = re_match.group().replace(",", "")
-            return text[:number_start_i] + replaced_text + text[number_end_i:]
-        else:
+            pieces.append(text[last_end_i:number_start_i])
+            pieces.append(number.replace(",", ""))
+            if offsets is not None:
+                new_offsets.extend(offsets[last_end_i:number_start_i])
+                new_offsets.extend(offsets[i] for i in range(number_start_i, number_end_i) if text[i] != ",")
+            last_end_i = number_end_i
+
+        if last_end_i == 0:
             return text
+
+        pieces.append(text[last_end_i:])
+        if offsets is not None:
+            new_offsets.extend(offsets[last_end_i:])
+            offsets[:] = new_offsets
+        return "".join(pieces)
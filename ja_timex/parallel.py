@@ -0,0 +1,140 @@
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ja_timex.clock import Clock
+from ja_timex.tag import TIMEX, AnyTIMEX
+from ja_timex.timex import TimexParser
+
+# プロセス間で受け渡すTIMEXの表現
+# (tid, type, value, text, freq, quant, mod, parsed, span, raw_span, パターンのインデックス)
+SerializedTIMEX = Tuple[Any, ...]
+
+# ワーカープロセスごとに一度だけ生成するTimexParserと、Patternからそのインデックスへの対応
+_worker_timex_parser: Optional[TimexParser] = None
+_worker_pattern_indices: Dict[int, int] = {}
+
+
+def _init_worker(parser_kwargs: Dict[str, Any]) -> None:
+    global _worker_timex_parser, _worker_pattern_indices
+    # パターンのコンパイルと和暦の辞書の読み込みはここで一度だけ行われる
+    _worker_timex_parser = TimexParser(**parser_kwargs)
+    _worker_pattern_indices = {id(pattern): i for i, (_, pattern) in enumerate(_worker_timex_parser.extractor.entries)}
+
+
+def _parse_chunk(raw_texts: List[str]) -> List[List[SerializedTIMEX]]:
+    assert _worker_timex_parser is not None
+    pattern_indices = _worker_pattern_indices
+
+    results = []
+    for timexes in _worker_timex_parser.parse_batch(raw_texts):
+        results.append(
+            [
+                (
+                    timex.tid,
+                    timex.type,
+                    timex.value,
+                    timex.text,
+                    timex.freq,
+                    timex.quant,
+                    timex.mod,
+                    timex.parsed,
+                    timex.span,
+                    timex.raw_span,
+                    pattern_indices.get(id(timex.pattern)),
+                )
+                for timex in timexes
+            ]
+        )
+    return results
+
+
+class ParallelTimexParser:
+    """複数のプロセスでTimexParserを実行する
+
+    ワーカープロセスごとにTimexParserを一度だけ生成し、入力文字列をchunk_size件ずつまとめて渡す。
+    プロセス間ではPatternやコンパイル済みの正規表現を送らず、パターンのインデックスのみを送り、
+    親プロセス側のTimexParserが持つPatternに対応付け直す。
+
+    Examples:
+        >>> with ParallelTimexParser(max_workers=4) as parallel_parser:
+        ...     for timexes in parallel_parser.imap(texts):
+        ...         ...
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, chunk_size: int = 1000, **parser_kwargs) -> None:
+        self.chunk_size = chunk_size
+        self.parser_kwargs = parser_kwargs
+
+        # ワーカーと同じ構成のTimexParserを用いて、パターンのインデックスからPatternを復元する
+        self.timex_parser = TimexParser(**parser_kwargs)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.max_workers, initializer=_init_worker, initargs=(parser_kwargs,)
+        )
+        # 先行して投入するchunkの数。すべてのワーカーが待たずに次のchunkを処理できるようにする
+        self.max_pending_chunks = 2 * self.max_workers
+
+    def __enter__(self) -> "ParallelTimexParser":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        self.executor.shutdown()
+
+    def imap(self, raw_texts: Iterable[str]) -> Iterator[List[AnyTIMEX]]:
+        """入力文字列ごとの時間情報表現を入力順に返す
+
+        処理中のchunkの数を制限しているため、入力が大きい場合でもメモリの使用量は一定に保たれる。
+
+        Args:
+            raw_texts (Iterable[str]): 入力文字列
+
+        Yields:
+            Iterator[List[AnyTIMEX]]: 入力文字列ごとの時間情報表現
+        """
+        raw_texts_iter = iter(raw_texts)
+        pending: Deque[Future] = deque()
+
+        while True:
+            while len(pending) < self.max_pending_chunks:
+                chunk = list(islice(raw_texts_iter, self.chunk_size))
+                if not chunk:
+                    break
+                pending.append(self.executor.submit(_parse_chunk, chunk))
+
+            if not pending:
+                return
+
+            # chunkごとに固定した時計を共有する
+            clock = self.timex_parser.clock.freeze()
+            for serialized_timexes in pending.popleft().result():
+                yield [self._deserialize(serialized_timex, clock) for serialized_timex in serialized_timexes]
+
+    def parse(self, raw_texts: Iterable[str]) -> List[List[AnyTIMEX]]:
+        return list(self.imap(raw_texts))
+
+    def _deserialize(self, serialized_timex: SerializedTIMEX, clock: Optional[Clock] = None) -> AnyTIMEX:
+        tid, type_, value, text, freq, quant, mod, parsed, span, raw_span, pattern_i = serialized_timex
+        pattern = self.timex_parser.extractor.entries[pattern_i][1] if pattern_i is not None else None
+        timex = TIMEX(
+            type=type_,
+            value=value,
+            text=text,
+            tid=tid,
+            freq=freq,
+            quant=quant,
+            mod=mod,
+            parsed=parsed,
+            span=span,
+            raw_span=raw_span,
+            pattern=pattern,
+            reference=self.timex_parser.reference,
+            clock=clock,
+            conversion_backend=self.timex_parser.conversion_backend,
+        )
+        return self.timex_parser._to_result(timex)
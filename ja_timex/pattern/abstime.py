@@ -213,12 +213,16 @@ for delimiter in ["/", "\\-", "\\.", "・", ","]:
     )
     date_templates.append(f"{p.wareki_prefix}{p.calendar_year_wareki}年?{delimiter}{p.calendar_month}月?")
 
+# 単独の日は数を含む多くの表現にマッチするため、tier="full"の場合のみ用いる
+full_tier_date_templates = [f"{p.calendar_day}日"]
+
 for date_template in date_templates:
     patterns.append(
         Pattern(
             re_pattern=date_template,
             parse_func=parse_absdate,
             option={},
+            tier="full" if date_template in full_tier_date_templates else "strict",
         )
     )
 
@@ -299,15 +303,18 @@ patterns += [
         parse_func=parse_time,
         option={},
     ),
+    # 単独の分と秒は、日と同様にtier="full"の場合のみ用いる
     Pattern(
         re_pattern=f"{p.clock_minute}分",
         parse_func=parse_time,
         option={},
+        tier="full",
     ),
     Pattern(
         re_pattern=f"{p.clock_second}秒",
         parse_func=parse_time,
         option={},
+        tier="full",
     ),
     Pattern(
         re_pattern=f"{p.ampm_prefix}?{p.clock_hour}:{p.clock_minute}:{p.clock_second}{p.ampm_suffix}?",
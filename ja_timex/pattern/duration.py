@@ -91,10 +91,17 @@ patterns += [
         option={},
     ),
     Pattern(
-        re_pattern=f"{p.day}日(間)?",
+        re_pattern=f"{p.day}日間",
         parse_func=parse_p,
         option={},
     ),
+    # 単独の日は日付や時刻と区別できないため、abstimeと同様にtier="full"の場合のみ用いる
+    Pattern(
+        re_pattern=f"{p.day}日",
+        parse_func=parse_p,
+        option={},
+        tier="full",
+    ),
     Pattern(
         re_pattern=f"{p.year}年{p.month}[ヶ|か|カ|ケ|箇]月(間)?",
         parse_func=parse_p,
@@ -112,14 +119,27 @@ patterns += [
         option={},
     ),
     Pattern(
-        re_pattern=f"{p.minute}分(間)?",
+        re_pattern=f"{p.minute}分間",
+        parse_func=parse_pt,
+        option={},
+    ),
+    # 単独の分と秒も、日と同様にtier="full"の場合のみ用いる
+    Pattern(
+        re_pattern=f"{p.minute}分",
+        parse_func=parse_pt,
+        option={},
+        tier="full",
+    ),
+    Pattern(
+        re_pattern=f"{p.second}秒間",
         parse_func=parse_pt,
         option={},
     ),
     Pattern(
-        re_pattern=f"{p.second}秒(間)?",
+        re_pattern=f"{p.second}秒",
         parse_func=parse_pt,
         option={},
+        tier="full",
     ),
     Pattern(
         re_pattern=f"{p.second_with_ms}",
@@ -1,24 +1,246 @@
 import json
+import os
 import re
 from dataclasses import dataclass
-from pathlib import Path
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, Iterable, List, Optional
+
+from ja_timex.util import (
+    ParsedPattern,
+    add_digit_boundary,
+    build_trie_regex,
+    expand_literal_pattern,
+    get_max_width,
+    get_required_chars,
+    may_start_with_digit,
+    parse_pattern,
+)
+
+if TYPE_CHECKING:
+    from ja_timex.regex_backend import RegexBackend
 
 weekday2id = {"月": "1", "火": "2", "水": "3", "木": "4", "金": "5", "土": "6", "日": "7"}
 season2id = {"春": "SP", "夏": "SU", "秋": "FA", "冬": "WI"}
-with Path(__file__).parent.parent.joinpath("dictionary/wareki.json").open(encoding="utf8") as f:
-    wareki2year = json.load(f)
+# Patternのtier。後のtierほど、より多くのパターンを含む
+pattern_tiers = ("strict", "full")
+wareki_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "dictionary", "wareki.json")
+pattern_analysis_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "dictionary", "pattern_analysis.json")
+
+
+@lru_cache(maxsize=None)
+def load_wareki2year() -> Dict[str, int]:
+    """和暦の元号から元年の西暦への辞書を読み込む
+
+    辞書は初回の呼び出し時に一度だけ読み込む。
+
+    Returns:
+        Dict[str, int]: 元号から元年の西暦への辞書
+    """
+    with open(wareki_path, encoding="utf8") as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=None)
+def build_wareki_regex() -> str:
+    """和暦の元号のいずれかにマッチする正規表現を生成する
+
+    Returns:
+        str: 元号をトライ木の形にまとめた正規表現
+    """
+    return build_trie_regex(load_wareki2year().keys())
+
+
+@lru_cache(maxsize=None)
+def load_pattern_analysis() -> Dict[str, Any]:
+    """デフォルトのパターンについて、事前に求めた正規表現の解析結果を読み込む
+
+    tools/build_pattern_analysis.pyで生成する。初回のパース時に全パターンの構文木を生成せずに済むように、
+    Patternはここに含まれる正規表現の解析結果を用いる。
+    正規表現の文字列をキーとするため、パターンや和暦の辞書の変更で正規表現が変わった場合は含まれず、構文木から求める。
+
+    Returns:
+        Dict[str, Any]: keywordsを求めた際の上限"max_keywords"と、正規表現から解析結果への辞書"patterns"
+    """
+    with open(pattern_analysis_path, encoding="utf8") as f:
+        return json.load(f)
+
+
+def __getattr__(name: str) -> Any:
+    # 和暦の辞書はimport時ではなく、初めて参照された時点で読み込む
+    if name == "wareki2year":
+        return load_wareki2year()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class Pattern:
-    def __init__(self, re_pattern, parse_func, option=None) -> None:
+    def __init__(self, re_pattern, parse_func, option=None, tier: str = "strict") -> None:
+        if tier not in pattern_tiers:
+            raise ValueError(f"Unknown tier: {tier}. Available tiers are {list(pattern_tiers)}")
         self.re_pattern = re_pattern
         self.parse_func = parse_func
         self.option = option
+        # "strict"は常に用いるパターン、"full"は候補が多く誤検出しやすいため、tier="full"の抽出でのみ用いるパターン
+        self.tier = tier
+
+        self._re_compiled: Optional[re.Pattern] = None
+        # 正規表現の構文木と、そこから求めた情報。いずれも必要になった時点で一度だけ求める
+        self._parsed: Optional[ParsedPattern] = None
+        self._required_chars: Optional[FrozenSet[str]] = None
+        self._max_width: Optional[int] = None
+        self._starts_with_digit: Optional[bool] = None
+        # re以外のバックエンドでコンパイルした正規表現。バックエンドのインスタンスをキーとする
+        self._backend_compiled: Optional[Dict["RegexBackend", Any]] = None
+
+    @property
+    def re_compiled(self) -> re.Pattern:
+        """コンパイル済みの正規表現
+
+        初回アクセス時に一度だけコンパイルし、以降は同じオブジェクトを使い回す。
+        reモジュールのキャッシュ上限を超えるパターン数でも再コンパイルが発生しない。
+
+        Returns:
+            re.Pattern: コンパイル済みの正規表現
+        """
+        if self._re_compiled is None:
+            self._re_compiled = re.compile(self.bounded_re_pattern)
+        return self._re_compiled
+
+    def compile(self, regex_backend: Optional["RegexBackend"] = None) -> Any:
+        """指定したバックエンドでコンパイルした正規表現
+
+        re_compiledと同様に、バックエンドごとに一度だけコンパイルする。
+        後読みを扱えないバックエンドでは後読みを加えずにre_patternをコンパイルし、
+        数字から始まり得るパターンはDigitBoundaryRegexで後読みと同じマッチを得る。
+
+        Args:
+            regex_backend (Optional[RegexBackend]): 正規表現のバックエンド。Noneの場合はre
+
+        Returns:
+            Any: コンパイル済みの正規表現
+        """
+        if regex_backend is None or regex_backend.name == "re":
+            return self.re_compiled
+
+        if self._backend_compiled is None:
+            self._backend_compiled = {}
+        compiled = self._backend_compiled.get(regex_backend)
+        if compiled is None:
+            if regex_backend.supports_lookaround:
+                compiled = regex_backend.compile(self.bounded_re_pattern)
+            else:
+                from ja_timex.regex_backend import DigitBoundaryRegex
+
+                compiled = regex_backend.compile(self.re_pattern)
+                if self.starts_with_digit:
+                    compiled = DigitBoundaryRegex(compiled)
+            self._backend_compiled[regex_backend] = compiled
+        return compiled
+
+    @property
+    def parsed(self) -> ParsedPattern:
+        """正規表現の構文木
+
+        required_chars, max_width, starts_with_digitなどの解析は、正規表現を解析し直さずにこれを共有する。
+
+        Returns:
+            ParsedPattern: util.parse_patternで変換した構文木
+        """
+        if self._parsed is None:
+            self._parsed = parse_pattern(self.re_pattern)
+        return self._parsed
+
+    @property
+    def required_chars(self) -> FrozenSet[str]:
+        """マッチする文字列に必ず含まれる文字の集合
+
+        入力文字列にこれらの文字が1つでも含まれていなければ、このパターンはマッチし得ない
+
+        Returns:
+            FrozenSet[str]: 正規表現から求めた必須の文字の集合
+        """
+        if self._required_chars is None:
+            analysis = self._precomputed_analysis()
+            if analysis is not None:
+                self._required_chars = frozenset(analysis["required_chars"])
+            else:
+                self._required_chars = get_required_chars(self.parsed)
+        return self._required_chars
+
+    @property
+    def max_width(self) -> int:
+        """マッチする文字列の最大の長さ
+
+        Returns:
+            int: 正規表現から求めた最大の長さ。上限のない繰り返しはget_max_widthのmax_repeatで打ち切る
+        """
+        if self._max_width is None:
+            self._max_width = get_max_width(self.parsed)
+        return self._max_width
+
+    @property
+    def starts_with_digit(self) -> bool:
+        """マッチする文字列の先頭が数字になり得るか
+
+        Returns:
+            bool: 先頭が数字になり得るかを表す真偽値。先頭の文字を列挙できない場合はTrue
+        """
+        if self._starts_with_digit is None:
+            analysis = self._precomputed_analysis()
+            if analysis is not None:
+                self._starts_with_digit = analysis["starts_with_digit"]
+            else:
+                self._starts_with_digit = may_start_with_digit(self.parsed)
+        return self._starts_with_digit
+
+    def literal_strings(self, max_strings: int) -> Optional[List[str]]:
+        """パターンがマッチする固定の文字列
+
+        Args:
+            max_strings (int): 展開する文字列の数の上限
+
+        Returns:
+            Optional[List[str]]: util.expand_literal_patternで展開した文字列のリスト。展開できない場合はNone
+        """
+        analysis = self._precomputed_analysis()
+        if analysis is not None and load_pattern_analysis()["max_keywords"] == max_strings:
+            return analysis["keywords"]
+        return expand_literal_pattern(self.parsed, max_strings=max_strings)
+
+    def _precomputed_analysis(self) -> Optional[Dict[str, Any]]:
+        # load_pattern_analysisに含まれる、この正規表現の解析結果
+        return load_pattern_analysis()["patterns"].get(self.re_pattern)
+
+    @property
+    def bounded_re_pattern(self) -> str:
+        """コンパイルに用いる正規表現
+
+        数字から始まり得るパターンは、数字表現の一部から始まるマッチを除く後読みをutil.add_digit_boundaryで加える。
+        これらのパターンの多くは先頭が数字の繰り返しで、reの先頭の文字による探索位置の絞り込みがもともと働かないため、
+        後読みによって遅くならない。それ以外のパターンは、絞り込みを保つために後読みを加えない。
+
+        Returns:
+            str: コンパイルに用いる正規表現
+        """
+        return add_digit_boundary(self.re_pattern) if self.starts_with_digit else self.re_pattern
 
     def __repr__(self) -> str:
         return f"<Pattern: {self.re_pattern} / parse_func:{self.parse_func.__name__} / option:{self.option}>"
 
 
+def compile_patterns(patterns: Iterable[Pattern], regex_backend: Optional["RegexBackend"] = None) -> None:
+    """Patternの正規表現をまとめてコンパイルする
+
+    遅延コンパイルのコストを初回のparse時ではなく事前に払いたい場合に用いる
+
+    Args:
+        patterns (Iterable[Pattern]): コンパイル対象のPattern
+        regex_backend (Optional[RegexBackend]): 正規表現のバックエンド。Noneの場合はre
+    """
+    for pattern in patterns:
+        pattern.compile(regex_backend)
+        pattern.required_chars
+
+
 # 正規表現に用いる部分パターン
 @dataclass
 class Place:
@@ -87,8 +309,11 @@ class Place:
     # reltime: 相対的な時間における曖昧表現
     around_suffix: str = "([くぐ]らい|ほど|程度|ばかり|近く|より(も)?)"
 
-    # 和暦の元号
-    wareki_prefix: str = f"(?P<wareki_prefix>({'|'.join(wareki2year.keys())}))"
+    # 和暦の元号。辞書の読み込みを遅らせるため、参照時に生成する
+    # 250以上ある元号を選択肢として並べると照合が遅いため、共通の接頭辞をまとめる
+    @property
+    def wareki_prefix(self) -> str:
+        return f"(?P<wareki_prefix>{build_wareki_regex()})"
 
     # 半分の表現
     half_suffix: str = "(?P<half_suffix>半)"
@@ -138,4 +363,4 @@ def get_wareki_first_year(text: str) -> int:
         int: 対応する元号のゼロ年の西暦
     """
 
-    return wareki2year[text] - 1
+    return load_wareki2year()[text] - 1
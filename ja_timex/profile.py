@@ -0,0 +1,90 @@
+from dataclasses import dataclass
+from typing import FrozenSet, Iterable, List, Optional, Union
+
+from ja_timex.pattern.place import Pattern, pattern_tiers
+
+# TimexParserが扱うパターンの種類
+pattern_types = ("abstime", "duration", "reltime", "set", "custom")
+
+
+@dataclass(frozen=True)
+class ExtractionProfile:
+    """TimexParserが抽出に用いるパターンの範囲
+
+    typesに含まれない種類のTaggerはパターンを読み込まず、tierに含まれないパターンは抽出に用いない。
+    用いないパターンの候補がなくなるため、それらと重なっていた他のパターンの候補が代わりに抽出される場合がある。
+        e.g. types={"abstime"}の場合、「3日間」からDURATIONの代わりにDATEの「3日」を抽出する
+        e.g. tier="strict"の場合、「18日」はDATEとしてもDURATIONとしても抽出せず、「3日間」のみをDURATIONとして抽出する
+
+    Args:
+        types (Optional[FrozenSet[str]]): 用いるパターンの種類。Noneの場合はすべての種類
+        tier (str): "strict"の場合は誤検出しやすい汎用的なパターンを除き、"full"の場合はすべてのパターンを用いる
+    """
+
+    types: Optional[FrozenSet[str]] = None
+    tier: str = "full"
+
+    def __post_init__(self) -> None:
+        if self.types is not None:
+            unknown_types = set(self.types) - set(pattern_types)
+            if unknown_types:
+                raise ValueError(
+                    f"Unknown pattern types: {sorted(unknown_types)}. Available types are {list(pattern_types)}"
+                )
+            # setやlistで指定された場合もハッシュ可能にする
+            object.__setattr__(self, "types", frozenset(self.types))
+        if self.tier not in pattern_tiers:
+            raise ValueError(f"Unknown tier: {self.tier}. Available tiers are {list(pattern_tiers)}")
+
+    def includes_type(self, type_name: str) -> bool:
+        return self.types is None or type_name in self.types
+
+    def select(self, patterns: List[Pattern]) -> List[Pattern]:
+        """tierに含まれるパターンを選択する
+
+        Args:
+            patterns (List[Pattern]): 対象となるパターン
+
+        Returns:
+            List[Pattern]: tierに含まれるパターン。すべて含まれる場合は入力と同じリスト
+        """
+        max_tier_i = pattern_tiers.index(self.tier)
+        if max_tier_i == len(pattern_tiers) - 1:
+            return patterns
+        return [pattern for pattern in patterns if pattern_tiers.index(pattern.tier) <= max_tier_i]
+
+
+extraction_profiles = {
+    "full": ExtractionProfile(),
+    "strict": ExtractionProfile(tier="strict"),
+    "abstime": ExtractionProfile(types=frozenset({"abstime"})),
+}
+
+
+def get_extraction_profile(
+    profile: Union[None, str, ExtractionProfile] = None,
+    types: Optional[Iterable[str]] = None,
+    tier: Optional[str] = None,
+) -> ExtractionProfile:
+    """名前または指定したインスタンスから抽出の範囲を取得し、typesとtierが指定された場合はそれで上書きする
+
+    Args:
+        profile (Union[None, str, ExtractionProfile]): "full", "strict", "abstime"またはExtractionProfile。Noneの場合は"full"
+        types (Optional[Iterable[str]]): 用いるパターンの種類
+        tier (Optional[str]): 用いるパターンのtier
+
+    Returns:
+        ExtractionProfile: 抽出の範囲
+    """
+    if not isinstance(profile, ExtractionProfile):
+        name = profile if profile is not None else "full"
+        if name not in extraction_profiles:
+            raise ValueError(f"Unknown extraction profile: {name}. Available profiles are {list(extraction_profiles)}")
+        profile = extraction_profiles[name]
+
+    if types is None and tier is None:
+        return profile
+    return ExtractionProfile(
+        types=frozenset(types) if types is not None else profile.types,
+        tier=tier if tier is not None else profile.tier,
+    )
@@ -0,0 +1,278 @@
+import re
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Optional, Type, Union
+
+from ja_timex.util import digit_regex, sre_constants, sre_parse
+
+# Pythonのreで\sがマッチする空白文字をRE2の文字クラスの記法で表したもの。RE2の\sはASCIIの空白文字のみにマッチする
+python_whitespace_chars = r"\t-\r\x1c-\x20\x85\xa0\x{1680}\x{2000}-\x{200a}\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}"
+
+
+class RegexBackend(ABC):
+    """パターンの正規表現をコンパイルする
+
+    compile()が返すオブジェクトは、re.Patternと同じmatch, fullmatch, search, finditerのメソッドを持ち、
+    それらが返すマッチはre.Matchと同じgroup, groupdict, span, start, endのメソッドを持つ必要がある。
+    """
+
+    name = ""
+    # 先読みや後読みを含む正規表現を扱えるか
+    supports_lookaround = True
+
+    @abstractmethod
+    def compile(self, re_pattern: str) -> Any:
+        pass
+
+    def unsupported_features(self, re_pattern: str) -> List[str]:
+        """正規表現に含まれる、このバックエンドが対応していない機能を返す
+
+        Args:
+            re_pattern (str): 対象となる正規表現
+
+        Returns:
+            List[str]: 対応していない機能の名前のリスト
+        """
+        return []
+
+
+class StdlibRegexBackend(RegexBackend):
+    """標準ライブラリのreを用いる"""
+
+    name = "re"
+
+    def compile(self, re_pattern: str) -> Any:
+        return re.compile(re_pattern)
+
+
+class DigitBoundaryRegex:
+    """直前の文字が数字の位置から始まるマッチを除く、コンパイル済みの正規表現のラッパー
+
+    後読みを扱えないバックエンドで、util.add_digit_boundaryの後読み"(?<![0-9])"と同じマッチを得るために用いる。
+    直前が数字の位置でマッチした場合は、その次の位置から探索し直す。
+    そのため、除かれたマッチと重なる後続のマッチも、後読みを用いた場合と同様に得られる。
+
+    Args:
+        compiled (Any): 後読みを加えずにコンパイルした正規表現
+    """
+
+    def __init__(self, compiled: Any) -> None:
+        self.compiled = compiled
+
+    @staticmethod
+    def _follows_digit(text: str, position: int) -> bool:
+        return position > 0 and digit_regex.match(text, position - 1) is not None
+
+    def match(self, text: str, pos: int = 0, endpos: Optional[int] = None) -> Any:
+        if self._follows_digit(text, pos):
+            return None
+        return self.compiled.match(text, pos, len(text) if endpos is None else endpos)
+
+    def fullmatch(self, text: str, pos: int = 0, endpos: Optional[int] = None) -> Any:
+        if self._follows_digit(text, pos):
+            return None
+        return self.compiled.fullmatch(text, pos, len(text) if endpos is None else endpos)
+
+    def search(self, text: str, pos: int = 0, endpos: Optional[int] = None) -> Any:
+        endpos = len(text) if endpos is None else endpos
+        while pos <= endpos:
+            re_match = self.compiled.search(text, pos, endpos)
+            if re_match is None or not self._follows_digit(text, re_match.start()):
+                return re_match
+            pos = re_match.start() + 1
+        return None
+
+    def finditer(self, text: str, pos: int = 0, endpos: Optional[int] = None) -> Iterator[Any]:
+        endpos = len(text) if endpos is None else endpos
+        while pos <= endpos:
+            re_match = self.search(text, pos, endpos)
+            if re_match is None:
+                return
+            yield re_match
+            # 空文字列へのマッチでは、同じ位置を繰り返し探索しないように1文字進める
+            pos = re_match.end() if re_match.end() > re_match.start() else re_match.end() + 1
+
+
+def _import_regex() -> Any:
+    try:
+        import regex
+    except ImportError:
+        raise ImportError("RegexModuleBackend requires regex. Please install it with `pip install regex`.")
+    return regex
+
+
+class RegexModuleBackend(RegexBackend):
+    """regexパッケージを用いる。regexがインストールされている場合のみ利用できる"""
+
+    name = "regex"
+
+    def __init__(self) -> None:
+        _import_regex()
+
+    def compile(self, re_pattern: str) -> Any:
+        regex = _import_regex()
+        # reと互換の動作をするVERSION0を用いる
+        return regex.compile(re_pattern, flags=regex.VERSION0)
+
+
+def _import_re2() -> Any:
+    try:
+        import re2
+    except ImportError:
+        raise ImportError("RE2Backend requires an RE2 binding. Please install it with `pip install google-re2`.")
+    return re2
+
+
+class RE2Backend(RegexBackend):
+    """RE2を用いる。RE2のPythonバインディング(google-re2)がインストールされている場合のみ利用できる
+
+    RE2は入力文字列の長さに対して線形時間でのマッチを保証する。
+    その代わり、先読み、後読み、後方参照などのバックトラックを必要とする機能には対応していない。
+    """
+
+    name = "re2"
+    supports_lookaround = False
+
+    def __init__(self) -> None:
+        _import_re2()
+
+    def compile(self, re_pattern: str) -> Any:
+        features = self.unsupported_features(re_pattern)
+        if features:
+            raise ValueError(f"RE2 does not support {', '.join(features)}: {re_pattern}")
+        return _import_re2().compile(to_re2_syntax(re_pattern))
+
+    def unsupported_features(self, re_pattern: str) -> List[str]:
+        return find_backtracking_features(re_pattern)
+
+
+def _iter_subpatterns(av: Any) -> Any:
+    # 引数に含まれる部分パターンを再帰的に列挙する
+    if isinstance(av, sre_parse.SubPattern):
+        yield av
+    elif isinstance(av, (list, tuple)):
+        for item in av:
+            yield from _iter_subpatterns(item)
+
+
+def _find_backtracking_features(items: List, features: List[str]) -> None:
+    for op, av in items:
+        if op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            feature = "lookaround"
+        elif op is sre_constants.GROUPREF:
+            feature = "backreference"
+        elif op is sre_constants.GROUPREF_EXISTS:
+            feature = "conditional group"
+        elif str(op) in ("ATOMIC_GROUP", "POSSESSIVE_REPEAT"):
+            feature = "atomic group"
+        else:
+            feature = ""
+        if feature and feature not in features:
+            features.append(feature)
+
+        for subpattern in _iter_subpatterns(av):
+            _find_backtracking_features(subpattern.data, features)
+
+
+def find_backtracking_features(re_pattern: str) -> List[str]:
+    """線形時間の正規表現エンジンでは扱えない機能を探す
+
+    e.g. "(?<![0-9])(?P<year>[0-9]+)年" -> ["lookaround"]
+    e.g. "(?P<year>[0-9]+)年" -> []
+
+    Args:
+        re_pattern (str): 対象となる正規表現
+
+    Returns:
+        List[str]: 先読み/後読み(lookaround)、後方参照(backreference)などの機能の名前のリスト
+    """
+    features: List[str] = []
+    _find_backtracking_features(sre_parse.parse(re_pattern).data, features)
+    return features
+
+
+def to_re2_syntax(re_pattern: str) -> str:
+    """Pythonのreの正規表現を、同じ文字列にマッチするRE2の正規表現に変換する
+
+    RE2では"{,n}"が繰り返しとみなされないため"{0,n}"とし、\\sはPythonのreと同じ空白文字の文字クラスとする。
+
+    Args:
+        re_pattern (str): Pythonのreの正規表現
+
+    Returns:
+        str: RE2の正規表現
+    """
+    result = []
+    i = 0
+    in_class = False
+    while i < len(re_pattern):
+        char = re_pattern[i]
+        if char == "\\":
+            escaped = re_pattern[i : i + 2]
+            if escaped == "\\s":
+                result.append(python_whitespace_chars if in_class else f"[{python_whitespace_chars}]")
+            else:
+                result.append(escaped)
+            i += 2
+            continue
+
+        if in_class:
+            if char == "]":
+                in_class = False
+        elif char == "[":
+            in_class = True
+        elif re_pattern.startswith("{,", i):
+            result.append("{0,")
+            i += 2
+            continue
+        result.append(char)
+        i += 1
+    return "".join(result)
+
+
+regex_backends: Dict[str, Type[RegexBackend]] = {
+    "re": StdlibRegexBackend,
+    "regex": RegexModuleBackend,
+    "re2": RE2Backend,
+}
+_regex_backend_instances: Dict[str, RegexBackend] = {}
+
+
+def get_regex_backend(regex_backend: Union[None, str, RegexBackend] = None) -> RegexBackend:
+    """名前または指定したインスタンスから、正規表現のバックエンドを取得する
+
+    Args:
+        regex_backend (Union[None, str, RegexBackend]): "re", "regex", "re2"またはRegexBackendのインスタンス。Noneの場合は"re"
+
+    Returns:
+        RegexBackend: 正規表現のバックエンド
+    """
+    if isinstance(regex_backend, RegexBackend):
+        return regex_backend
+
+    name = regex_backend if regex_backend is not None else "re"
+    if name not in regex_backends:
+        raise ValueError(f"Unknown regex backend: {name}. Available backends are {list(regex_backends)}")
+    if name not in _regex_backend_instances:
+        _regex_backend_instances[name] = regex_backends[name]()
+    return _regex_backend_instances[name]
+
+
+def find_unsupported_patterns(
+    re_patterns: List[str], regex_backend: Optional[RegexBackend] = None
+) -> Dict[str, List[str]]:
+    """バックエンドが対応していない機能を含む正規表現を探す
+
+    Args:
+        re_patterns (List[str]): 対象となる正規表現
+        regex_backend (Optional[RegexBackend]): 対象となるバックエンド。Noneの場合は線形時間のエンジンで扱えない機能を探す
+
+    Returns:
+        Dict[str, List[str]]: 対応していない機能を含む正規表現から、その機能の名前のリストへの辞書
+    """
+    check = regex_backend.unsupported_features if regex_backend is not None else find_backtracking_features
+    unsupported = {}
+    for re_pattern in re_patterns:
+        features = check(re_pattern)
+        if features:
+            unsupported[re_pattern] = features
+    return unsupported
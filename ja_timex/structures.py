@@ -0,0 +1,139 @@
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Any, Hashable, List, NamedTuple, Tuple
+
+
+class IntervalSet:
+    """互いに重ならない半開区間[start, end)の集合
+
+    区間を(start, end)の組として開始位置の順に保持する。
+    区間は互いに重ならないため、新しい区間と重なり得るのは二分探索で求めた前後の2つの区間のみとなる。
+    判定は区間の数kに対してO(log k)で、区間の長さや文字列の長さには依存しない。
+    """
+
+    def __init__(self) -> None:
+        self.intervals: List[Tuple[int, int]] = []
+
+    def __len__(self) -> int:
+        return len(self.intervals)
+
+    def overlaps(self, start: int, end: int) -> bool:
+        """[start, end)が既存の区間のいずれかと重なるかを判定する
+
+        Args:
+            start (int): 区間の開始位置
+            end (int): 区間の終了位置
+
+        Returns:
+            bool: 重なる場合にTrue。長さ0の区間は何とも重ならない
+        """
+        if start >= end:
+            return False
+
+        intervals = self.intervals
+        # 開始位置が(start, end)以前の区間の数。i - 1番目が直前の区間、i番目が直後の区間となる
+        i = bisect_right(intervals, (start, end))
+        return (i > 0 and intervals[i - 1][1] > start) or (i < len(intervals) and intervals[i][0] < end)
+
+    def add_if_disjoint(self, start: int, end: int) -> bool:
+        """既存の区間と重ならない場合にのみ区間を追加する
+
+        Args:
+            start (int): 区間の開始位置
+            end (int): 区間の終了位置
+
+        Returns:
+            bool: 重ならずに採用された場合にTrue
+        """
+        if start >= end:
+            return True
+
+        intervals = self.intervals
+        i = bisect_right(intervals, (start, end))
+        if (i > 0 and intervals[i - 1][1] > start) or (i < len(intervals) and intervals[i][0] < end):
+            return False
+        intervals.insert(i, (start, end))
+        return True
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache:
+    """最大件数を持つLRU(Least Recently Used)キャッシュ
+
+    最大件数を超えた場合は、最も長く参照されていないものから削除する。
+    キャッシュの大きさを調整できるように、ヒット数・ミス数・削除数を記録する。
+    maxsizeが0の場合は何も保持しない。
+    複数のスレッドから同じTimexParserやNumberNormalizerを用いる場合のために、各操作はロックを取得して行う。
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize < 0:
+            raise ValueError(f"maxsize must be non-negative: {maxsize}")
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """キャッシュから値を取得する
+
+        Args:
+            key (Hashable): キー
+            default (Any): キャッシュに存在しない場合に返す値
+
+        Returns:
+            Any: キャッシュされた値
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """キャッシュに値を追加する
+
+        Args:
+            key (Hashable): キー
+            value (Any): 値
+        """
+        if self.maxsize == 0:
+            return
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """キャッシュと統計情報を初期化する"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._data))
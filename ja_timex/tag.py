@@ -1,27 +1,186 @@
+import sys
+from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from typing import Dict, Optional, Tuple
-
-import pendulum
+from datetime import datetime, timedelta, tzinfo
+from typing import Any, Dict, FrozenSet, Optional, Tuple, Union, overload
 
+from ja_timex.clock import Clock
 from ja_timex.pattern.place import Pattern
+from ja_timex.util import add_months
 
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python 3.8以前
+    from backports.zoneinfo import ZoneInfo  # type: ignore
+
+
+class Duration(timedelta):
+    """年と月を保持する経過時間
+
+    timedeltaとしては1年を365日、1ヶ月を30日として換算する。
+    pendulum.Durationと同じく、years, months, weeks, remaining_days, hours, minutes, remaining_secondsの属性を持つ。
+    """
+
+    years: int
+    months: int
+    weeks: int
+    remaining_days: int
+    hours: int
+    minutes: int
+    remaining_seconds: int
+
+    def __new__(
+        cls,
+        years: int = 0,
+        months: int = 0,
+        weeks: float = 0,
+        days: float = 0,
+        hours: float = 0,
+        minutes: float = 0,
+        seconds: float = 0,
+        microseconds: float = 0,
+    ) -> "Duration":
+        duration = super().__new__(
+            cls,
+            weeks=weeks,
+            days=days + years * 365 + months * 30,
+            hours=hours,
+            minutes=minutes,
+            seconds=seconds,
+            microseconds=microseconds,
+        )
+        duration.years = years
+        duration.months = months
+
+        # 年と月を除いた部分を、週・日・時・分・秒に分ける
+        rest_microseconds = (
+            (duration.days - years * 365 - months * 30) * 86400 + duration.seconds
+        ) * 1000000 + duration.microseconds
+        sign = -1 if rest_microseconds < 0 else 1
+        rest_days, rest_seconds = divmod(abs(rest_microseconds) // 1000000, 86400)
+        duration.weeks = sign * (rest_days // 7)
+        duration.remaining_days = sign * (rest_days % 7)
+        duration.hours = sign * (rest_seconds // 3600)
+        duration.minutes = sign * (rest_seconds % 3600 // 60)
+        duration.remaining_seconds = sign * (rest_seconds % 60)
+        return duration
+
+
+class ConversionBackend(ABC):
+    """to_datetimeとto_durationで日時と経過時間を生成する"""
+
+    @abstractmethod
+    def make_datetime(
+        self, year: int, month: int, day: int, hour: int = 0, minute: int = 0, second: int = 0, tz: Any = None
+    ) -> datetime:
+        pass
+
+    @abstractmethod
+    def duration(self, **kwargs) -> timedelta:
+        pass
+
+    @abstractmethod
+    def add_duration(self, dt: datetime, duration: timedelta, sign: int = 1) -> datetime:
+        pass
+
+
+class StdlibBackend(ConversionBackend):
+    """標準ライブラリのdatetimeとzoneinfoを用いる"""
+
+    def make_datetime(
+        self,
+        year: int,
+        month: int,
+        day: int,
+        hour: int = 0,
+        minute: int = 0,
+        second: int = 0,
+        tz: Union[None, str, tzinfo] = None,
+    ) -> datetime:
+        if isinstance(tz, str):
+            tz = ZoneInfo(tz)
+        return datetime(year, month, day, hour, minute, second, tzinfo=tz)
+
+    def duration(self, **kwargs) -> Duration:
+        return Duration(**kwargs)
+
+    def add_duration(self, dt: datetime, duration: timedelta, sign: int = 1) -> datetime:
+        # 年と月は暦の上で加算し、それ以外は経過時間として加算する
+        years = getattr(duration, "years", 0)
+        months = getattr(duration, "months", 0)
+        dt = add_months(dt, sign * (years * 12 + months))
+        return dt + sign * (duration - timedelta(days=years * 365 + months * 30))
+
+
+class PendulumBackend(ConversionBackend):
+    """pendulumのDateTimeとDurationを用いる。pendulumがインストールされている場合のみ利用できる"""
+
+    def __init__(self) -> None:
+        try:
+            import pendulum
+        except ImportError:
+            raise ImportError("PendulumBackend requires pendulum. Please install it with `pip install pendulum`.")
+        self.pendulum = pendulum
+
+    def make_datetime(
+        self, year: int, month: int, day: int, hour: int = 0, minute: int = 0, second: int = 0, tz: Any = None
+    ) -> datetime:
+        return self.pendulum.datetime(year, month, day, hour, minute, second, tz=tz)
+
+    def duration(self, **kwargs) -> timedelta:
+        return self.pendulum.duration(**kwargs)
+
+    def add_duration(self, dt: datetime, duration: timedelta, sign: int = 1) -> datetime:
+        return self.pendulum.instance(dt) + sign * duration
+
+
+conversion_backends = {"stdlib": StdlibBackend, "pendulum": PendulumBackend}
+_conversion_backend_instances: Dict[str, ConversionBackend] = {}
+
+
+def get_conversion_backend(conversion_backend: Union[None, str, ConversionBackend] = None) -> ConversionBackend:
+    """名前または指定したインスタンスから、to_datetimeとto_durationが用いるバックエンドを取得する
+
+    Args:
+        conversion_backend (Union[None, str, ConversionBackend]): "stdlib"(標準ライブラリのdatetimeとDuration)、
+            "pendulum"またはConversionBackendのインスタンス。Noneの場合は"stdlib"
+
+    Returns:
+        ConversionBackend: 日時と経過時間のバックエンド
+    """
+    if isinstance(conversion_backend, ConversionBackend):
+        return conversion_backend
+
+    name = conversion_backend if conversion_backend is not None else "stdlib"
+    if name not in conversion_backends:
+        raise ValueError(f"Unknown conversion backend: {name}. Available backends are {list(conversion_backends)}")
+    if name not in _conversion_backend_instances:
+        _conversion_backend_instances[name] = conversion_backends[name]()
+    return _conversion_backend_instances[name]
+
+
+class TIMEXMixin:
+    """TIMEXとCompactTIMEXに共通する、タグの出力と日時への変換のメソッド
+
+    以下で宣言する属性を持つクラスで用いる。
+    """
+
+    __slots__ = ()
 
-@dataclass
-class TIMEX:
     type: str
     value: str
     text: str
-
-    tid: Optional[str] = None
-    freq: Optional[str] = None
-    quant: Optional[str] = None
-    mod: Optional[str] = None
-
-    parsed: Dict[str, str] = field(default_factory=dict)
-    span: Optional[Tuple[int, int]] = None  # 入力文字列中での正規表現が取得したspan
-    pattern: Optional[Pattern] = None
-    reference: Optional[pendulum.DateTime] = None
+    tid: Optional[str]
+    freq: Optional[str]
+    quant: Optional[str]
+    mod: Optional[str]
+    parsed: Dict[str, str]
+    span: Optional[Tuple[int, int]]
+    raw_span: Optional[Tuple[int, int]]
+    pattern: Optional[Pattern]
+    reference: Optional[datetime]
+    clock: Optional[Clock]
+    conversion_backend: Optional[ConversionBackend]
 
     def to_tag(self) -> str:
         """TIMEX3のタグ文字列を生成する
@@ -43,17 +202,26 @@ class TIMEX:
         tag = f"<TIMEX3 {attributes_text}>{self.text}</TIMEX3>"
         return tag
 
+    @overload
     def fill_target_value(self, target: str, fill_str: str, default_value: int) -> int:
+        ...
+
+    @overload
+    def fill_target_value(self, target: str, fill_str: str, default_value: None) -> Optional[int]:
+        ...
+
+    def fill_target_value(self, target: str, fill_str: str, default_value: Optional[int]) -> Optional[int]:
         """正規表現で取得した情報の中からtargetの値を取得する
 
         Args:
             target (str): self.parsedのkey文字列
             fill_str (str): 特定できない場合に入る文字列
-            default_value (int): 値を取得できなかった場合に返却する値
+            default_value (Optional[int]): 値を取得できなかった場合に返却する値
 
         Returns:
-            int: 取得した値
+            Optional[int]: 取得した値
         """
+        value: Optional[int]
         if self.parsed.get(target) and self.parsed[target] != fill_str:
             value = int(self.parsed[target])
         else:
@@ -71,12 +239,27 @@ class TIMEX:
         else:
             return False
 
+    def now(self) -> datetime:
+        """年が特定できない日付表現に用いる現在日時を返す
+
+        Returns:
+            datetime: clockが設定されている場合はその日時、そうでない場合はシステムの現在日時
+        """
+        if self.clock is not None:
+            return self.clock.now()
+        return datetime.now().astimezone()
+
+    def _conversion_backend(self) -> ConversionBackend:
+        # conversion_backendが設定されていない場合は、標準ライブラリのdatetimeとDurationを用いる
+        return get_conversion_backend(self.conversion_backend)
+
     def to_datetime(self) -> Optional[datetime]:
         if not self.is_valid_datetime:
             return None
 
         if self.type == "DATE":
-            year = self.fill_target_value(target="calendar_year", fill_str="XXXX", default_value=pendulum.now().year)
+            # 年が特定できない場合の現在日時は、referenceがなく必要になった場合のみ取得する
+            year = self.fill_target_value(target="calendar_year", fill_str="XXXX", default_value=None)
             month = self.fill_target_value(target="calendar_month", fill_str="XX", default_value=1)
             day = self.fill_target_value(target="calendar_day", fill_str="XX", default_value=1)
 
@@ -87,7 +270,8 @@ class TIMEX:
                     if self.parsed["calendar_month"] == "XX":
                         month = self.reference.month
 
-            return pendulum.datetime(year=year, month=month, day=day, tz="Asia/Tokyo")
+            year = year if year is not None else self.now().year
+            return self._conversion_backend().make_datetime(year, month, day, tz="Asia/Tokyo")
         elif self.type == "TIME" and self.reference:
             hour = self.fill_target_value(target="clock_hour", fill_str="XX", default_value=0)
             minute = self.fill_target_value(target="clock_minute", fill_str="XX", default_value=0)
@@ -100,15 +284,16 @@ class TIMEX:
             else:
                 day_add = 0
 
-            return pendulum.datetime(
-                year=self.reference.year,
-                month=self.reference.month,
-                day=self.reference.day + day_add,
-                hour=hour,
-                minute=minute,
-                second=second,
-                tz=self.reference.tz,
+            dt = self._conversion_backend().make_datetime(
+                self.reference.year,
+                self.reference.month,
+                self.reference.day,
+                hour,
+                minute,
+                second,
+                tz=self.reference.tzinfo,
             )
+            return dt + timedelta(days=day_add)
         elif self.type == "DURATION" and self.reference:
             sign = 1
             if self.mod == "BEFORE":
@@ -121,7 +306,7 @@ class TIMEX:
             duration_minute = self.fill_target_value(target="minute", fill_str="XX", default_value=0)
             duration_seconds = self.fill_target_value(target="second", fill_str="XX", default_value=0)
 
-            duration = pendulum.duration(
+            duration = self._conversion_backend().duration(
                 years=duration_years,
                 months=duration_months,
                 days=duration_days,
@@ -129,7 +314,7 @@ class TIMEX:
                 minutes=duration_minute,
                 seconds=duration_seconds,
             )
-            return self.reference + sign * duration
+            return self._conversion_backend().add_duration(self.reference, duration, sign)
         else:
             return None
 
@@ -146,7 +331,7 @@ class TIMEX:
             return None
 
         # pendulum: Float year and months are not supported
-        return pendulum.duration(
+        return self._conversion_backend().duration(
             years=int(self.parsed.get("year", 0)),
             months=int(self.parsed.get("month", 0)),
             weeks=float(self.parsed.get("week", 0)),
@@ -177,6 +362,29 @@ class TIMEX:
         return f"<TIMEX3 {attributes_text}>"
 
 
+@dataclass
+class TIMEX(TIMEXMixin):
+    type: str
+    value: str
+    text: str
+
+    tid: Optional[str] = None
+    freq: Optional[str] = None
+    quant: Optional[str] = None
+    mod: Optional[str] = None
+
+    parsed: Dict[str, str] = field(default_factory=dict)
+    span: Optional[Tuple[int, int]] = None  # 数字を規格化した文字列中での正規表現が取得したspan
+    raw_span: Optional[Tuple[int, int]] = None  # 規格化前の入力文字列中でのspan
+    pattern: Optional[Pattern] = None
+    reference: Optional[datetime] = None
+    clock: Optional[Clock] = field(default=None, compare=False)
+    conversion_backend: Optional[ConversionBackend] = field(default=None, compare=False)
+
+    # dataclassが生成する__repr__ではなく、TIMEX3のタグ形式の表現を用いる
+    __repr__ = TIMEXMixin.__repr__
+
+
 @dataclass
 class AnnotatedTIMEX(TIMEX):
     """アノテーションされたTIMEXタグの情報を表現する際に用いるTIMEX拡張"""
@@ -185,3 +393,155 @@ class AnnotatedTIMEX(TIMEX):
     temporalFunction: Optional[str] = None
     rangeStart: Optional[str] = None
     rangeEnd: Optional[str] = None
+
+
+# CompactTIMEXでparsedを省略する場合にも、to_datetimeとto_durationのために残すキー
+conversion_parsed_keys: FrozenSet[str] = frozenset(
+    [
+        "calendar_year",
+        "calendar_month",
+        "calendar_day",
+        "clock_hour",
+        "clock_minute",
+        "clock_second",
+        "year",
+        "month",
+        "week",
+        "day",
+        "hour",
+        "minute",
+        "second",
+        "micorsecond",
+    ]
+)
+
+
+class CompactTIMEX(TIMEXMixin):
+    """大量のタグを保持するための、メモリ使用量の少ないTIMEX
+
+    __slots__によりインスタンスごとの__dict__を持たず、spanは開始位置と終了位置の2つの整数で保持する。
+    type, freq, quant, modの文字列はinternして共有する。
+    parsedはto_datetimeとto_durationに必要なキーのみを、patternはkeep_pattern=Trueの場合のみ保持する。
+    """
+
+    __slots__ = (
+        "type",
+        "value",
+        "text",
+        "tid",
+        "freq",
+        "quant",
+        "mod",
+        "_parsed",
+        "start",
+        "end",
+        "raw_start",
+        "raw_end",
+        "pattern",
+        "reference",
+        "clock",
+        "conversion_backend",
+    )
+
+    def __init__(
+        self,
+        type: str,
+        value: str,
+        text: str,
+        tid: Optional[str] = None,
+        freq: Optional[str] = None,
+        quant: Optional[str] = None,
+        mod: Optional[str] = None,
+        parsed: Optional[Dict[str, str]] = None,
+        span: Optional[Tuple[int, int]] = None,
+        raw_span: Optional[Tuple[int, int]] = None,
+        pattern: Optional[Pattern] = None,
+        reference: Optional[datetime] = None,
+        clock: Optional[Clock] = None,
+        conversion_backend: Optional[ConversionBackend] = None,
+    ) -> None:
+        self.type = sys.intern(type)
+        self.value = value
+        self.text = text
+        self.tid = tid
+        self.freq = _intern_optional(freq)
+        self.quant = _intern_optional(quant)
+        self.mod = _intern_optional(mod)
+        self.parsed = parsed
+        self.span = span
+        self.raw_span = raw_span
+        self.pattern = pattern
+        self.reference = reference
+        self.clock = clock
+        self.conversion_backend = conversion_backend
+
+    @classmethod
+    def from_timex(cls, timex: TIMEX, keep_parsed: bool = False, keep_pattern: bool = False) -> "CompactTIMEX":
+        """TIMEXからCompactTIMEXを生成する
+
+        Args:
+            timex (TIMEX): 変換元のTIMEX
+            keep_parsed (bool): Trueの場合はparsedをすべて保持する
+            keep_pattern (bool): Trueの場合はpatternを保持する
+
+        Returns:
+            CompactTIMEX: 変換したタグ
+        """
+        if keep_parsed:
+            parsed = timex.parsed
+        else:
+            parsed = {key: value for key, value in timex.parsed.items() if key in conversion_parsed_keys}
+
+        return cls(
+            type=timex.type,
+            value=timex.value,
+            text=timex.text,
+            tid=timex.tid,
+            freq=timex.freq,
+            quant=timex.quant,
+            mod=timex.mod,
+            parsed=parsed,
+            span=timex.span,
+            raw_span=timex.raw_span,
+            pattern=timex.pattern if keep_pattern else None,
+            reference=timex.reference,
+            clock=timex.clock,
+            conversion_backend=timex.conversion_backend,
+        )
+
+    @property
+    def parsed(self) -> Dict[str, str]:
+        return self._parsed if self._parsed is not None else {}
+
+    @parsed.setter
+    def parsed(self, parsed: Optional[Dict[str, str]]) -> None:
+        # 空のdictは保持しない
+        self._parsed = parsed or None
+
+    @property
+    def span(self) -> Optional[Tuple[int, int]]:
+        if self.start < 0:
+            return None
+        return (self.start, self.end)
+
+    @span.setter
+    def span(self, span: Optional[Tuple[int, int]]) -> None:
+        self.start, self.end = span if span is not None else (-1, -1)
+
+    @property
+    def raw_span(self) -> Optional[Tuple[int, int]]:
+        if self.raw_start < 0:
+            return None
+        return (self.raw_start, self.raw_end)
+
+    @raw_span.setter
+    def raw_span(self, raw_span: Optional[Tuple[int, int]]) -> None:
+        self.raw_start, self.raw_end = raw_span if raw_span is not None else (-1, -1)
+
+
+# TimexParserが返すタグの型。compact=Trueの場合はCompactTIMEXとなる
+AnyTIMEX = Union[TIMEX, CompactTIMEX]
+
+
+def _intern_optional(text: Optional[str]) -> Optional[str]:
+    return sys.intern(text) if text is not None else None
@@ -1,17 +1,39 @@
-import re
-from typing import List, Optional
+from typing import List, Optional, Union
 
-from ja_timex.pattern.abstime import patterns as abstime_patterns
-from ja_timex.pattern.duration import patterns as duration_patterns
 from ja_timex.pattern.place import Pattern
-from ja_timex.pattern.reltime import patterns as reltime_patterns
-from ja_timex.pattern.set import patterns as set_patterns
+from ja_timex.regex_backend import RegexBackend, get_regex_backend
 from ja_timex.tag import TIMEX
 
 
 class BaseTagger:
-    def __init__(self, patterns=None) -> None:
+    _patterns: Optional[List[Pattern]]
+
+    def __init__(
+        self, patterns: Optional[List[Pattern]] = None, regex_backend: Union[None, str, RegexBackend] = None
+    ) -> None:
         self.patterns = patterns
+        # parse()で用いる正規表現のバックエンド
+        self.regex_backend = get_regex_backend(regex_backend)
+
+    @property
+    def patterns(self) -> List[Pattern]:
+        """Taggerが用いるPatternのリスト
+
+        指定されなかった場合は、初回アクセス時にデフォルトのパターンを読み込む。
+
+        Returns:
+            List[Pattern]: Patternのリスト
+        """
+        if self._patterns is None:
+            self._patterns = self.load_default_patterns()
+        return self._patterns
+
+    @patterns.setter
+    def patterns(self, patterns: Optional[List[Pattern]]) -> None:
+        self._patterns = patterns
+
+    def load_default_patterns(self) -> List[Pattern]:
+        raise ValueError(f"{self.__class__.__name__} requires patterns")
 
     def parse(self, text: str) -> Optional[TIMEX]:
         """すべてのPatternを用いてパースする
@@ -31,7 +53,7 @@ class BaseTagger:
         text = text.strip()
 
         for pattern in self.patterns:
-            re_match = re.fullmatch(pattern.re_pattern, text)
+            re_match = pattern.compile(self.regex_backend).fullmatch(text)
             if re_match:
                 results.append(pattern.parse_func(re_match, pattern))
 
@@ -46,20 +68,28 @@ class BaseTagger:
 
 
 class AbstimeTagger(BaseTagger):
-    def __init__(self, patterns: List[Pattern] = abstime_patterns) -> None:
-        self.patterns = patterns
+    def load_default_patterns(self) -> List[Pattern]:
+        from ja_timex.pattern.abstime import patterns
+
+        return patterns
 
 
 class DurationTagger(BaseTagger):
-    def __init__(self, patterns: List[Pattern] = duration_patterns) -> None:
-        self.patterns = patterns
+    def load_default_patterns(self) -> List[Pattern]:
+        from ja_timex.pattern.duration import patterns
+
+        return patterns
 
 
 class ReltimeTagger(BaseTagger):
-    def __init__(self, patterns: List[Pattern] = reltime_patterns) -> None:
-        self.patterns = patterns
+    def load_default_patterns(self) -> List[Pattern]:
+        from ja_timex.pattern.reltime import patterns
+
+        return patterns
 
 
 class SetTagger(BaseTagger):
-    def __init__(self, patterns: List[Pattern] = set_patterns) -> None:
-        self.patterns = patterns
+    def load_default_patterns(self) -> List[Pattern]:
+        from ja_timex.pattern.set import patterns
+
+        return patterns
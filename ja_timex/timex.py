@@ -1,45 +1,152 @@
-import re
+import copy
+from array import array
+from bisect import bisect_right
 from collections import defaultdict
-from typing import DefaultDict, Dict, List, Optional
-
-import pendulum
+from datetime import datetime
+from typing import DefaultDict, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple, Union
 
+from ja_timex.clock import Clock, SystemClock
+from ja_timex.columnar import TimexColumns
+from ja_timex.extractor import BaseExtractor, extractors
 from ja_timex.number_normalizer import NumberNormalizer
-from ja_timex.tag import TIMEX
-from ja_timex.tagger import AbstimeTagger, DurationTagger, ReltimeTagger, SetTagger
+from ja_timex.pattern.place import Pattern, compile_patterns
+from ja_timex.profile import ExtractionProfile, get_extraction_profile
+from ja_timex.regex_backend import RegexBackend, get_regex_backend
+from ja_timex.structures import CacheInfo, IntervalSet, LRUCache
+from ja_timex.tag import TIMEX, AnyTIMEX, CompactTIMEX, ConversionBackend, get_conversion_backend
+from ja_timex.tagger import AbstimeTagger, BaseTagger, DurationTagger, ReltimeTagger, SetTagger
 from ja_timex.util import is_parial_pattern_of_number_expression
 
 
 class TimexParser:
     def __init__(
         self,
-        number_normalizer=NumberNormalizer(),
-        abstime_tagger=AbstimeTagger(),
-        duration_tagger=DurationTagger(),
-        reltime_tagger=ReltimeTagger(),
-        set_tagger=SetTagger(),
+        number_normalizer: Optional[NumberNormalizer] = None,
+        abstime_tagger: Optional[AbstimeTagger] = None,
+        duration_tagger: Optional[DurationTagger] = None,
+        reltime_tagger: Optional[ReltimeTagger] = None,
+        set_tagger: Optional[SetTagger] = None,
         custom_tagger=None,
-        reference: Optional[pendulum.DateTime] = None,
+        reference: Optional[datetime] = None,
+        extractor: str = "loop",
+        result_cache_size: int = 0,
+        compact: bool = False,
+        keep_parsed: bool = False,
+        keep_pattern: bool = False,
+        clock: Optional[Clock] = None,
+        conversion_backend: Union[None, str, ConversionBackend] = None,
+        regex_backend: Union[None, str, RegexBackend] = None,
+        profile: Union[None, str, ExtractionProfile] = None,
+        types: Optional[Iterable[str]] = None,
+        tier: Optional[str] = None,
     ) -> None:
-        self.number_normalizer = number_normalizer
-        self.abstime_tagger = abstime_tagger
-        self.duration_tagger = duration_tagger
-        self.reltime_tagger = reltime_tagger
-        self.set_tagger = set_tagger
+        self.number_normalizer = number_normalizer if number_normalizer is not None else NumberNormalizer()
+        self.abstime_tagger = abstime_tagger if abstime_tagger is not None else AbstimeTagger()
+        self.duration_tagger = duration_tagger if duration_tagger is not None else DurationTagger()
+        self.reltime_tagger = reltime_tagger if reltime_tagger is not None else ReltimeTagger()
+        self.set_tagger = set_tagger if set_tagger is not None else SetTagger()
         self.custom_tagger = custom_tagger
         self.reference = reference
+        # 年が特定できない日付表現を日時に変換する際の時計。パースごとに固定したものを各TIMEXに渡す
+        self.clock = clock if clock is not None else SystemClock()
+        # to_datetimeとto_durationが返す日時と経過時間の型。"stdlib", "pendulum"またはConversionBackendのインスタンス
+        self.conversion_backend = get_conversion_backend(conversion_backend)
+        # parse_batchで入力文字列を連結する際の区切り文字。いずれのパターンにもマッチしない文字を用いる
+        self.batch_separator = "\x00"
+        # 同じ文字列が繰り返し入力される場合のための、parse()の結果のキャッシュ。0の場合は無効
+        self.result_cache = LRUCache(maxsize=result_cache_size)
+        # Trueの場合は、メモリ使用量の少ないCompactTIMEXを返す
+        self.compact = compact
+        # compact=Trueの場合に、CompactTIMEXが既定では落とすparsedの全キーとpatternを保持するか
+        self.keep_parsed = keep_parsed
+        self.keep_pattern = keep_pattern
+
+        if extractor not in extractors:
+            raise ValueError(f"Unknown extractor: {extractor}. Available extractors are {list(extractors)}")
+        self.extractor_name = extractor
+        # パターンの正規表現のバックエンド。"re", "regex", "re2"またはRegexBackendのインスタンス
+        self.regex_backend = get_regex_backend(regex_backend)
+        # 抽出に用いるパターンの種類とtier。typesとtierはprofileの値を上書きする
+        self.profile = get_extraction_profile(profile, types, tier)
+
+        # パターンの読み込みとコンパイルは、初回のパース時またはprepare()の呼び出し時に行う
+        self._all_patterns: Optional[Dict[str, List[Pattern]]] = None
+        self._extractor: Optional[BaseExtractor] = None
+        self._max_match_length: Optional[int] = None
+
+    def prepare(self) -> "TimexParser":
+        """パターンの読み込みとコンパイルを行う
+
+        通常は初回のパース時に自動で行われる。初回のパースの遅延を避けたい場合に、事前に呼び出す。
+
+        Returns:
+            TimexParser: 自身
+        """
+        if self._extractor is not None:
+            return self
+
+        # profileに含まれない種類のパターンは読み込まない
+        all_patterns = {}
+        for type_name, tagger in self._type2tagger().items():
+            if self.profile.includes_type(type_name):
+                all_patterns[type_name] = self.profile.select(tagger.patterns)
+
+        # 抽出時にはコンパイル済みの正規表現のみを用いる
+        for patterns in all_patterns.values():
+            compile_patterns(patterns, self.regex_backend)
 
-        self.all_patterns = {}
-        self.all_patterns["abstime"] = self.abstime_tagger.patterns
-        self.all_patterns["duration"] = self.duration_tagger.patterns
-        self.all_patterns["reltime"] = self.reltime_tagger.patterns
-        self.all_patterns["set"] = self.set_tagger.patterns
+        self._all_patterns = all_patterns
+        self._extractor = extractors[self.extractor_name](all_patterns, regex_backend=self.regex_backend)
+        return self
+
+    def _type2tagger(self) -> Dict[str, BaseTagger]:
+        type2tagger = {
+            "abstime": self.abstime_tagger,
+            "duration": self.duration_tagger,
+            "reltime": self.reltime_tagger,
+            "set": self.set_tagger,
+        }
         if self.custom_tagger:
-            self.all_patterns["custom"] = self.custom_tagger.patterns
+            type2tagger["custom"] = self.custom_tagger
+        return type2tagger
+
+    @property
+    def all_patterns(self) -> Dict[str, List[Pattern]]:
+        self.prepare()
+        assert self._all_patterns is not None
+        return self._all_patterns
+
+    @property
+    def extractor(self) -> BaseExtractor:
+        self.prepare()
+        assert self._extractor is not None
+        return self._extractor
+
+    @property
+    def max_match_length(self) -> int:
+        """パターンがマッチする文字列の最大の長さ
+
+        iter_parseで隣り合うウィンドウを重ねる文字数に用いる。iter_parse以外では不要なため、初めて参照された時点で求める。
+
+        Returns:
+            int: すべてのパターンのPattern.max_widthの最大値
+        """
+        if self._max_match_length is None:
+            self._max_match_length = max(
+                (pattern.max_width for patterns in self.all_patterns.values() for pattern in patterns),
+                default=0,
+            )
+        return self._max_match_length
+
+    def parse(self, raw_text: str) -> List[AnyTIMEX]:
+        use_cache = self.result_cache.maxsize > 0
+        if use_cache:
+            cached_tags = self.result_cache.get(raw_text)
+            if cached_tags is not None:
+                return self._copy_timex_tags(cached_tags, self.clock.freeze())
 
-    def parse(self, raw_text: str) -> List[TIMEX]:
         # 数の認識/規格化
-        processed_text = self._normalize_number(raw_text)
+        processed_text, offsets = self.number_normalizer.normalize_with_offsets(raw_text)
 
         # 時間表現の抽出
         all_extracts = self._extract(processed_text)
@@ -48,38 +155,307 @@ class TimexParser:
         timex_tags = self._parse(type2extracts)
 
         # 規格化後のタグの情報付与
-        timex_tags = self._modify_additional_information(timex_tags, processed_text)
+        modified_tags = self._modify_additional_information(timex_tags, processed_text, offsets, self.clock.freeze())
+
+        if use_cache:
+            self.result_cache.put(raw_text, self._copy_timex_tags(modified_tags, None))
+        return modified_tags
+
+    def result_cache_info(self) -> CacheInfo:
+        """parse()の結果のキャッシュの統計情報を返す
+
+        Returns:
+            CacheInfo: ヒット数、ミス数、削除数、最大件数、現在の件数
+        """
+        return self.result_cache.cache_info()
+
+    def _copy_timex_tags(self, timex_tags: List[AnyTIMEX], clock: Optional[Clock]) -> List[AnyTIMEX]:
+        # 呼び出し側での変更がキャッシュに影響しないように複製する。Patternは共有する
+        # 抽出と規格化の結果はreferenceに依存しないため、キャッシュは入力文字列のみをキーとし、referenceとclockは複製時に付け直す
+        copied_tags = []
+        for timex in timex_tags:
+            copied_timex = copy.copy(timex)
+            copied_timex.parsed = dict(timex.parsed)
+            copied_timex.reference = self.reference
+            copied_timex.clock = clock
+            copied_timex.conversion_backend = self.conversion_backend
+            copied_tags.append(copied_timex)
+        return copied_tags
+
+    def parse_batch(self, raw_texts: Iterable[str]) -> List[List[AnyTIMEX]]:
+        """複数の文字列をまとめてパースする
+
+        数の規格化は区切り文字で連結した文字列に対して一度に行う。
+        時間表現の抽出では、パターンの選択とコンパイル済みの正規表現の取得を一度だけ行い、
+        各パターンは必須の文字を含む文字列の範囲のみに適用することで、文字列ごとにparse()を呼ぶ際のオーバーヘッドを削減する。
+        結果は文字列ごとにparse()を呼んだ場合と同じで、spanはそれぞれの入力文字列に対する位置となる。
+
+        Args:
+            raw_texts (Iterable[str]): 入力文字列
+
+        Returns:
+            List[List[AnyTIMEX]]: 入力文字列ごとの時間情報表現
+        """
+        raw_texts = list(raw_texts)
+        if not raw_texts:
+            return []
+
+        normalized, text_start_indices, type2extracts = self._extract_joined(raw_texts)
+        # 規格化
+        timex_tags = self._parse(type2extracts)
+
+        # 入力文字列ごとに分け、spanをそれぞれの入力文字列に対する位置に変換する
+        text2timex_tags: List[List[TIMEX]] = [[] for _ in normalized]
+        for timex in timex_tags:
+            # パターンのマッチから生成したタグは必ずspanを持つ
+            assert timex.span is not None
+            start_i, end_i = timex.span
+            text_i = bisect_right(text_start_indices, start_i) - 1
+            text_start_i = text_start_indices[text_i]
+            timex.span = (start_i - text_start_i, end_i - text_start_i)
+            text2timex_tags[text_i].append(timex)
+
+        clock = self.clock.freeze()
+        return [
+            self._modify_additional_information(tags, text, offsets, clock)
+            for tags, (text, offsets) in zip(text2timex_tags, normalized)
+        ]
+
+    def parse_columns(self, raw_texts: Iterable[str]) -> TimexColumns:
+        """複数の文字列をまとめてパースし、結果を列ごとに返す
+
+        parse_batch()と同様にまとめて抽出し、パターンの規格化の結果をリストに保持せずに出現順に各列に追加する。
+        入力文字列ごとのリストの作成、tidやreferenceの付与は行わない。
+        時間情報表現はdoc_id、startの順に並ぶ。
 
+        Args:
+            raw_texts (Iterable[str]): 入力文字列
+
+        Returns:
+            TimexColumns: 列ごとの時間情報表現
+        """
+        columns = TimexColumns()
+        raw_texts = list(raw_texts)
+        if not raw_texts:
+            return columns
+
+        normalized, text_start_indices, type2extracts = self._extract_joined(raw_texts)
+
+        # 規格化の結果をリストに保持せずに、出現順に各列に追加する
+        type2tagger = self._type2tagger()
+        all_extracts = [
+            (extract["re_match"], type2tagger[type_name], extract["pattern"])
+            for type_name, extracts in type2extracts.items()
+            for extract in extracts
+        ]
+        all_extracts.sort(key=lambda x: x[0].start())
+
+        append_doc_id, append_start, append_end = columns.doc_id.append, columns.start.append, columns.end.append
+        append_raw_start, append_raw_end = columns.raw_start.append, columns.raw_end.append
+        append_type_code, append_value, append_text = (
+            columns.type_code.append,
+            columns.value.append,
+            columns.text.append,
+        )
+        append_mod, append_freq, append_quant = columns.mod.append, columns.freq.append, columns.quant.append
+        type_codes: Dict[str, int] = {}
+        text_i = 0
+        text_start_i = 0
+        next_text_start_i = text_start_indices[1] if len(text_start_indices) > 1 else None
+        offsets = normalized[0][1]
+        for re_match, tagger, pattern in all_extracts:
+            start_i, end_i = re_match.span()
+            # 出現順に処理するため、入力文字列のインデックスは前から進めるだけでよい
+            while next_text_start_i is not None and next_text_start_i <= start_i:
+                text_i += 1
+                text_start_i = next_text_start_i
+                next_text_start_i = text_start_indices[text_i + 1] if text_i + 1 < len(text_start_indices) else None
+                offsets = normalized[text_i][1]
+            timex = tagger.parse_with_pattern(re_match, pattern)
+
+            append_doc_id(text_i)
+            append_start(start_i - text_start_i)
+            append_end(end_i - text_start_i)
+            append_raw_start(offsets[start_i - text_start_i])
+            append_raw_end(offsets[end_i - text_start_i])
+            type_code = type_codes.get(timex.type)
+            if type_code is None:
+                type_code = type_codes[timex.type] = columns.type_code_of(timex.type)
+            append_type_code(type_code)
+            append_value(timex.value)
+            append_text(timex.text)
+            append_mod(timex.mod)
+            append_freq(timex.freq)
+            append_quant(timex.quant)
+
+        return columns
+
+    def _extract_joined(
+        self, raw_texts: List[str]
+    ) -> Tuple[List[Tuple[str, array]], List[int], DefaultDict[str, List[Dict]]]:
+        # 規格化した文字列と位置の対応、連結した文字列中での各文字列の開始位置、重複を除いた抽出結果を返す
+        # 数の認識/規格化
+        normalized = self.number_normalizer.normalize_batch_with_offsets(raw_texts, separator=self.batch_separator)
+        processed_texts = [text for text, _ in normalized]
+
+        # 連結した文字列に対して、各パターンをそれを含み得る文字列の範囲のみに適用する
+        processed_text = self.batch_separator.join(processed_texts)
+        text_start_indices = []
+        text_spans = []
+        text_start_i = 0
+        for text in processed_texts:
+            text_start_indices.append(text_start_i)
+            text_spans.append((text_start_i, text_start_i + len(text)))
+            text_start_i += len(text) + len(self.batch_separator)
+
+        # 時間表現の抽出
+        all_extracts = self._extract(processed_text, text_spans)
+        type2extracts = self._drop_duplicates(processed_text, all_extracts)
+
+        return normalized, text_start_indices, type2extracts
+
+    def iter_parse(self, raw_chunks: Iterable[str], window_size: int = 4096) -> Iterator[AnyTIMEX]:
+        """分割して与えられた長い文字列を逐次的にパースする
+
+        文字列全体をメモリに載せずに、一定の長さのウィンドウごとに時間情報表現を抽出して返す。
+        隣り合うウィンドウは最長のマッチの2倍の長さだけ重ねて処理するため、ウィンドウの境界をまたぐ表現も取得できる。
+        spanとraw_spanはウィンドウ内ではなく、それぞれ規格化した文字列全体と入力文字列全体に対する位置となる。
+
+        数の規格化は、数の表現や慣用句に含まれ得ない文字の位置で分けた単位で行う。
+        window_sizeより長い分割は、さらにwindow_sizeごとに分けて処理する。
+        ただし、数の表現に含まれ得る文字の連続はその終わりまで読み進めてから規格化するため、parse()と同じ結果となる。
+
+        Args:
+            raw_chunks (Iterable[str]): 入力文字列を分割したもの
+            window_size (int): 一度に処理するウィンドウの長さ
+
+        Yields:
+            Iterator[AnyTIMEX]: 出現順の時間情報表現
+        """
+        overlap = 2 * self.max_match_length
+        raw_pending = ""
+        window = ""
+        window_start_i = 0  # 規格化した文字列全体におけるwindowの開始位置
+        window_offsets = array("i", [0])  # windowの各位置に対応する入力文字列全体での位置
+        raw_start_i = 0  # 入力文字列全体におけるraw_pendingの開始位置
+        frontier_i = 0  # これより前から始まる候補は、すでに前のウィンドウで処理済み
+        tid_i = 0
+        clock = self.clock.freeze()
+
+        # 長い分割をそのまま保持しないように、window_sizeごとに分けて処理する
+        raw_pieces = iter(
+            raw_chunk[i : i + window_size] for raw_chunk in raw_chunks for i in range(0, len(raw_chunk), window_size)
+        )
+        context_chars = self.number_normalizer.context_chars()
+        is_last = False
+        while not is_last:
+            raw_piece = next(raw_pieces, None)
+            if raw_piece is None:
+                is_last = True
+                boundary_i = len(raw_pending)
+            else:
+                # raw_pendingは数の表現に含まれ得る文字のみからなるため、追加した部分のみから区切りを探す
+                search_start_i = len(raw_pending)
+                raw_pending += raw_piece
+                boundary_i = self._find_normalization_boundary(raw_pending, search_start_i, context_chars)
+
+            processed_text, offsets = self.number_normalizer.normalize_with_offsets(raw_pending[:boundary_i])
+            window += processed_text
+            window_offsets.pop()
+            window_offsets.extend(raw_start_i + offset for offset in offsets)
+            raw_start_i += boundary_i
+            raw_pending = raw_pending[boundary_i:]
+
+            while is_last or len(window) >= window_size + overlap:
+                if is_last:
+                    commit_end_i = window_start_i + len(window)
+                else:
+                    commit_end_i = window_start_i + len(window) - overlap
+
+                timex_tags = self._parse_window(window, window_start_i, frontier_i, commit_end_i)
+                next_frontier_i = commit_end_i
+                for timex in timex_tags:
+                    # パターンのマッチから生成したタグは必ずspanを持つ
+                    assert timex.span is not None
+                    start_i, end_i = timex.span
+                    next_frontier_i = max(next_frontier_i, end_i)
+                    timex.raw_span = (window_offsets[start_i - window_start_i], window_offsets[end_i - window_start_i])
+                    timex.tid = f"t{tid_i}"
+                    tid_i += 1
+                    if self.reference:
+                        timex.reference = self.reference
+                    timex.clock = clock
+                    timex.conversion_backend = self.conversion_backend
+                    yield self._to_result(timex)
+
+                if is_last:
+                    break
+                frontier_i = next_frontier_i
+                # 数字表現の一部かの判定のために、1文字前までを残しておく
+                keep_from_i = max(frontier_i - 1, window_start_i)
+                window = window[keep_from_i - window_start_i :]
+                window_offsets = window_offsets[keep_from_i - window_start_i :]
+                window_start_i = keep_from_i
+
+    def _find_normalization_boundary(self, raw_text: str, search_start_i: int, context_chars: FrozenSet[str]) -> int:
+        # 数の規格化は前後の文字に依存するため、数の表現や慣用句に含まれ得ない文字の直後で分ける
+        # その文字をまたいで規格化される表現はないため、分けて規格化しても文字列全体を規格化した場合と同じになる
+        for i in range(len(raw_text) - 1, search_start_i - 1, -1):
+            if raw_text[i] not in context_chars:
+                return i + 1
+
+        # 数の表現に含まれ得る文字のみが続く場合は、途中で分けると規格化の結果が変わるため、その終わりまで分けない
+        return 0
+
+    def _parse_window(self, window: str, window_start_i: int, frontier_i: int, commit_end_i: int) -> List[TIMEX]:
+        # frontier_i以降かつcommit_end_iより前から始まる時間情報表現のみを、出現順に返す
+        all_extracts = [
+            extract for extract in self._extract(window) if window_start_i + extract["re_match"].start() >= frontier_i
+        ]
+        type2extracts = self._drop_duplicates(window, all_extracts)
+
+        timex_tags = []
+        for timex in sorted(self._parse(type2extracts), key=lambda x: x.span[0] if x.span else 0):
+            assert timex.span is not None
+            start_i, end_i = timex.span
+            if window_start_i + start_i >= commit_end_i:
+                continue
+            timex.span = (window_start_i + start_i, window_start_i + end_i)
+            timex_tags.append(timex)
         return timex_tags
 
     def _normalize_number(self, raw_text: str) -> str:
         return self.number_normalizer.normalize(raw_text)
 
-    def _extract(self, processed_text: str) -> List[Dict]:
-        all_extracts = []
+    def _extract(self, processed_text: str, text_spans: Optional[List[Tuple[int, int]]] = None) -> List[Dict]:
+        # text_spansを指定した場合は、連結した文字列のそれぞれの範囲内で抽出する
+        if text_spans is None:
+            extracts = self.extractor.extract(processed_text)
+        else:
+            extracts = self.extractor.extract_batch(processed_text, text_spans)
 
-        # すべてのtaggerのパターンの正規表現を順に適用していく
-        for type_name, patterns in self.all_patterns.items():
-            for pattern in patterns:
-                # 文字列中からのパターン検知
-                re_iter = re.finditer(pattern.re_pattern, processed_text)
-                for re_match in re_iter:
-                    if is_parial_pattern_of_number_expression(re_match, processed_text):
-                        continue
-                    all_extracts.append({"type_name": type_name, "re_match": re_match, "pattern": pattern})
+        all_extracts = []
+        for extract in extracts:
+            # 数字から始まり得るパターンは、Pattern.compileの後読みまたはDigitBoundaryRegexで判定済み
+            if not extract["pattern"].starts_with_digit and is_parial_pattern_of_number_expression(
+                extract["re_match"], processed_text
+            ):
+                continue
+            all_extracts.append(extract)
         return all_extracts
 
     def _drop_duplicates(self, processed_text: str, all_extracts: List[Dict]) -> DefaultDict[str, List[Dict]]:
         type2extracts = defaultdict(list)
-        text_coverage_flag = [False] * len(processed_text)
+        text_coverage = IntervalSet()
 
-        long_order_extracts = sorted(all_extracts, key=lambda x: len(x["re_match"].group()), reverse=True)
+        long_order_extracts = sorted(
+            all_extracts, key=lambda x: x["re_match"].end() - x["re_match"].start(), reverse=True
+        )
         for target_extract in long_order_extracts:
             start_i, end_i = target_extract["re_match"].span()
 
             # すべてがまだ未使用のcharだった場合に候補に加える
-            if any(text_coverage_flag[start_i:end_i]) is False:
-                text_coverage_flag[start_i:end_i] = [True] * (end_i - start_i)
+            if text_coverage.add_if_disjoint(start_i, end_i):
                 type2extracts[target_extract["type_name"]].append(target_extract)
 
         return type2extracts
@@ -101,14 +477,30 @@ class TimexParser:
 
         return results
 
-    def _modify_additional_information(self, timex_tags: List[TIMEX], processed_text: str) -> List[TIMEX]:
-        # update @tid and reference
-        modified_tags = []
+    def _to_result(self, timex: TIMEX) -> AnyTIMEX:
+        # compact=Trueの場合はCompactTIMEXに変換する
+        if self.compact:
+            return CompactTIMEX.from_timex(timex, keep_parsed=self.keep_parsed, keep_pattern=self.keep_pattern)
+        return timex
+
+    def _modify_additional_information(
+        self,
+        timex_tags: List[TIMEX],
+        processed_text: str,
+        offsets: Optional[array] = None,
+        clock: Optional[Clock] = None,
+    ) -> List[AnyTIMEX]:
+        # update @tid, reference, clock, conversion_backend and raw_span, and convert to CompactTIMEX if needed
+        modified_tags: List[AnyTIMEX] = []
         sorted_timex_tags = sorted(timex_tags, key=lambda x: x.span[0] if x.span else 0)
         for i, timex in enumerate(sorted_timex_tags):
             timex.tid = f"t{i}"
+            if offsets is not None and timex.span:
+                timex.raw_span = (offsets[timex.span[0]], offsets[timex.span[1]])
             if self.reference:
                 timex.reference = self.reference
-            modified_tags.append(timex)
+            timex.clock = clock
+            timex.conversion_backend = self.conversion_backend
+            modified_tags.append(self._to_result(timex))
 
         return modified_tags
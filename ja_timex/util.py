@@ -1,11 +1,65 @@
+import calendar
 import re
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Union
+
+try:
+    from re import _constants as sre_constants  # type: ignore
+    from re import _parser as sre_parse  # type: ignore
+except ImportError:  # Python 3.10以前
+    import sre_constants  # type: ignore
+    import sre_parse  # type: ignore
+
+# sre_parse.parseで正規表現を変換した構文木
+ParsedPattern = Any
+
+
+def parse_pattern(re_pattern: Union[str, ParsedPattern]) -> ParsedPattern:
+    """正規表現を構文木に変換する。構文木が与えられた場合はそのまま返す
+
+    get_required_charsなどの解析は文字列と構文木のどちらも受け取る。
+    Patternは構文木を一度だけ生成して保持し、それぞれの解析で共有する。
+
+    Args:
+        re_pattern (Union[str, ParsedPattern]): 正規表現、または変換済みの構文木
+
+    Returns:
+        ParsedPattern: 構文木
+    """
+    return sre_parse.parse(re_pattern) if isinstance(re_pattern, str) else re_pattern
+
+
+# 数字表現の一部から始まるマッチを除くための後読み
+digit_boundary_lookbehind = "(?<![0-9])"
+digit_regex = re.compile("[0-9]")
+
+
+def add_digit_boundary(re_pattern: str) -> str:
+    """正規表現の先頭に、直前の文字が数字でないことを表す後読みを加える
+
+    is_parial_pattern_of_number_expressionと同じ判定を正規表現の中で行う。
+    マッチした後に除くのではなく探索の時点で除くため、finditerはその位置と重なる後続のマッチも探索できる。
+    ただし、先頭が後読みの正規表現では、reが先頭の文字の候補で探索位置を絞り込む最適化が働かない。
+    そのためPatternは、数字から始まり得るパターンにのみ後読みを加える(Pattern.bounded_re_pattern)。
+
+    e.g. "(?P<calendar_day>[0-9]{1,2})日" -> "(?<![0-9])(?:(?P<calendar_day>[0-9]{1,2})日)"
+
+    Args:
+        re_pattern (str): 対象となる正規表現
+
+    Returns:
+        str: 後読みを加えた正規表現
+    """
+    # トップレベルの選択肢すべてに後読みが掛かるように、非キャプチャグループで囲む
+    return f"{digit_boundary_lookbehind}(?:{re_pattern})"
 
 
 def is_parial_pattern_of_number_expression(re_match: re.Match, processed_text: str) -> bool:
     """対象パターンが数字表現の一部かを判定する
 
     正規表現の記法によっては、数字表現の一部を取得してしまう例がある。
-    与えられたパターンが数字表現の一部を間違って取得していないかをチェックする
+    与えられたパターンが数字表現の一部を間違って取得していないかをチェックする。
+    数字から始まり得るパターンは、Pattern.compileが同じ判定を正規表現に含めるため用いない
 
     e.g. "これは13/13です" に対して "3/13" というパターンを取得している場合 -> True
     e.g. "これは3/13です" に対して "3/13" というパターンを取得している場合 -> False
@@ -17,9 +71,375 @@ def is_parial_pattern_of_number_expression(re_match: re.Match, processed_text: s
     Returns:
         bool: 数字表現の一部かを表す真偽値
     """
-    start_i = re_match.span()[0]
+    start_i = re_match.start()
 
-    if start_i != 0 and re.match("[0-9]", processed_text[start_i - 1]):
+    if start_i != 0 and digit_regex.match(processed_text, start_i - 1):
         return True
     else:
         return False
+
+
+def _required_chars_of_items(items: List[Tuple]) -> FrozenSet[str]:
+    required: FrozenSet[str] = frozenset()
+    for op, av in items:
+        required |= _required_chars_of_item(op, av)
+    return required
+
+
+def _required_chars_of_item(op, av) -> FrozenSet[str]:
+    if op is sre_constants.LITERAL:
+        return frozenset(chr(av))
+    elif op is sre_constants.IN and len(av) == 1 and av[0][0] is sre_constants.LITERAL:
+        # [秒]のように1文字のみの文字クラス
+        return frozenset(chr(av[0][1]))
+    elif op is sre_constants.SUBPATTERN:
+        return _required_chars_of_items(av[-1])
+    elif op is sre_constants.BRANCH:
+        # すべての選択肢に共通して含まれる文字のみが必須となる
+        branches = [_required_chars_of_items(branch) for branch in av[1]]
+        return frozenset.intersection(*branches)
+    elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) and av[0] >= 1:
+        return _required_chars_of_items(av[2])
+    else:
+        # 省略可能な繰り返しや先読みなど、必須の文字を特定できないもの
+        return frozenset()
+
+
+def get_required_chars(re_pattern: Union[str, ParsedPattern]) -> FrozenSet[str]:
+    """正規表現がマッチするために必ず含まれる文字の集合を求める
+
+    e.g. "(?P<calendar_month>1[0-2]|0?[1-9])月" -> {"月"}
+    e.g. "(一昨年|おととし)" -> {}
+
+    Args:
+        re_pattern (Union[str, ParsedPattern]): 対象となる正規表現、またはparse_patternで変換した構文木
+
+    Returns:
+        FrozenSet[str]: マッチする文字列に必ず含まれる文字の集合
+    """
+    return _required_chars_of_items(parse_pattern(re_pattern).data)
+
+
+# get_max_widthで、上限のない繰り返しとみなす回数
+default_max_repeat = 32
+
+
+def _max_width_of_items(items: List[Tuple], max_repeat: int) -> int:
+    return sum(_max_width_of_item(op, av, max_repeat) for op, av in items)
+
+
+def _max_width_of_item(op, av, max_repeat: int) -> int:
+    if op in (sre_constants.LITERAL, sre_constants.NOT_LITERAL, sre_constants.IN, sre_constants.ANY):
+        return 1
+    elif op is sre_constants.SUBPATTERN:
+        return _max_width_of_items(av[-1], max_repeat)
+    elif op is sre_constants.BRANCH:
+        return max(_max_width_of_items(branch, max_repeat) for branch in av[1])
+    elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+        repeat = min(av[1], max_repeat)
+        return repeat * _max_width_of_items(av[2], max_repeat)
+    else:
+        # 先読みや位置指定などの幅を持たないもの
+        return 0
+
+
+def get_max_width(re_pattern: Union[str, ParsedPattern], max_repeat: int = default_max_repeat) -> int:
+    """正規表現がマッチする文字列の最大の長さを求める
+
+    "+"や"*"などの上限のない繰り返しは、max_repeat回までの繰り返しとみなす
+
+    e.g. "(?P<calendar_month>1[0-2]|0?[1-9])月" -> 3
+    e.g. "(?P<year>[0-9]+)年" -> 33
+
+    Args:
+        re_pattern (Union[str, ParsedPattern]): 対象となる正規表現、またはparse_patternで変換した構文木
+        max_repeat (int): 上限のない繰り返しの回数とみなす値
+
+    Returns:
+        int: マッチする文字列の最大の長さ
+    """
+    return _max_width_of_items(parse_pattern(re_pattern).data, max_repeat)
+
+
+def _chars_of_item(op, av) -> Optional[FrozenSet[str]]:
+    # 1文字にマッチする要素がマッチし得る文字の集合。列挙できない場合はNone
+    if op is sre_constants.LITERAL:
+        return frozenset(chr(av))
+    elif op is sre_constants.IN:
+        chars: Set[str] = set()
+        for class_op, class_av in av:
+            if class_op is sre_constants.LITERAL:
+                chars.add(chr(class_av))
+            elif class_op is sre_constants.RANGE:
+                chars |= {chr(code) for code in range(class_av[0], class_av[1] + 1)}
+            else:
+                return None
+        return frozenset(chars)
+    return None
+
+
+def _is_window_searchable_items(items: List[Tuple], repeat_chars: FrozenSet[str]) -> bool:
+    return all(_is_window_searchable_item(op, av, repeat_chars) for op, av in items)
+
+
+def _is_window_searchable_item(op, av, repeat_chars: FrozenSet[str]) -> bool:
+    if op in (sre_constants.LITERAL, sre_constants.NOT_LITERAL, sre_constants.IN, sre_constants.ANY):
+        return True
+    elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+        # 後読みは探索の開始位置より前の文字も参照するため扱えるが、先読みは探索の終了位置より後の文字を参照できない
+        return av[0] < 0 and _is_window_searchable_items(av[1], repeat_chars)
+    elif op is sre_constants.SUBPATTERN:
+        return _is_window_searchable_items(av[-1], repeat_chars)
+    elif op is sre_constants.BRANCH:
+        return all(_is_window_searchable_items(branch, repeat_chars) for branch in av[1])
+    elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+        if av[1] is not sre_constants.MAXREPEAT:
+            return _is_window_searchable_items(av[2], repeat_chars)
+        # 上限のない繰り返しは、repeat_charsのみからなる1文字の繰り返しに限る
+        chars = _chars_of_item(*av[2][0]) if len(av[2]) == 1 else None
+        return chars is not None and chars <= repeat_chars
+    # 位置指定(AT)などは、範囲を限定すると結果が変わり得る
+    return False
+
+
+def is_window_searchable(re_pattern: Union[str, ParsedPattern], repeat_chars: Iterable[str] = "0123456789") -> bool:
+    """必須の文字の周辺の範囲のみを探索して、文字列全体を探索した場合と同じマッチが得られるかを判定する
+
+    上限のない繰り返しがrepeat_charsのみからなり、入力文字列中のrepeat_charsの連続がget_max_widthのmax_repeat以下であれば、
+    マッチの長さはget_max_widthで求めた値を超えない。
+    ただし、探索の終了位置より後の文字を参照する先読みや位置指定を含む場合は、範囲を限定すると結果が変わり得る。
+
+    e.g. "(?P<year>[0-9]+)年" -> True
+    e.g. "(?P<year>[0-9]+)年(?![0-9])" -> False
+    e.g. "(?P<text>.+)年" -> False
+
+    Args:
+        re_pattern (Union[str, ParsedPattern]): 対象となる正規表現、またはparse_patternで変換した構文木
+        repeat_chars (Iterable[str]): 上限のない繰り返しを許す文字
+
+    Returns:
+        bool: 範囲を限定して探索できるかを表す真偽値
+    """
+    return _is_window_searchable_items(parse_pattern(re_pattern).data, frozenset(repeat_chars))
+
+
+def _first_chars_of_items(items: List[Tuple]) -> Tuple[Optional[FrozenSet[str]], bool]:
+    # 要素の列がマッチする文字列の先頭の文字の集合(列挙できない場合はNone)と、空文字列にマッチし得るか
+    first_chars: Set[str] = set()
+    for op, av in items:
+        item_chars, nullable = _first_chars_of_item(op, av)
+        if item_chars is None:
+            return None, nullable
+        first_chars |= item_chars
+        if not nullable:
+            return frozenset(first_chars), False
+    return frozenset(first_chars), True
+
+
+def _first_chars_of_item(op, av) -> Tuple[Optional[FrozenSet[str]], bool]:
+    if op in (sre_constants.LITERAL, sre_constants.IN):
+        return _chars_of_item(op, av), False
+    elif op is sre_constants.SUBPATTERN:
+        return _first_chars_of_items(av[-1])
+    elif op is sre_constants.BRANCH:
+        first_chars: Set[str] = set()
+        any_nullable = False
+        for branch in av[1]:
+            branch_chars, nullable = _first_chars_of_items(branch)
+            if branch_chars is None:
+                return None, True
+            first_chars |= branch_chars
+            any_nullable = any_nullable or nullable
+        return frozenset(first_chars), any_nullable
+    elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+        repeat_chars, nullable = _first_chars_of_items(av[2])
+        return repeat_chars, nullable or av[0] == 0
+    elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT, sre_constants.AT):
+        # 幅を持たないもの
+        return frozenset(), True
+    return None, True
+
+
+def get_first_chars(re_pattern: Union[str, ParsedPattern]) -> Optional[FrozenSet[str]]:
+    """正規表現がマッチする文字列の先頭になり得る文字の集合を求める
+
+    e.g. "(?P<year>[0-9]{1,4})年" -> {"0", "1", ..., "9"}
+    e.g. "(西暦)?(?P<year>[0-9]+)年" -> {"西", "0", "1", ..., "9"}
+    e.g. "(?P<text>.+)年" -> None
+
+    Args:
+        re_pattern (Union[str, ParsedPattern]): 対象となる正規表現、またはparse_patternで変換した構文木
+
+    Returns:
+        Optional[FrozenSet[str]]: 先頭の文字の集合。任意の文字や空文字列にマッチし得るなど、列挙できない場合はNone
+    """
+    first_chars, nullable = _first_chars_of_items(parse_pattern(re_pattern).data)
+    return first_chars if not nullable else None
+
+
+def may_start_with_digit(re_pattern: Union[str, ParsedPattern]) -> bool:
+    """正規表現がマッチする文字列の先頭が数字になり得るかを判定する
+
+    e.g. "(?P<calendar_day>[0-9]{1,2})日" -> True
+    e.g. "毎(?P<unit>[年月])" -> False
+
+    Args:
+        re_pattern (Union[str, ParsedPattern]): 対象となる正規表現、またはparse_patternで変換した構文木
+
+    Returns:
+        bool: 先頭が数字になり得るかを表す真偽値。先頭の文字を列挙できない場合はTrue
+    """
+    first_chars = get_first_chars(re_pattern)
+    return first_chars is None or any(digit_regex.match(char) for char in first_chars)
+
+
+def _expand_items(items: List[Tuple], max_strings: int) -> Optional[List[str]]:
+    strings = [""]
+    for op, av in items:
+        item_strings = _expand_item(op, av, max_strings)
+        if item_strings is None or len(strings) * len(item_strings) > max_strings:
+            return None
+        strings = [prefix + suffix for prefix in strings for suffix in item_strings]
+    return strings
+
+
+def _expand_branches(branches: List[List[Tuple]], max_strings: int) -> Optional[List[str]]:
+    strings: List[str] = []
+    for branch in branches:
+        branch_strings = _expand_items(branch, max_strings)
+        if branch_strings is None:
+            return None
+        strings += [string for string in branch_strings if string not in strings]
+        if len(strings) > max_strings:
+            return None
+    return strings
+
+
+def _expand_item(op, av, max_strings: int) -> Optional[List[str]]:
+    if op is sre_constants.LITERAL:
+        return [chr(av)]
+    elif op is sre_constants.IN:
+        # [先前昨]のような文字の列挙や範囲のみからなる文字クラス
+        chars: List[str] = []
+        for class_op, class_av in av:
+            if class_op is sre_constants.LITERAL:
+                chars.append(chr(class_av))
+            elif class_op is sre_constants.RANGE and class_av[1] - class_av[0] < max_strings:
+                chars += [chr(code) for code in range(class_av[0], class_av[1] + 1)]
+            else:
+                return None
+        return list(dict.fromkeys(chars))
+    elif op is sre_constants.SUBPATTERN:
+        # (?i:...)のようにフラグを変更するグループは対象外とする
+        if av[1] or av[2]:
+            return None
+        return _expand_items(av[-1], max_strings)
+    elif op is sre_constants.BRANCH:
+        return _expand_branches(av[1], max_strings)
+    elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) and av[1] < max_strings:
+        return _expand_branches([list(av[2]) * n for n in range(av[0], av[1] + 1)], max_strings)
+    else:
+        # 上限のない繰り返し、位置指定、先読みなど、固定の文字列に展開できないもの
+        return None
+
+
+def expand_literal_pattern(re_pattern: Union[str, ParsedPattern], max_strings: int = 64) -> Optional[List[str]]:
+    """有限個の固定の文字列のみにマッチする正規表現を、それらの文字列に展開する
+
+    e.g. "[先前昨]日" -> ["先日", "前日", "昨日"]
+    e.g. "(翌々|明後)日" -> ["翌々日", "明後日"]
+    e.g. "(?P<year>[0-9]+)年" -> None
+
+    Args:
+        re_pattern (Union[str, ParsedPattern]): 対象となる正規表現、またはparse_patternで変換した構文木
+        max_strings (int): 展開する文字列の数の上限
+
+    Returns:
+        Optional[List[str]]: マッチする文字列のリスト。展開できない場合、数が上限を超える場合、空文字列にマッチする場合はNone
+    """
+    parsed = parse_pattern(re_pattern)
+    if parsed.state.flags & (re.IGNORECASE | re.VERBOSE):
+        return None
+    strings = _expand_items(parsed.data, max_strings)
+    if strings is None or "" in strings:
+        return None
+    return strings
+
+
+def _trie_to_regex(node: Dict[str, Any], is_root: bool = False) -> str:
+    # 空文字列のキーは、そのノードで終わる単語があることを表す
+    branches = []
+    leaf_chars = []
+    for char, child in node.items():
+        if char == "":
+            continue
+        # 先頭の選択肢がすべて文字で始まる場合、reは1文字目の候補による探索位置の絞り込みを行う。
+        # 先頭に文字クラスが含まれるとこの最適化が無効になるため、文字クラスにまとめるのは2文字目以降のみとする
+        if not is_root and list(child) == [""]:
+            leaf_chars.append(re.escape(char))
+        else:
+            branches.append(re.escape(char) + _trie_to_regex(child))
+    # 後に続く文字のない1文字の選択肢は文字クラスにまとめる
+    if len(leaf_chars) == 1:
+        branches.append(leaf_chars[0])
+    elif leaf_chars:
+        branches.append(f"[{''.join(leaf_chars)}]")
+
+    if not branches:
+        return ""
+    if "" in node:
+        # 長い単語を優先し、続く文字がマッチしない場合はこのノードで終える
+        return f"(?:{'|'.join(branches)})?"
+    if len(branches) == 1:
+        return branches[0]
+    return f"(?:{'|'.join(branches)})"
+
+
+def build_trie_regex(words: Iterable[str]) -> str:
+    """単語のいずれかにマッチする正規表現を、共通の接頭辞をまとめたトライ木の形で生成する
+
+    単語を"|"で並べた正規表現では選択肢を先頭から順に試すため、単語数に比例して照合が遅くなる。
+    トライ木の形にすると、1文字目で候補が絞り込まれる。
+    ある単語が別の単語の接頭辞となる場合は、長い単語を優先する。
+
+    e.g. ["天平", "天平勝宝", "天平宝字", "大化"] -> "(?:天平(?:勝宝|宝字)?|大化)"
+
+    Args:
+        words (Iterable[str]): 対象となる単語
+
+    Returns:
+        str: 単語のいずれかにマッチする正規表現。キャプチャグループは含まない
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    if not trie or list(trie) == [""]:
+        # 空の単語のみの場合は空文字列に、単語がない場合は何にもマッチしない
+        return "" if trie else "(?!)"
+    return _trie_to_regex(trie, is_root=True)
+
+
+def add_months(dt: datetime, months: int) -> datetime:
+    """暦の上で月を加算する
+
+    加算後の月に同じ日が存在しない場合は、その月の末日とする。
+
+    e.g. 2021-01-31に1ヶ月を加算 -> 2021-02-28
+
+    Args:
+        dt (datetime): 日時
+        months (int): 加算する月数。負の場合は減算する
+
+    Returns:
+        datetime: 月を加算した日時
+    """
+    if months == 0:
+        return dt
+    year, month_i = divmod(dt.month - 1 + months, 12)
+    year += dt.year
+    day = min(dt.day, calendar.monthrange(year, month_i + 1)[1])
+    return dt.replace(year=year, month=month_i + 1, day=day)
@@ -0,0 +1,208 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from ja_timex.clock import Clock, FrozenClock
+from ja_timex.tag import TIMEXMixin
+
+# to_datetimeと同じく、parsedのキーごとの値が取得できない場合を表す文字列
+time_fill_strs = {"clock_hour": "XX", "clock_minute": "XX", "clock_second": "XX"}
+duration_fill_strs = {"year": "XXXX", "month": "XX", "day": "XX", "hour": "XX", "minute": "XX", "second": "XX"}
+
+
+def _fill_target_value(
+    parsed: Dict[str, str], target: str, fill_str: str, default_value: Optional[int]
+) -> Optional[int]:
+    # TIMEX.fill_target_valueと同じ規則で値を取得する
+    if parsed.get(target) and parsed[target] != fill_str:
+        return int(parsed[target])
+    return default_value
+
+
+def _target_values(parsed: Dict[str, str], fill_strs: Dict[str, str], sign: int = 1) -> List[int]:
+    # fill_strsのキーの順に値を取得する。取得できない場合は0とする
+    # "1.5時間"のように整数でない値はValueErrorとなる
+    values = []
+    for target, fill_str in fill_strs.items():
+        value = parsed.get(target)
+        values.append(sign * int(value) if value and value != fill_str else 0)
+    return values
+
+
+def _to_wall_clock(reference: datetime) -> datetime:
+    # タイムゾーンを除いた、referenceのタイムゾーンでの日時
+    return datetime(
+        reference.year,
+        reference.month,
+        reference.day,
+        reference.hour,
+        reference.minute,
+        reference.second,
+        reference.microsecond,
+    )
+
+
+def _to_wall_clocks(np: Any, references: Sequence[Optional[datetime]]) -> Any:
+    # 基準日時のタイムゾーンでの日時。同じ基準日時は一度だけ変換する
+    reference_indices: Dict[int, int] = {}
+    unique_wall_clocks: List[datetime] = []
+    row_reference_indices = []
+    for reference in references:
+        key = id(reference)
+        if key not in reference_indices:
+            reference_indices[key] = len(unique_wall_clocks)
+            unique_wall_clocks.append(_to_wall_clock(reference) if reference is not None else datetime(1970, 1, 1))
+        row_reference_indices.append(reference_indices[key])
+    return np.array(unique_wall_clocks, dtype="datetime64[us]")[np.array(row_reference_indices, dtype=np.int64)]
+
+
+def to_datetime64(
+    timexes: Sequence[TIMEXMixin],
+    references: Union[None, datetime, Sequence[Optional[datetime]]] = None,
+    now: Optional[datetime] = None,
+) -> Any:
+    """複数の時間情報表現をまとめて日時に変換し、NumPyのdatetime64の配列として返す
+
+    TIMEX.to_datetime()と同じ規則で、DATE, TIME, DURATIONを日時に変換する。
+    parsedからの値の取り出しのみを1件ずつ行い、日時の計算は配列に対してまとめて行う。
+    変換できない時間情報表現はNaTとなる。"1.5時間後"のように整数でない値を含むものも、その行のみNaTとする。
+
+    結果はタイムゾーンを持たない、DATEはAsia/Tokyo、TIMEとDURATIONはreferenceのタイムゾーンでの日時となる。
+    DURATIONの時分秒の加算は夏時間を考慮しない。
+    また、to_datetime()が例外となる存在しない日付(2月30日など)はNaTとし、
+    24時を超えるTIMEが月末をまたぐ場合は翌月の日付とする。
+    エポック秒が必要な場合は、結果を.astype("datetime64[s]").astype("int64")で変換する。
+
+    Args:
+        timexes (Sequence[TIMEXMixin]): 時間情報表現
+        references (Union[None, datetime, Sequence[Optional[datetime]]]):
+            基準日時。Noneの場合は各時間情報表現のreferenceを、datetimeの場合はすべてに同じ基準日時を用いる
+        now (Optional[datetime]): 年が特定できないDATEに用いる現在日時。
+            Noneの場合は各時間情報表現のclockを用い、clockがない場合は一度だけシステムの現在日時を取得する
+
+    Returns:
+        numpy.ndarray: datetime64[us]の配列
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("to_datetime64() requires numpy. Please install it with `pip install numpy`.")
+
+    if references is None:
+        references = [timex.reference for timex in timexes]
+    elif isinstance(references, datetime):
+        references = [references] * len(timexes)
+    elif len(references) != len(timexes):
+        raise ValueError(f"The number of references must match the number of timexes: {len(references)}")
+
+    # 時計を持たない時間情報表現のための現在日時は、必要になった場合に一度だけ取得する
+    system_clock = FrozenClock()
+
+    n = len(timexes)
+    results = np.full(n, np.datetime64("NaT"), dtype="datetime64[us]")
+
+    # 基準日時がない行はTIMEとDURATIONの変換の対象にならず、結果はNaTのまま残る
+    wall_clocks = _to_wall_clocks(np, references)
+
+    date_indices, date_values, time_indices, time_values, duration_indices, duration_values = _collect_values(
+        timexes, references, now, system_clock
+    )
+
+    if date_indices:
+        results[np.array(date_indices)] = _resolve_dates(np, np.array(date_values, dtype=np.int64).reshape(-1, 3))
+    if time_indices:
+        indices = np.array(time_indices)
+        results[indices] = _resolve_times(
+            np, wall_clocks[indices], np.array(time_values, dtype=np.int64).reshape(-1, 3)
+        )
+    if duration_indices:
+        indices = np.array(duration_indices)
+        values = np.array(duration_values, dtype=np.int64).reshape(-1, 6)
+        results[indices] = _resolve_durations(np, wall_clocks[indices], values)
+
+    return results
+
+
+def _default_year(timex: TIMEXMixin, now: Optional[datetime], system_clock: Clock) -> int:
+    if now is not None:
+        return now.year
+    if timex.clock is not None:
+        return timex.clock.now().year
+    return system_clock.now().year
+
+
+def _collect_values(
+    timexes: Sequence[TIMEXMixin],
+    references: Sequence[Optional[datetime]],
+    now: Optional[datetime],
+    system_clock: Clock,
+) -> tuple:
+    # 変換の対象となる行のインデックスと、parsedから取り出した値を種類ごとに集める
+    # 値は行ごとに平坦に並べ、配列にしてから行ごとに分ける
+    date_indices: List[int] = []
+    date_values: List[int] = []
+    time_indices: List[int] = []
+    time_values: List[int] = []
+    duration_indices: List[int] = []
+    duration_values: List[int] = []
+    for i, timex in enumerate(timexes):
+        parsed = timex.parsed
+        if timex.type == "DATE":
+            year = _fill_target_value(parsed, "calendar_year", "XXXX", None)
+            month = _fill_target_value(parsed, "calendar_month", "XX", None)
+            day = _fill_target_value(parsed, "calendar_day", "XX", None)
+            reference = references[i]
+            if year is None:
+                year = reference.year if reference is not None else _default_year(timex, now, system_clock)
+                if reference is not None and parsed.get("calendar_month") == "XX":
+                    month = reference.month
+            date_indices.append(i)
+            date_values += [year, month if month is not None else 1, day if day is not None else 1]
+        elif references[i] is not None and timex.type in ("TIME", "DURATION"):
+            # 値を取得できない行は追加せず、結果はNaTのまま残る
+            try:
+                if timex.type == "TIME":
+                    time_values += _target_values(parsed, time_fill_strs)
+                    time_indices.append(i)
+                else:
+                    sign = -1 if timex.mod == "BEFORE" else 1
+                    duration_values += _target_values(parsed, duration_fill_strs, sign)
+                    duration_indices.append(i)
+            except ValueError:
+                continue
+
+    return date_indices, date_values, time_indices, time_values, duration_indices, duration_values
+
+
+def _resolve_dates(np: Any, values: Any) -> Any:
+    year, month, day = values.T
+    month_start = (year - 1970).astype("datetime64[Y]").astype("datetime64[M]") + (month - 1).astype("timedelta64[M]")
+    days_in_month = (month_start + 1).astype("datetime64[D]") - month_start.astype("datetime64[D]")
+    dates = month_start.astype("datetime64[D]") + (day - 1).astype("timedelta64[D]")
+    # 存在しない日付はNaTとする
+    is_valid = (month >= 1) & (month <= 12) & (day >= 1) & (day <= days_in_month.astype(np.int64))
+    return np.where(is_valid, dates.astype("datetime64[us]"), np.datetime64("NaT"))
+
+
+def _resolve_times(np: Any, wall_clocks: Any, values: Any) -> Any:
+    hour, minute, second = values.T
+    # 24時を超える表現は翌日とする。時刻を秒として日付に加算すると、24時以降は自然に翌日の日付となる
+    seconds = hour * 3600 + minute * 60 + second
+    return wall_clocks.astype("datetime64[D]").astype("datetime64[us]") + seconds.astype("timedelta64[s]")
+
+
+def _resolve_durations(np: Any, wall_clocks: Any, values: Any) -> Any:
+    years, months, days, hours, minutes, seconds = values.T
+
+    # 年と月は暦の上で加算し、日が加算後の月に存在しない場合は月末とする
+    base_month = wall_clocks.astype("datetime64[M]")
+    offset_in_month = wall_clocks - base_month.astype("datetime64[us]")
+    day_in_month = offset_in_month.astype("timedelta64[D]")
+    time_in_day = offset_in_month - day_in_month.astype("timedelta64[us]")
+    shifted_month = base_month + (years * 12 + months).astype("timedelta64[M]")
+    shifted_days_in_month = (shifted_month + 1).astype("datetime64[D]") - shifted_month.astype("datetime64[D]")
+    day_in_shifted_month = np.minimum(day_in_month, shifted_days_in_month - np.timedelta64(1, "D"))
+    shifted = (shifted_month.astype("datetime64[D]") + day_in_shifted_month).astype("datetime64[us]") + time_in_day
+
+    # 日と時分秒は経過時間として加算する
+    offset_seconds = days * 86400 + hours * 3600 + minutes * 60 + seconds
+    return shifted + offset_seconds.astype("timedelta64[s]")
@@ -0,0 +1,42 @@
+import pendulum
+import pytest
+
+from ja_timex.clock import Clock, FrozenClock, SystemClock
+
+
+class CountingClock(Clock):
+    def __init__(self) -> None:
+        self.count = 0
+
+    def now(self):
+        self.count += 1
+        return pendulum.datetime(2019, 1, 1)
+
+    def freeze(self):
+        return FrozenClock(base_clock=self)
+
+
+def test_frozen_clock():
+    clock = FrozenClock(pendulum.datetime(2019, 1, 1))
+    assert clock.now() == pendulum.datetime(2019, 1, 1)
+    assert clock.freeze() is clock
+
+
+def test_frozen_clock_reads_base_clock_once():
+    base_clock = CountingClock()
+    clock = base_clock.freeze()
+    assert base_clock.count == 0  # 必要になるまで読み取らない
+
+    assert clock.now() == pendulum.datetime(2019, 1, 1)
+    assert clock.now() == pendulum.datetime(2019, 1, 1)
+    assert base_clock.count == 1
+
+
+def test_system_clock():
+    clock = SystemClock().freeze()
+    assert clock.now() == clock.now()
+
+
+def test_clock_is_abstract():
+    with pytest.raises(TypeError):
+        Clock()
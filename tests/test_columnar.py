@@ -0,0 +1,79 @@
+import pytest
+
+from ja_timex.columnar import TimexColumns
+from ja_timex.timex import TimexParser
+
+texts = [
+    "彼は2008年4月から週に3回ジョギングを1時間行ってきた",
+    "時間情報表現を含まない文章",
+    "",
+    "二十一時に集合し、一昨日の話をした",
+]
+
+
+@pytest.fixture(scope="module")
+def columns():
+    return TimexParser().parse_columns(texts)
+
+
+def test_parse_columns_same_as_parse_batch(columns):
+    expected = [
+        (doc_id, t.span[0], t.span[1], t.raw_span[0], t.raw_span[1], t.type, t.value, t.text, t.mod, t.freq, t.quant)
+        for doc_id, timexes in enumerate(TimexParser().parse_batch(texts))
+        for t in timexes
+    ]
+
+    column_dict = columns.to_dict()
+    names = ["doc_id", "start", "end", "raw_start", "raw_end", "type", "value", "text", "mod", "freq", "quant"]
+    assert list(zip(*[column_dict[name] for name in names])) == expected
+    assert len(columns) == len(expected)
+    assert columns.doc_id.tolist() == [0, 0, 0, 3, 3]
+
+
+@pytest.mark.parametrize("extractor", ["loop", "anchored"])
+def test_parse_columns_same_as_parse(extractor):
+    # 入力文字列ごとのパターンの絞り込みが、1件ずつparse()した結果と一致する
+    timex_parser = TimexParser(extractor=extractor)
+    expected = [
+        (doc_id, t.span, t.raw_span, t.type, t.value, t.text)
+        for doc_id, text in enumerate(texts)
+        for t in timex_parser.parse(text)
+    ]
+
+    column_dict = timex_parser.parse_columns(texts).to_dict()
+    actual = [
+        (doc_id, (start, end), (raw_start, raw_end), type_name, value, text)
+        for doc_id, start, end, raw_start, raw_end, type_name, value, text in zip(
+            *[column_dict[name] for name in ["doc_id", "start", "end", "raw_start", "raw_end", "type", "value", "text"]]
+        )
+    ]
+    assert actual == expected
+
+
+def test_parse_columns_empty():
+    assert len(TimexParser().parse_columns([])) == 0
+
+
+def test_type_code_of():
+    columns = TimexColumns()
+    assert columns.type_code_of("DURATION") == 2
+    assert columns.type_code_of("CUSTOM") == 4
+    assert columns.type_names[4] == "CUSTOM"
+
+
+def test_to_numpy(columns):
+    np = pytest.importorskip("numpy")
+
+    arrays = columns.to_numpy()
+    assert arrays["doc_id"].dtype == np.int64
+    assert arrays["start"].tolist() == columns.start.tolist()
+    assert arrays["value"].tolist() == columns.value
+
+
+def test_to_arrow(columns):
+    pytest.importorskip("pyarrow")
+
+    record_batch = columns.to_arrow()
+    assert record_batch.num_rows == len(columns)
+    assert record_batch.column("type").to_pylist() == columns.type
+    assert record_batch.column("mod").to_pylist() == columns.mod
@@ -0,0 +1,154 @@
+import pytest
+
+from ja_timex.extractor import AnchoredExtractor, BaseExtractor, KeywordMatcher, LoopExtractor
+from ja_timex.pattern.reltime import parse_word
+from ja_timex.timex import TimexParser
+
+texts = [
+    "彼は2008年4月から週に3回ジョギングを1時間行ってきた",
+    "一昨年と一昨日は言うのに一昨月とは言わないのは何故か",
+    "13/13は1です",
+    "令和3年4月1日午前10時30分",
+    "毎年6月から8月にかけて",
+    "今夜9時スタートです。",
+    "2021/07/18 12:30:45pm (日曜日)",
+    "紀元前3世紀の1,000年前",
+    "第3四半期と3Qと2021年度",
+    "これは時間情報表現を含まない文章です",
+    "一昨々日と明々後日と先々週と再来年、毎時間と毎日",
+    "",
+]
+
+
+@pytest.fixture(scope="module")
+def p():
+    return TimexParser()
+
+
+def test_base_extractor_is_abstract(p):
+    with pytest.raises(TypeError):
+        BaseExtractor(p.all_patterns)
+
+
+@pytest.mark.parametrize(
+    "text",
+    texts
+    + [
+        # max_widthの計算で仮定した長さを超える数字の連続
+        "1" * 40 + "年" + "2" * 40 + "日間",
+        "時間情報表現を含まない文章の中に、" * 20 + "2021年7月18日の10時30分" + "、文章が続く" * 20,
+        "3日3日3日3日3日3日3日前と2021年2021年度",
+    ],
+)
+def test_anchored_extractor_same_as_loop(p, text):
+    loop_extractor = LoopExtractor(p.all_patterns)
+    anchored_extractor = AnchoredExtractor(p.all_patterns)
+
+    processed_text = p._normalize_number(text)
+    expected = [(e["type_name"], e["pattern"], e["re_match"].span()) for e in loop_extractor.extract(processed_text)]
+    actual = [(e["type_name"], e["pattern"], e["re_match"].span()) for e in anchored_extractor.extract(processed_text)]
+    assert actual == expected
+
+
+def test_anchored_extractor_merge_windows():
+    # アンカーの位置から、マッチの開始位置の範囲を求めて重なるものをまとめる
+    assert list(AnchoredExtractor._merge_windows([1, 3, 20], max_width=4)) == [(0, 4), (17, 21)]
+    assert list(AnchoredExtractor._merge_windows([], max_width=4)) == []
+
+
+@pytest.mark.parametrize("extractor_class", [LoopExtractor, AnchoredExtractor])
+@pytest.mark.parametrize("text", texts)
+def test_keyword_matcher_same_as_finditer(p, extractor_class, text):
+    expected_extractor = extractor_class(p.all_patterns, use_keyword_matcher=False)
+    extractor = extractor_class(p.all_patterns)
+
+    processed_text = p._normalize_number(text)
+    expected = [
+        (e["type_name"], e["pattern"], e["re_match"].span()) for e in expected_extractor.extract(processed_text)
+    ]
+    actual = [(e["type_name"], e["pattern"], e["re_match"].span()) for e in extractor.extract(processed_text)]
+    assert actual == expected
+
+
+def test_keyword_matcher_entries(p):
+    extractor = LoopExtractor(p.all_patterns)
+    keyword_patterns = [extractor.entries[i][1] for i in extractor.keyword_matcher.entry2keywords]
+
+    # 単語表現のパターンはすべてKeywordMatcherで抽出する
+    assert all(pattern in keyword_patterns for pattern in p.all_patterns["reltime"] if pattern.parse_func is parse_word)
+    assert all(pattern.re_pattern.startswith("毎") for pattern in keyword_patterns if pattern in p.all_patterns["set"])
+
+
+def test_keyword_matcher():
+    keyword_matcher = KeywordMatcher({0: ["一昨日"], 1: ["昨日", "前日"], 2: ["日々"]})
+
+    # 重なる出現位置もすべて取得する
+    assert keyword_matcher.find("一昨日と前日と日々") == {0: [0], 1: [1, 4], 2: [7]}
+    assert keyword_matcher.find("時間情報表現") == {}
+
+
+def test_timex_parser_with_anchored_extractor():
+    timexes = TimexParser(extractor="anchored").parse("彼は2008年4月から週に3回ジョギングを1時間行ってきた")
+    assert [timex.value for timex in timexes] == ["2008-04-XX", "P1W", "PT1H"]
+
+
+def test_timex_parser_with_unknown_extractor():
+    with pytest.raises(ValueError):
+        TimexParser(extractor="unknown")
+
+
+def test_select_entries(p):
+    extractor = LoopExtractor(p.all_patterns)
+
+    # 必須の文字を含まないパターンは選択されない
+    selected_patterns = [extractor.entries[i][1] for i in extractor.select_entries("これは文章です")]
+    assert all(pattern.required_chars == set() for pattern in selected_patterns)
+
+    selected_patterns = [extractor.entries[i][1] for i in extractor.select_entries("7月18日")]
+    assert any(pattern.required_chars == {"月", "日"} for pattern in selected_patterns)
+    assert all(pattern.required_chars <= {"7", "月", "1", "8", "日"} for pattern in selected_patterns)
+
+
+def test_select_entries_batch(p):
+    extractor = LoopExtractor(p.all_patterns)
+    processed_texts = ["これは文章です", "7月18日", "", "毎週"]
+    processed_text = "\x00".join(processed_texts)
+    text_spans = []
+    start_i = 0
+    for text in processed_texts:
+        text_spans.append((start_i, start_i + len(text)))
+        start_i += len(text) + 1
+
+    # 文字列ごとにselect_entriesを呼んだ場合と同じパターンが、同じ文字列に対して選択される
+    entry2span_indices = dict(extractor.select_entries_batch(processed_text, text_spans))
+    for span_i, text in enumerate(processed_texts):
+        expected = extractor.select_entries(text)
+        assert [entry_i for entry_i, span_indices in entry2span_indices.items() if span_i in span_indices] == expected
+
+
+@pytest.mark.parametrize("extractor_class", [LoopExtractor, AnchoredExtractor])
+def test_extract_batch_same_as_extract(p, extractor_class):
+    extractor = extractor_class(p.all_patterns)
+    processed_texts = [p._normalize_number(text) for text in texts]
+    processed_text = "\x00".join(processed_texts)
+
+    start_i = 0
+    text_spans = []
+    expected = []
+    for text in processed_texts:
+        text_spans.append((start_i, start_i + len(text)))
+        expected += [
+            (e["type_name"], e["pattern"], (e["re_match"].start() + start_i, e["re_match"].end() + start_i))
+            for e in extractor.extract(text)
+        ]
+        start_i += len(text) + 1
+
+    actual = [
+        (e["type_name"], e["pattern"], e["re_match"].span())
+        for e in extractor.extract_batch(processed_text, text_spans)
+    ]
+    # 文字列ごとの抽出結果は、パターン順に並べ替えると一致する
+    entry_indices = {id(pattern): i for i, (_, pattern) in enumerate(extractor.entries)}
+    assert sorted(actual, key=lambda x: (entry_indices[id(x[1])], x[2])) == sorted(
+        expected, key=lambda x: (entry_indices[id(x[1])], x[2])
+    )
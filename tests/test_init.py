@@ -0,0 +1,24 @@
+import subprocess
+import sys
+
+import ja_timex
+
+
+def test_import_does_not_load_patterns():
+    code = "import sys, ja_timex; print(any(name.startswith('ja_timex.pattern') for name in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
+
+def test_lazy_timex_parser():
+    from ja_timex.timex import TimexParser
+
+    assert ja_timex.TimexParser is TimexParser
+
+
+def test_warmup():
+    ja_timex.warmup()
+
+    from ja_timex.pattern.abstime import patterns
+
+    assert all(pattern._re_compiled is not None for pattern in patterns)
@@ -179,3 +179,60 @@ def test_normalize_phrase_contains_number(nn):
 
     # 「三国志 05 臣道の巻」 吉川英治
     assert nn._normalize_kansuji("三人の血はひとつだ。三人は一心同体だと") == "3人の血はひとつだ。3人は1心同体だと"
+
+
+def test_normalize_batch(nn):
+    texts = ["２０２１年", "一時的に二十人", "１，０００年", "", "1,000と2,000"]
+    assert nn.normalize_batch(texts) == [nn.normalize(text) for text in texts]
+
+    # 区切り文字を含む場合も個別に変換する
+    assert nn.normalize_batch(["２０\x00２１"]) == ["20\x0021"]
+
+
+def test_normalize_with_offsets(nn):
+    text, offsets = nn.normalize_with_offsets("二十一時")
+    assert text == "21時"
+    assert list(offsets) == [0, 0, 3, 4]
+
+    text, offsets = nn.normalize_with_offsets("今から１，０００年前")
+    assert text == "今から1000年前"
+    assert list(offsets) == [0, 1, 2, 3, 5, 6, 7, 8, 9, 10]
+
+    texts = ["二十一時", "今から１，０００年前"]
+    assert nn.normalize_batch_with_offsets(texts) == [nn.normalize_with_offsets(text) for text in texts]
+
+
+def test_normalize_kansuji_multiple_occurrences(nn):
+    # 置換で文字数が変わっても、後続の漢数字の位置がずれない
+    assert nn._normalize_kansuji("二十一時三十分") == "21時30分"
+    assert nn._normalize_kansuji("千九百年の十二月") == "1900年の12月"
+    assert nn._normalize_kansuji("二十一時の一時的な不十分さと三十分") == "21時の一時的な不十分さと30分"
+
+
+def test_kansuji_cache():
+    nn = NumberNormalizer(kansuji_cache_size=2)
+    text = "二十人と三十人と二十人と千九百人"
+    assert nn.normalize(text) == NumberNormalizer(kansuji_cache_size=0).normalize(text)
+
+    cache_info = nn.kansuji_cache_info()
+    assert cache_info.hits == 1
+    assert cache_info.misses == 3
+    assert cache_info.evictions == 1
+    assert cache_info.currsize == 2
+
+
+def test_normalize_every_occurrence(nn):
+    # 最初の数字だけではなく、すべての数字を規格化する
+    assert nn._normalize_zen_to_han("１，０００円と２．５倍と３，０００円") == "1,000円と2.5倍と3,000円"
+    assert nn._remove_comma_inside_digits("1,000円と3,000円と12,345,678円") == "1000円と3000円と12345678円"
+    assert nn.normalize("売上高は１，２３４，５６７円、営業利益は２，０００円") == "売上高は1234567円、営業利益は2000円"
+
+    text, offsets = nn.normalize_with_offsets("1,000と2,000")
+    assert text == "1000と2000"
+    assert list(offsets) == [0, 2, 3, 4, 5, 6, 8, 9, 10, 11]
+
+
+def test_context_chars(nn):
+    context_chars = nn.context_chars()
+    assert {"1", "１", "，", "十", "零", "不", "昨"} <= context_chars
+    assert not {"あ", "月", "。"} & context_chars
@@ -0,0 +1,63 @@
+import dataclasses
+
+import pendulum
+import pytest
+
+from ja_timex.parallel import ParallelTimexParser
+from ja_timex.tag import TIMEX
+from ja_timex.timex import TimexParser
+
+texts = [
+    "彼は2008年4月から週に3回ジョギングを1時間行ってきた",
+    "一昨年と一昨日は言うのに一昨月とは言わないのは何故か",
+    "時間情報表現を含まない文章",
+    "",
+    "今夜9時スタートです。",
+    "二〇二一年七月十八日の１２時から三十分間",
+] * 5
+
+
+@pytest.fixture(scope="module")
+def parallel_parser():
+    with ParallelTimexParser(max_workers=2, chunk_size=3) as parallel_parser:
+        yield parallel_parser
+
+
+def test_parallel_parse_same_as_parse(parallel_parser):
+    timex_parser = TimexParser()
+    results = parallel_parser.parse(texts)
+
+    assert len(results) == len(texts)
+    for text, timexes in zip(texts, results):
+        expected = timex_parser.parse(text)
+        assert [(t.tid, t.type, t.value, t.text, t.span, t.parsed) for t in timexes] == [
+            (t.tid, t.type, t.value, t.text, t.span, t.parsed) for t in expected
+        ]
+        # Patternは親プロセスのものに対応付けられる
+        assert [t.pattern.re_pattern for t in timexes] == [t.pattern.re_pattern for t in expected]
+
+
+def test_parallel_imap_with_reference():
+    reference = pendulum.datetime(2021, 7, 18, tz="Asia/Tokyo")
+    with ParallelTimexParser(max_workers=1, chunk_size=2, reference=reference) as parallel_parser:
+        results = list(parallel_parser.imap(iter(["1時間前", "12時59分"])))
+
+    assert results[0][0].to_datetime() == pendulum.datetime(2021, 7, 17, 23, 0, 0, tz="Asia/Tokyo")
+    assert results[1][0].to_datetime() == pendulum.datetime(2021, 7, 18, 12, 59, 0, tz="Asia/Tokyo")
+
+
+def test_parallel_parse_fields_same_as_parse():
+    # clockはパースごとに固定した別のインスタンスとなるため、比較から除く
+    def to_fields(timex):
+        return {f.name: getattr(timex, f.name) for f in dataclasses.fields(TIMEX) if f.name != "clock"}
+
+    parser_kwargs = {"reference": pendulum.datetime(2021, 7, 18, tz="Asia/Tokyo"), "conversion_backend": "pendulum"}
+    timex_parser = TimexParser(**parser_kwargs)
+    with ParallelTimexParser(max_workers=2, chunk_size=3, **parser_kwargs) as parallel_parser:
+        results = parallel_parser.parse(texts)
+
+    for text, timexes in zip(texts, results):
+        expected = timex_parser.parse(text)
+        assert [to_fields(t) for t in timexes] == [to_fields(t) for t in expected]
+        assert [t.to_datetime() for t in timexes] == [t.to_datetime() for t in expected]
+        assert all(isinstance(t.to_datetime(), pendulum.DateTime) for t in timexes if t.to_datetime() is not None)
@@ -1,6 +1,16 @@
+import sys
+
 import pytest
 
-from ja_timex.pattern.place import Place
+from ja_timex.extractor import BaseExtractor
+from ja_timex.pattern.abstime import patterns as abstime_patterns
+from ja_timex.pattern.duration import patterns as duration_patterns
+from ja_timex.pattern.place import Pattern, Place, load_pattern_analysis
+from ja_timex.pattern.reltime import patterns as reltime_patterns
+from ja_timex.pattern.set import patterns as set_patterns
+from ja_timex.util import expand_literal_pattern, get_required_chars, may_start_with_digit, parse_pattern
+
+default_patterns = abstime_patterns + duration_patterns + reltime_patterns + set_patterns
 
 
 @pytest.fixture(scope="module")
@@ -215,3 +225,87 @@ def test_morning_evening_prefix(place):
     assert place.is_valid("morning_prefix", "今朝")
     assert place.is_valid("evening_prefix", "今夜")
     assert place.is_valid("evening_prefix", "今晩")
+
+
+def test_pattern_re_compiled():
+    pattern = Pattern(re_pattern="(?P<calendar_day>[0-9]+)日", parse_func=lambda x, y: None, option={})
+
+    assert pattern.re_compiled.fullmatch("18日")
+    # 一度コンパイルされたものを使い回す
+    assert pattern.re_compiled is pattern.re_compiled
+
+
+def test_pattern_parses_once(monkeypatch):
+    pattern = Pattern(re_pattern="(?P<calendar_day>[0-9]{1,2})日", parse_func=lambda x, y: None)
+
+    # 構文木は初回の解析時に一度だけ生成し、各解析で共有する
+    calls = []
+    monkeypatch.setattr(
+        sys.modules[Pattern.__module__],
+        "parse_pattern",
+        lambda re_pattern: calls.append(re_pattern) or parse_pattern(re_pattern),
+    )
+    assert pattern.required_chars == {"日"}
+    assert pattern.max_width == 3
+    assert pattern.starts_with_digit
+    assert calls == [pattern.re_pattern]
+
+
+def test_pattern_analysis_up_to_date():
+    # デフォルトのパターンの変更後にtools/build_pattern_analysis.pyを実行していない場合に失敗する
+    analysis = load_pattern_analysis()
+    assert analysis["max_keywords"] == BaseExtractor.max_keywords_per_pattern
+    assert set(analysis["patterns"]) == {pattern.re_pattern for pattern in default_patterns}
+
+    for re_pattern, pattern_analysis in analysis["patterns"].items():
+        parsed = parse_pattern(re_pattern)
+        assert frozenset(pattern_analysis["required_chars"]) == get_required_chars(parsed)
+        assert pattern_analysis["starts_with_digit"] == may_start_with_digit(parsed)
+        assert pattern_analysis["keywords"] == expand_literal_pattern(parsed, max_strings=analysis["max_keywords"])
+
+
+def test_pattern_uses_precomputed_analysis(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        sys.modules[Pattern.__module__],
+        "parse_pattern",
+        lambda re_pattern: calls.append(re_pattern) or parse_pattern(re_pattern),
+    )
+
+    # デフォルトのパターンは、コンパイルと抽出に必要な解析を構文木を生成せずに行う
+    for default_pattern in default_patterns:
+        pattern = Pattern(re_pattern=default_pattern.re_pattern, parse_func=default_pattern.parse_func)
+        pattern.required_chars
+        pattern.bounded_re_pattern
+        pattern.literal_strings(BaseExtractor.max_keywords_per_pattern)
+    assert calls == []
+
+    # 解析結果に含まれない正規表現は、構文木から求める
+    pattern = Pattern(re_pattern="(?P<calendar_day>[0-9]{1,2})日", parse_func=lambda x, y: None)
+    assert pattern.literal_strings(BaseExtractor.max_keywords_per_pattern) is None
+    assert pattern.starts_with_digit
+    assert calls == [pattern.re_pattern]
+
+
+def test_pattern_digit_boundary():
+    pattern = Pattern(re_pattern="(?P<month>[0-9]{1,2})/(?P<day>[0-9]{1,2})", parse_func=lambda x, y: None)
+    assert pattern.starts_with_digit
+    assert pattern.bounded_re_pattern == "(?<![0-9])(?:(?P<month>[0-9]{1,2})/(?P<day>[0-9]{1,2}))"
+
+    # 数字表現の一部から始まる"23/4"を除き、それと重なる"4/5"を抽出する
+    assert [m.group() for m in pattern.re_compiled.finditer("123/4/5")] == ["4/5"]
+
+    # 数字から始まらないパターンには後読みを加えない
+    pattern = Pattern(re_pattern="毎(?P<unit>[年月])", parse_func=lambda x, y: None)
+    assert not pattern.starts_with_digit
+    assert pattern.bounded_re_pattern == pattern.re_pattern
+
+
+def test_place_wareki_prefix(place):
+    assert place.is_valid("wareki_prefix", "令和")
+    assert place.is_valid("wareki_prefix", "天平")
+    assert place.is_valid("wareki_prefix", "天平勝宝")
+    assert place.is_valid("wareki_prefix", "Ｒ")
+
+    assert not place.is_valid("wareki_prefix", "天平勝")
+    assert not place.is_valid("wareki_prefix", "令")
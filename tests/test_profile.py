@@ -0,0 +1,104 @@
+import subprocess
+import sys
+
+import pytest
+
+from ja_timex.pattern.abstime import patterns as abstime_patterns
+from ja_timex.pattern.duration import patterns as duration_patterns
+from ja_timex.pattern.place import Pattern
+from ja_timex.profile import ExtractionProfile, get_extraction_profile
+from ja_timex.timex import TimexParser
+
+
+def test_extraction_profile():
+    profile = ExtractionProfile(types={"abstime", "reltime"}, tier="strict")
+    assert profile.types == frozenset({"abstime", "reltime"})
+    assert profile.includes_type("abstime")
+    assert not profile.includes_type("duration")
+    assert ExtractionProfile().includes_type("set")
+
+    with pytest.raises(ValueError):
+        ExtractionProfile(types={"date"})
+    with pytest.raises(ValueError):
+        ExtractionProfile(tier="loose")
+    with pytest.raises(ValueError):
+        Pattern(re_pattern="日", parse_func=None, tier="loose")
+
+
+def test_extraction_profile_select():
+    # tier="full"の場合はすべてのパターンを用いる
+    assert ExtractionProfile().select(abstime_patterns) is abstime_patterns
+
+    strict_patterns = ExtractionProfile(tier="strict").select(abstime_patterns)
+    assert all(pattern.tier == "strict" for pattern in strict_patterns)
+    full_tier_re_patterns = [pattern.re_pattern for pattern in abstime_patterns if pattern not in strict_patterns]
+    assert full_tier_re_patterns == [
+        "(?P<calendar_day>[12][0-9]|3[01]|0?[1-9])日",
+        "(?P<clock_minute>[0-5]?[0-9])分",
+        "(?P<clock_second>[0-5]?[0-9])秒",
+    ]
+
+    # 期間のパターンも、単独の日、分、秒のみを除く
+    full_tier_re_patterns = [
+        pattern.re_pattern
+        for pattern in duration_patterns
+        if pattern not in ExtractionProfile(tier="strict").select(duration_patterns)
+    ]
+    assert [re_pattern[-1] for re_pattern in full_tier_re_patterns] == ["日", "分", "秒"]
+
+
+def test_get_extraction_profile():
+    assert get_extraction_profile() == ExtractionProfile()
+    assert get_extraction_profile("strict") == ExtractionProfile(tier="strict")
+    assert get_extraction_profile("abstime", tier="strict") == ExtractionProfile(
+        types=frozenset({"abstime"}), tier="strict"
+    )
+    assert get_extraction_profile(types=["abstime"]) == ExtractionProfile(types=frozenset({"abstime"}))
+
+    with pytest.raises(ValueError):
+        get_extraction_profile("unknown")
+    with pytest.raises(ValueError):
+        TimexParser(types={"date"})
+
+
+def test_timex_parser_with_types():
+    timex_parser = TimexParser(types={"abstime", "reltime"})
+    assert set(timex_parser.all_patterns) == {"abstime", "reltime"}
+
+    timexes = timex_parser.parse("2021年7月18日から毎週、3日前に連絡する")
+    assert [timex.value for timex in timexes] == ["2021-07-18", "P3D"]
+
+
+def test_timex_parser_with_types_replaces_longer_candidates():
+    # DURATIONのパターンを用いない場合は、「3日間」の代わりにDATEの「3日」を抽出する
+    assert [timex.type for timex in TimexParser().parse("3日間")] == ["DURATION"]
+    assert [(timex.type, timex.text) for timex in TimexParser(profile="abstime").parse("3日間")] == [("DATE", "3日")]
+
+
+def test_timex_parser_with_strict_tier():
+    text = "7月18日の10時30分、あと5分と10秒"
+    timexes = TimexParser(types={"abstime"}).parse(text)
+    assert [timex.text for timex in timexes] == ["7月18日", "10時30分", "5分", "10秒"]
+
+    # 単独の日、分、秒はtier="strict"では抽出しない
+    timexes = TimexParser(types={"abstime"}, tier="strict").parse(text)
+    assert [timex.text for timex in timexes] == ["7月18日", "10時30分"]
+    assert TimexParser(types={"abstime"}, tier="strict").parse("18日") == []
+
+    # 単独の数と単位は、期間としても抽出しない
+    timexes = TimexParser(tier="strict").parse(text)
+    assert [(timex.type, timex.text) for timex in timexes] == [("DATE", "7月18日"), ("TIME", "10時30分")]
+    assert TimexParser(profile="strict").parse("18日") == []
+    assert [(timex.type, timex.text) for timex in TimexParser(profile="strict").parse("3日間と5分間")] == [
+        ("DURATION", "3日間"),
+        ("DURATION", "5分間"),
+    ]
+
+
+def test_timex_parser_with_types_does_not_load_patterns():
+    code = (
+        "import sys; from ja_timex.timex import TimexParser; TimexParser(profile='abstime').parse('2021年7月18日'); "
+        "print(sorted(name for name in sys.modules if name.startswith('ja_timex.pattern.')))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "['ja_timex.pattern.abstime', 'ja_timex.pattern.place']"
@@ -0,0 +1,201 @@
+import os
+import re
+
+import pytest
+
+from ja_timex.regex_backend import (
+    DigitBoundaryRegex,
+    RegexBackend,
+    StdlibRegexBackend,
+    find_backtracking_features,
+    find_unsupported_patterns,
+    get_regex_backend,
+    to_re2_syntax,
+)
+from ja_timex.tagger import AbstimeTagger
+from ja_timex.timex import TimexParser
+
+# 各パターンの種類の表現を含む文章
+corpus = [
+    "彼は2008年4月から週に3回ジョギングを1時間行ってきた",
+    "一昨年と一昨日は言うのに一昨月とは言わないのは何故か",
+    "令和3年4月1日午前10時30分、平成元年と天平勝宝4年",
+    "毎年6月から8月にかけて、3日に1回、毎週木曜日",
+    "今夜9時スタートです。明朝7時に集合",
+    "2021/07/18 12:30:45pm (日曜日)と2021-07-18 ( 日 )",
+    "紀元前3世紀の1,000年前、21世紀初頭、2世紀ほど前",
+    "第3四半期と3Qと2021年度、2022年の夏",
+    "3ヶ月前から2週間後まで、1.5時間くらい、30分近く、10秒ほど",
+    "これは時間情報表現を含まない文章です",
+    "",
+]
+
+
+def regex_backend_or_skip(name):
+    if name in stand_in_backends:
+        return stand_in_backends[name]()
+    try:
+        return get_regex_backend(name)
+    except ImportError:
+        # toxではextrasをインストールしているため、スキップせずに失敗させる
+        if os.environ.get("JA_TIMEX_REQUIRE_REGEX_BACKENDS"):
+            raise
+        pytest.skip(f"{name} is not installed")
+
+
+class CountingRegexBackend(StdlibRegexBackend):
+    name = "counting"
+
+    def __init__(self) -> None:
+        self.compiled_patterns = []
+
+    def compile(self, re_pattern):
+        self.compiled_patterns.append(re_pattern)
+        return super().compile(re_pattern)
+
+
+class LookaroundRegexBackend(StdlibRegexBackend):
+    # regexと同様に後読みを扱える、re以外のバックエンド
+    name = "lookaround"
+
+
+class LinearRegexBackend(StdlibRegexBackend):
+    # RE2と同様に、後読みなどのバックトラックを必要とする機能を含む正規表現はコンパイルしない
+    name = "linear"
+    supports_lookaround = False
+
+    def compile(self, re_pattern):
+        features = self.unsupported_features(re_pattern)
+        if features:
+            raise ValueError(f"{self.name} does not support {', '.join(features)}: {re_pattern}")
+        return super().compile(re_pattern)
+
+    def unsupported_features(self, re_pattern):
+        return find_backtracking_features(re_pattern)
+
+
+# インストールされていないバックエンドの代わりに、reを用いて動作を確かめるバックエンド
+stand_in_backends = {"lookaround": LookaroundRegexBackend, "linear": LinearRegexBackend}
+
+
+def test_get_regex_backend():
+    assert get_regex_backend() is get_regex_backend("re")
+    assert isinstance(get_regex_backend("re"), StdlibRegexBackend)
+
+    regex_backend = CountingRegexBackend()
+    assert get_regex_backend(regex_backend) is regex_backend
+
+    with pytest.raises(ValueError):
+        get_regex_backend("unknown")
+    with pytest.raises(ValueError):
+        TimexParser(regex_backend="unknown")
+    with pytest.raises(TypeError):
+        RegexBackend()
+
+
+def test_find_backtracking_features():
+    assert find_backtracking_features("(?P<year>[0-9]+)年") == []
+    assert find_backtracking_features("(?<![0-9])(?P<year>[0-9]+)年") == ["lookaround"]
+    assert find_backtracking_features("((?=[0-9])[0-9])+年") == ["lookaround"]
+    assert find_backtracking_features("(?P<a>[0-9])年(?P=a)") == ["backreference"]
+    assert find_backtracking_features("(?P<a>[0-9])?(?(a)年|月)") == ["conditional group"]
+
+
+def test_to_re2_syntax():
+    assert to_re2_syntax("(?P<bc_year>[0-9]{,4})年") == "(?P<bc_year>[0-9]{0,4})年"
+    assert to_re2_syntax("[{,]{1,2}\\{,1}") == "[{,]{1,2}\\{,1}"
+    assert (
+        to_re2_syntax("\\s")
+        == "[\\t-\\r\\x1c-\\x20\\x85\\xa0\\x{1680}\\x{2000}-\\x{200a}\\x{2028}\\x{2029}\\x{202f}\\x{205f}\\x{3000}]"
+    )
+    assert to_re2_syntax("[\\s,]").startswith("[\\t-\\r")
+
+
+def test_default_patterns_are_linear_time_compatible():
+    # デフォルトのパターンは、RE2などの線形時間のエンジンでも扱える機能のみを用いる
+    re_patterns = [pattern.re_pattern for patterns in TimexParser().all_patterns.values() for pattern in patterns]
+    assert find_unsupported_patterns(re_patterns) == {}
+
+
+def test_find_unsupported_patterns():
+    re_patterns = ["(?P<year>[0-9]+)年", "(?<![0-9])(?P<year>[0-9]+)年"]
+    assert find_unsupported_patterns(re_patterns) == {"(?<![0-9])(?P<year>[0-9]+)年": ["lookaround"]}
+    assert find_unsupported_patterns(re_patterns, StdlibRegexBackend()) == {}
+
+
+def test_timex_parser_uses_regex_backend():
+    regex_backend = CountingRegexBackend()
+    timex_parser = TimexParser(regex_backend=regex_backend)
+
+    assert [timex.value for timex in timex_parser.parse("2021年7月18日")] == ["2021-07-18"]
+    n_patterns = sum(len(patterns) for patterns in timex_parser.all_patterns.values())
+    assert len(regex_backend.compiled_patterns) >= n_patterns
+
+    # 同じバックエンドではパターンごとに一度だけコンパイルする
+    n_compiled = len(regex_backend.compiled_patterns)
+    timex_parser.parse("2021年7月18日")
+    assert len(regex_backend.compiled_patterns) == n_compiled
+
+    TimexParser(regex_backend=regex_backend).parse("2021年7月18日")
+    re_patterns = {pattern.re_pattern for patterns in timex_parser.all_patterns.values() for pattern in patterns}
+    assert not re_patterns & set(regex_backend.compiled_patterns[n_compiled:])
+
+
+def test_tagger_uses_regex_backend():
+    regex_backend = CountingRegexBackend()
+    tagger = AbstimeTagger(regex_backend=regex_backend)
+
+    assert tagger.parse("2021年7月18日").value == "2021-07-18"
+    assert regex_backend.compiled_patterns
+
+
+def test_timex_parser_without_lookaround():
+    # 先読みを用いずに抽出する
+    timex_parser = TimexParser(regex_backend=LinearRegexBackend())
+    assert [timex.value for timex in timex_parser.parse("2021年7月18日")] == ["2021-07-18"]
+
+
+def test_digit_boundary_regex():
+    compiled = DigitBoundaryRegex(re.compile("(?P<month>[0-9]{1,2})/(?P<day>[0-9]{1,2})"))
+
+    # 後読み"(?<![0-9])"と同様に、数字表現の一部から始まる"23/4"を除き、それと重なる"4/5"を得る
+    assert [m.group() for m in compiled.finditer("123/4/5")] == ["4/5"]
+    assert compiled.search("123/4/5").span() == (4, 7)
+    assert compiled.search("123/4/5", 0, 6) is None
+    assert compiled.match("123/4/5", 1) is None
+    assert compiled.match("1 3/4", 2).group() == "3/4"
+    assert compiled.fullmatch("3/4")
+
+
+def test_linear_backend_keeps_digit_boundary():
+    # 後読みを扱えないバックエンドでも、reと同じ時間情報表現を抽出する
+    text = "2021-07-18 ( 日 )"
+    timexes = TimexParser(regex_backend=LinearRegexBackend()).parse(text)
+    assert [timex.text for timex in timexes] == ["2021-07-18", "( 日 )"]
+
+
+@pytest.fixture(scope="module")
+def p():
+    return TimexParser()
+
+
+@pytest.mark.parametrize("name", ["re", "regex", "re2", "lookaround", "linear"])
+def test_regex_backend_conformance(p, name):
+    regex_backend = regex_backend_or_skip(name)
+    assert isinstance(regex_backend, RegexBackend)
+
+    # 各パターンのマッチがreと一致する
+    for patterns in p.all_patterns.values():
+        for pattern in patterns:
+            compiled = pattern.compile(regex_backend)
+            for text in corpus:
+                processed_text = p._normalize_number(text)
+                expected = [(m.span(), m.groupdict()) for m in pattern.re_compiled.finditer(processed_text)]
+                actual = [(m.span(), m.groupdict()) for m in compiled.finditer(processed_text)]
+                assert actual == expected, pattern.re_pattern
+
+    # パースの結果がreと一致する
+    timex_parser = TimexParser(regex_backend=regex_backend)
+    for text in corpus:
+        expected = [(timex.to_tag(), timex.span) for timex in p.parse(text)]
+        assert [(timex.to_tag(), timex.span) for timex in timex_parser.parse(text)] == expected
@@ -0,0 +1,97 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ja_timex.structures import CacheInfo, IntervalSet, LRUCache
+
+
+def drop_overlaps_with_coverage_flag(spans, text_length):
+    # 文字ごとの使用フラグによる従来の実装
+    text_coverage_flag = [False] * text_length
+    selected = []
+    for start_i, end_i in spans:
+        if any(text_coverage_flag[start_i:end_i]) is False:
+            text_coverage_flag[start_i:end_i] = [True] * (end_i - start_i)
+            selected.append((start_i, end_i))
+    return selected
+
+
+def test_interval_set():
+    intervals = IntervalSet()
+    assert intervals.add_if_disjoint(3, 6)
+    assert intervals.add_if_disjoint(10, 12)
+    assert len(intervals) == 2
+
+    assert intervals.overlaps(5, 7)
+    assert intervals.overlaps(0, 4)
+    assert intervals.overlaps(4, 5)
+    assert intervals.overlaps(2, 13)
+    assert not intervals.overlaps(6, 10)
+    assert not intervals.overlaps(0, 3)
+    # 長さ0の区間は重ならない
+    assert not intervals.overlaps(4, 4)
+    assert intervals.add_if_disjoint(4, 4)
+    assert len(intervals) == 2
+
+    assert not intervals.add_if_disjoint(11, 15)
+    assert intervals.add_if_disjoint(6, 10)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_interval_set_same_as_coverage_flag(seed):
+    random.seed(seed)
+    text_length = random.randint(1, 100)
+    spans = []
+    for _ in range(random.randint(0, 60)):
+        start_i = random.randint(0, text_length)
+        end_i = random.randint(start_i, min(start_i + 15, text_length))
+        spans.append((start_i, end_i))
+    spans.sort(key=lambda x: x[1] - x[0], reverse=True)
+
+    intervals = IntervalSet()
+    selected = [(start_i, end_i) for start_i, end_i in spans if intervals.add_if_disjoint(start_i, end_i)]
+    assert selected == drop_overlaps_with_coverage_flag(spans, text_length)
+
+
+def test_lru_cache():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    # 最も長く参照されていない"b"が削除される
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.cache_info() == CacheInfo(hits=2, misses=1, evictions=1, maxsize=2, currsize=2)
+
+    cache.clear()
+    assert cache.cache_info() == CacheInfo(hits=0, misses=0, evictions=0, maxsize=2, currsize=0)
+
+    # maxsizeが0の場合は保持しない
+    cache = LRUCache(maxsize=0)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=-1)
+
+
+def test_lru_cache_thread_safe():
+    cache = LRUCache(maxsize=8)
+
+    def access(seed):
+        rng = random.Random(seed)
+        for _ in range(2000):
+            key = rng.randrange(16)
+            if cache.get(key) is None:
+                cache.put(key, key)
+
+    # 複数のスレッドから同時に参照しても、例外を送出せず統計情報が一致する
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(access, range(8)))
+
+    cache_info = cache.cache_info()
+    assert cache_info.hits + cache_info.misses == 8 * 2000
+    assert cache_info.currsize <= 8
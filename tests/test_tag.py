@@ -1,6 +1,10 @@
+from datetime import datetime
+
+import pendulum
 import pytest
 
-from ja_timex.tag import TIMEX
+from ja_timex.clock import FrozenClock
+from ja_timex.tag import TIMEX, CompactTIMEX, ConversionBackend, Duration, ZoneInfo, get_conversion_backend
 
 
 @pytest.fixture(scope="module")
@@ -137,3 +141,85 @@ def test_to_duration():
     assert it.minutes == 0
     assert it.seconds == 1
     assert it.microseconds == 500000  # マイクロ秒
+
+
+def test_compact_timex(t_date, t_time):
+    compact_date = CompactTIMEX.from_timex(t_date)
+    assert not hasattr(compact_date, "__dict__")
+    assert compact_date.to_tag() == t_date.to_tag()
+    assert repr(compact_date) == repr(t_date)
+    assert compact_date.to_datetime() == t_date.to_datetime()
+
+    # 変換に用いないキーとpatternは保持しない
+    compact_time = CompactTIMEX.from_timex(t_time)
+    assert compact_time.parsed == {"clock_hour": "18", "clock_minute": "20", "clock_second": "XX"}
+    assert compact_time.pattern is None
+    assert CompactTIMEX.from_timex(t_time, keep_parsed=True).parsed == t_time.parsed
+
+    compact_time.span = (3, 9)
+    assert (compact_time.start, compact_time.end) == (3, 9)
+    assert compact_time.span == (3, 9)
+    assert compact_time.raw_span is None
+
+
+def test_compact_timex_duration(t_duration):
+    compact_duration = CompactTIMEX.from_timex(t_duration)
+    assert compact_duration.to_duration() == t_duration.to_duration()
+
+
+def test_to_datetime_clock():
+    timex = TIMEX(
+        type="DATE",
+        value="XXXX-07-18",
+        text="7月18日",
+        parsed={"calendar_year": "XXXX", "calendar_month": "07", "calendar_day": "18"},
+        clock=FrozenClock(pendulum.datetime(2019, 1, 1)),
+    )
+    assert timex.to_datetime() == pendulum.datetime(2019, 7, 18, tz="Asia/Tokyo")
+    assert CompactTIMEX.from_timex(timex).to_datetime() == pendulum.datetime(2019, 7, 18, tz="Asia/Tokyo")
+    # 年が特定できない場合はNoneとなり、時計の日時で補完する
+    assert timex.fill_target_value(target="calendar_year", fill_str="XXXX", default_value=None) is None
+
+
+def test_duration_attributes_same_as_pendulum():
+    kwargs_list = [
+        {"years": 1, "months": 1, "days": 3, "hours": 25, "minutes": 61, "seconds": 1.5},
+        {"weeks": 2, "days": 3},
+        {"days": -10, "hours": -5},
+        {"seconds": 3600},
+    ]
+    for kwargs in kwargs_list:
+        duration = Duration(**kwargs)
+        expected = pendulum.duration(**kwargs)
+        assert duration == expected
+        for name in ["years", "months", "weeks", "remaining_days", "hours", "minutes", "remaining_seconds"]:
+            assert getattr(duration, name) == getattr(expected, name), (kwargs, name)
+
+
+def test_conversion_backend(t_date, t_duration):
+    assert type(t_date.to_datetime()) is datetime
+    assert isinstance(t_duration.to_duration(), Duration)
+
+    # バックエンドはTIMEXごとに指定し、他のTIMEXには影響しない
+    pendulum_date = TIMEX(
+        type=t_date.type,
+        value=t_date.value,
+        text=t_date.text,
+        parsed=t_date.parsed,
+        conversion_backend=get_conversion_backend("pendulum"),
+    )
+    assert isinstance(pendulum_date.to_datetime(), pendulum.DateTime)
+    assert isinstance(CompactTIMEX.from_timex(pendulum_date).to_datetime(), pendulum.DateTime)
+    assert type(t_date.to_datetime()) is datetime
+
+    assert get_conversion_backend() is get_conversion_backend("stdlib")
+    with pytest.raises(ValueError):
+        get_conversion_backend("unknown")
+    with pytest.raises(TypeError):
+        ConversionBackend()
+
+
+def test_to_datetime_duration_end_of_month():
+    reference = datetime(2021, 1, 31, 10, tzinfo=ZoneInfo("Asia/Tokyo"))
+    timex = TIMEX(type="DURATION", value="P1M", text="1ヶ月後", mod="AFTER", parsed={"month": "1"}, reference=reference)
+    assert timex.to_datetime() == datetime(2021, 2, 28, 10, tzinfo=ZoneInfo("Asia/Tokyo"))
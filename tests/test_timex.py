@@ -1,7 +1,10 @@
+from datetime import datetime
+
 import pendulum
 import pytest
 
-from ja_timex.tag import TIMEX
+from ja_timex.clock import FrozenClock
+from ja_timex.tag import TIMEX, CompactTIMEX
 from ja_timex.timex import TimexParser
 
 
@@ -178,3 +181,202 @@ def test_reference_datetime_duration(p_ref):
     assert timexes[0].to_datetime() == pendulum.datetime(2021, 5, 18, 0, 0, 0, tz="Asia/Tokyo")
     timexes = p_ref.parse("10年前")
     assert timexes[0].to_datetime() == pendulum.datetime(2011, 7, 18, 0, 0, 0, tz="Asia/Tokyo")
+
+
+def test_parse_batch(p):
+    texts = [
+        "彼は2008年4月から週に3回ジョギングを1時間行ってきた",
+        "",
+        "一昨年と一昨日は言うのに一昨月とは言わないのは何故か",
+        "１，０００年前の13/13は1です",
+        "時間情報表現を含まない文章",
+        "今夜9時スタートです。",
+    ]
+    results = p.parse_batch(texts)
+
+    assert len(results) == len(texts)
+    for text, timexes in zip(texts, results):
+        expected = p.parse(text)
+        assert [(t.tid, t.type, t.value, t.text, t.span) for t in timexes] == [
+            (t.tid, t.type, t.value, t.text, t.span) for t in expected
+        ]
+
+    assert p.parse_batch([]) == []
+
+
+def test_iter_parse(p):
+    text = "彼は2008年4月から週に3回ジョギングを1時間行ってきた。\n今夜9時スタートです。一昨年と一昨日は言うのに" * 50
+    expected = p.parse(text)
+
+    for chunk_size in [1, 7, 100, 10000]:
+        chunks = [text[i : i + chunk_size] for i in range(0, len(text), chunk_size)]
+        timexes = list(p.iter_parse(chunks, window_size=64))
+
+        assert [(t.tid, t.type, t.value, t.text, t.span) for t in timexes] == [
+            (t.tid, t.type, t.value, t.text, t.span) for t in expected
+        ]
+
+
+def test_iter_parse_without_boundary(p):
+    # 区切りの文字がない場合もウィンドウの境界をまたぐ表現を取得する
+    text = "あ" * 60 + "2021年7月18日" + "い" * 60 + "12時59分"
+    timexes = list(p.iter_parse([text[i : i + 5] for i in range(0, len(text), 5)], window_size=10))
+
+    assert [(t.value, t.span) for t in timexes] == [("2021-07-18", (60, 70)), ("T12-59-XX", (130, 136))]
+
+    assert list(p.iter_parse([])) == []
+
+
+def test_iter_parse_keeps_ignore_phrase(p):
+    # 慣用句や数の表現の途中では分けずに規格化する
+    text = "あ" * 20 + "不十分な時間と一昨々日の十二時と１，０００人"
+    expected = [(t.value, t.span) for t in p.parse(text)]
+
+    for chunk_size in [1, 2, 3]:
+        timexes = list(p.iter_parse([text[i : i + chunk_size] for i in range(0, len(text), chunk_size)], window_size=4))
+        assert [(t.value, t.span) for t in timexes] == expected
+
+
+def test_iter_parse_keeps_long_number_expression(p):
+    # window_sizeより長い数の表現も途中で分けずに規格化するため、parse()とspanが一致する
+    texts = [
+        "人口は千二百三十四万五千六百七十八人で、二千二十一年七月十八日に調べた",
+        "１２３，４５６，７８９，０１２，３４５円と２０２１年７月１８日",
+        "あ" * 5 + "一二三四五六七八九〇一二三四五六七八九〇年と十二時",
+    ]
+    for text in texts:
+        expected = [(t.value, t.span, t.raw_span) for t in p.parse(text)]
+        for chunk_size in [1, 3, 100]:
+            chunks = [text[i : i + chunk_size] for i in range(0, len(text), chunk_size)]
+            timexes = list(p.iter_parse(chunks, window_size=8))
+            assert [(t.value, t.span, t.raw_span) for t in timexes] == expected
+
+
+def test_iter_parse_splits_large_chunk(p, monkeypatch):
+    # 一つの大きな分割も、window_sizeごとに分けて規格化する
+    text = ("2021年7月18日の" + "あ" * 40) * 100
+    normalized_lengths = []
+    normalize_with_offsets = p.number_normalizer.normalize_with_offsets
+    monkeypatch.setattr(
+        p.number_normalizer,
+        "normalize_with_offsets",
+        lambda text: normalized_lengths.append(len(text)) or normalize_with_offsets(text),
+    )
+
+    timexes = list(p.iter_parse([text], window_size=64))
+    assert len(timexes) == 100
+    assert max(normalized_lengths) <= 2 * 64
+
+
+def test_conversion_backend():
+    timex_parser = TimexParser(conversion_backend="pendulum", result_cache_size=1)
+    for _ in range(2):
+        timexes = timex_parser.parse("2021年7月18日と1時間")
+        assert isinstance(timexes[0].to_datetime(), pendulum.DateTime)
+        assert isinstance(timexes[1].to_duration(), pendulum.Duration)
+
+    assert type(TimexParser().parse("2021年7月18日")[0].to_datetime()) is datetime
+
+
+def test_raw_span(p):
+    raw_text = "会議は二千二十一年の１，０００人規模で、１０時からです"
+    timexes = p.parse(raw_text)
+
+    assert [t.text for t in timexes] == ["2021年", "10時"]
+    assert [raw_text[t.raw_span[0] : t.raw_span[1]] for t in timexes] == ["二千二十一年", "１０時"]
+
+    batch_timexes = p.parse_batch(["今日は", raw_text])[1]
+    assert [t.raw_span for t in batch_timexes] == [t.raw_span for t in timexes]
+
+    stream_timexes = list(p.iter_parse(["あいう", raw_text, "。", raw_text], window_size=8))
+    assert [t.raw_span for t in stream_timexes] == [
+        (3 + start_i, 3 + end_i) for start_i, end_i in [t.raw_span for t in timexes]
+    ] + [
+        (3 + len(raw_text) + 1 + start_i, 3 + len(raw_text) + 1 + end_i)
+        for start_i, end_i in [t.raw_span for t in timexes]
+    ]
+
+
+def test_result_cache():
+    timex_parser = TimexParser(result_cache_size=2)
+    timexes = timex_parser.parse("明日の10時に会いましょう")
+    assert [timex.value for timex in timexes] == ["P1D", "T10-XX-XX"]
+
+    # 返り値を変更してもキャッシュには影響しない
+    timexes[0].value = "changed"
+    timexes[1].parsed["clock_hour"] = "99"
+    cached_timexes = timex_parser.parse("明日の10時に会いましょう")
+    assert [timex.value for timex in cached_timexes] == ["P1D", "T10-XX-XX"]
+    assert cached_timexes[1].parsed["clock_hour"] == "10"
+    assert cached_timexes[1].raw_span == (3, 6)
+
+    # referenceは入力時のものが付与される
+    timex_parser.reference = pendulum.datetime(2021, 7, 18)
+    assert timex_parser.parse("明日の10時に会いましょう")[0].reference == pendulum.datetime(2021, 7, 18)
+
+    timex_parser.parse("来週の月曜日")
+    timex_parser.parse("毎朝")
+    cache_info = timex_parser.result_cache_info()
+    assert cache_info.hits == 2
+    assert cache_info.misses == 3
+    assert cache_info.evictions == 1
+    assert cache_info.currsize == 2
+
+
+def test_result_cache_disabled(p):
+    p.parse("明日の10時")
+    p.parse("明日の10時")
+    assert p.result_cache_info().hits == 0
+    assert p.result_cache_info().currsize == 0
+
+
+def test_compact(p_ref):
+    timex_parser = TimexParser(compact=True, reference=pendulum.datetime(2021, 7, 18, tz="Asia/Tokyo"))
+    timexes = timex_parser.parse("2021年7月18日の3日後の10時")
+    assert all(isinstance(timex, CompactTIMEX) for timex in timexes)
+    assert [timex.to_tag() for timex in timexes] == [
+        timex.to_tag() for timex in p_ref.parse("2021年7月18日の3日後の10時")
+    ]
+    assert timexes[0].to_datetime() == pendulum.datetime(2021, 7, 18, tz="Asia/Tokyo")
+    assert timexes[0].raw_span == (0, 10)
+
+    assert all(isinstance(timex, CompactTIMEX) for timex in timex_parser.iter_parse(["2021年7月18日"]))
+
+
+def test_compact_keep_parsed_and_pattern(p_ref):
+    # 既定ではparsedは変換に必要なキーのみとなり、patternは保持しない
+    timex = TimexParser(compact=True).parse("2021年7月18日")[0]
+    assert timex.pattern is None
+
+    timex_parser = TimexParser(compact=True, keep_parsed=True, keep_pattern=True)
+    timex = timex_parser.parse("2021年7月18日")[0]
+    expected = p_ref.parse("2021年7月18日")[0]
+    assert isinstance(timex, CompactTIMEX)
+    assert timex.parsed == expected.parsed
+    assert timex.pattern is expected.pattern
+    assert list(timex_parser.iter_parse(["2021年7月18日"]))[0].pattern is expected.pattern
+
+
+def test_clock():
+    base_clock = FrozenClock(pendulum.datetime(2019, 1, 1))
+    timex_parser = TimexParser(clock=base_clock)
+    timexes = timex_parser.parse("7月18日と12月25日")
+    assert [timex.to_datetime() for timex in timexes] == [
+        pendulum.datetime(2019, 7, 18, tz="Asia/Tokyo"),
+        pendulum.datetime(2019, 12, 25, tz="Asia/Tokyo"),
+    ]
+
+    # 一度のパースで得られた時間情報表現は同じ固定された時計を共有する
+    timexes = TimexParser().parse("7月18日と12月25日")
+    assert timexes[0].clock is timexes[1].clock
+    batch_timexes = TimexParser().parse_batch(["7月18日", "12月25日"])
+    assert batch_timexes[0][0].clock is batch_timexes[1][0].clock
+
+
+def test_prepare_on_first_parse():
+    timex_parser = TimexParser()
+    assert timex_parser._extractor is None
+
+    timex_parser.parse("2021年7月18日")
+    assert timex_parser._extractor is not None
+    assert timex_parser.prepare() is timex_parser
@@ -0,0 +1,125 @@
+import re
+from datetime import datetime
+
+from ja_timex.util import (
+    add_months,
+    build_trie_regex,
+    expand_literal_pattern,
+    get_first_chars,
+    get_max_width,
+    get_required_chars,
+    is_parial_pattern_of_number_expression,
+    is_window_searchable,
+    may_start_with_digit,
+    parse_pattern,
+)
+
+
+def test_get_required_chars():
+    assert get_required_chars("(?P<calendar_month>1[0-2]|0?[1-9])月") == {"月"}
+    assert get_required_chars("(?P<second_with_ms>[0-9]+[秒][0-9]+)") == {"秒"}
+    assert get_required_chars("毎時(間)?") == {"毎", "時"}
+    assert get_required_chars("[先前昨]日") == {"日"}
+
+    # すべての選択肢に共通する文字のみ
+    assert get_required_chars("(一昨年|おととし)") == set()
+    assert get_required_chars("(前年|昨年)") == {"年"}
+
+
+def test_parse_pattern():
+    # 解析の関数は、一度変換した構文木をそのまま受け取る
+    re_pattern = "(?P<calendar_month>1[0-2]|0?[1-9])月"
+    parsed = parse_pattern(re_pattern)
+    assert parse_pattern(parsed) is parsed
+    assert get_required_chars(parsed) == get_required_chars(re_pattern) == {"月"}
+    assert get_max_width(parsed) == get_max_width(re_pattern) == 3
+    assert get_first_chars(parsed) == get_first_chars(re_pattern)
+
+
+def test_get_max_width():
+    assert get_max_width("(?P<calendar_month>1[0-2]|0?[1-9])月") == 3
+    assert get_max_width("(一昨年|おととし)") == 4
+    assert get_max_width("\\s{,1}\\(") == 2
+
+    # 上限のない繰り返し
+    assert get_max_width("(?P<year>[0-9]+)年") == 33
+    assert get_max_width("(?P<year>[0-9]+)年", max_repeat=4) == 5
+
+
+def test_get_first_chars():
+    assert get_first_chars("(?P<calendar_month>1[0-2]|0?[1-9])月") == set("0123456789")
+    assert get_first_chars("(西暦)?(?P<year>[0-9]+)年") == set("西0123456789")
+    assert get_first_chars("(?<![0-9])[先前昨]日") == {"先", "前", "昨"}
+
+    # 任意の文字や空文字列にマッチし得る場合は列挙できない
+    assert get_first_chars("(?P<text>.+)年") is None
+    assert get_first_chars("[0-9]*") is None
+
+
+def test_may_start_with_digit():
+    assert may_start_with_digit("(?P<calendar_day>[0-9]{1,2})日")
+    assert may_start_with_digit("(西暦)?(?P<year>[0-9]+)年")
+    assert not may_start_with_digit("毎(?P<unit>[年月])")
+    # 先頭の文字を列挙できない場合は数字になり得るとみなす
+    assert may_start_with_digit("(?P<text>.+)年")
+
+
+def test_is_parial_pattern_of_number_expression():
+    text = "これは13/13です"
+    assert is_parial_pattern_of_number_expression(re.search("3/13", text), text)
+    assert not is_parial_pattern_of_number_expression(re.search("13/13", text), text)
+    assert not is_parial_pattern_of_number_expression(re.match("これ", text), text)
+
+
+def test_is_window_searchable():
+    assert is_window_searchable("(?P<calendar_month>1[0-2]|0?[1-9])月")
+    assert is_window_searchable("(?P<year>[0-9]+)年")
+    # 後読みは扱えるが、先読みや位置指定は扱えない
+    assert is_window_searchable("(?<![0-9])(?P<year>[0-9]+)年")
+    assert not is_window_searchable("(?P<year>[0-9]+)年(?![0-9])")
+    assert not is_window_searchable("^(?P<year>[0-9]+)年")
+
+    # 上限のない繰り返しは、repeat_charsのみからなる1文字の繰り返しに限る
+    assert not is_window_searchable("(?P<text>.+)年")
+    assert not is_window_searchable("(年月)+")
+    assert is_window_searchable("[年月]+", repeat_chars="年月")
+
+
+def test_expand_literal_pattern():
+    assert expand_literal_pattern("[先前昨]日") == ["先日", "前日", "昨日"]
+    assert expand_literal_pattern("(翌々|明後)日") == ["翌々日", "明後日"]
+    assert expand_literal_pattern("毎時(間)?") == ["毎時", "毎時間"]
+    assert expand_literal_pattern("(?P<quarter>[1-4])Q") == ["1Q", "2Q", "3Q", "4Q"]
+
+    # 固定の文字列に展開できないもの
+    assert expand_literal_pattern("(?P<year>[0-9]+)年") is None
+    assert expand_literal_pattern("[^0-9]日") is None
+    assert expand_literal_pattern("(?i)q1") is None
+    # 上限を超えるもの、空文字列にマッチするもの
+    assert expand_literal_pattern("[0-9][0-9]日", max_strings=64) is None
+    assert expand_literal_pattern("(今日)?") is None
+
+
+def test_build_trie_regex():
+    assert build_trie_regex(["天平", "天平勝宝", "天平宝字", "大化"]) == "(?:天平(?:勝宝|宝字)?|大化)"
+    assert build_trie_regex(["ab", "ac", "a"]) == "a(?:[bc])?"
+    assert build_trie_regex(["R", "H", "令和"]) == "(?:R|H|令和)"
+    assert build_trie_regex(["a.b", "a-c"]) == "a(?:\\.b|\\-c)"
+    assert build_trie_regex([]) == "(?!)"
+
+
+def test_build_trie_regex_same_as_alternation():
+    words = ["天平", "天平勝宝", "天平宝字", "天平神護", "天長", "大化", "大宝", "R", "Ｒ", "令和"]
+    trie_pattern = re.compile(f"(?P<word>{build_trie_regex(words)})[0-9]+年")
+    alternation_pattern = re.compile(f"(?P<word>{'|'.join(words)})[0-9]+年")
+
+    text = "天平勝宝4年、天平5年、天長7年、R3年、令和1年、大化年、天平宝年"
+    assert [m.group("word") for m in trie_pattern.finditer(text)] == ["天平勝宝", "天平", "天長", "R", "令和"]
+    assert [m.span() for m in trie_pattern.finditer(text)] == [m.span() for m in alternation_pattern.finditer(text)]
+
+
+def test_add_months():
+    assert add_months(datetime(2021, 1, 31, 10), 1) == datetime(2021, 2, 28, 10)
+    assert add_months(datetime(2020, 1, 31), 1) == datetime(2020, 2, 29)
+    assert add_months(datetime(2021, 7, 18), -7) == datetime(2020, 12, 18)
+    assert add_months(datetime(2021, 7, 18), 24) == datetime(2023, 7, 18)
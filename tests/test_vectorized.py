@@ -0,0 +1,94 @@
+import pendulum
+import pytest
+
+from ja_timex.tag import TIMEX
+from ja_timex.timex import TimexParser
+from ja_timex.vectorized import to_datetime64
+
+np = pytest.importorskip("numpy")
+
+
+def to_naive_datetime64(timex):
+    dt = timex.to_datetime()
+    if dt is None:
+        return np.datetime64("NaT")
+    return np.datetime64(dt.replace(tzinfo=None), "us")
+
+
+def test_to_datetime64_same_as_to_datetime():
+    references = [
+        pendulum.datetime(2021, 7, 18, 12, 30, 15, tz="Asia/Tokyo"),
+        pendulum.datetime(2021, 1, 31, tz="Asia/Tokyo"),
+        pendulum.datetime(2020, 2, 29, 23, 59, tz="UTC"),
+    ]
+    texts = [
+        "2021年7月18日",
+        "7月18日の18時20分",
+        "令和3年と12月と20日",
+        "3日前と2時間後と1年後と1ヶ月前と1ヶ月後",
+        "30時間後と10分後と2年3ヶ月前",
+        "毎週3回と1週間",
+    ]
+
+    timexes = []
+    for reference in references:
+        timex_parser = TimexParser(reference=reference)
+        for text in texts:
+            timexes += timex_parser.parse(text)
+
+    expected = np.array([to_naive_datetime64(timex) for timex in timexes], dtype="datetime64[us]")
+    np.testing.assert_array_equal(to_datetime64(timexes), expected)
+
+
+def test_to_datetime64_over_24_hours():
+    # to_datetime()は月末に翌日の日付を作れないが、to_datetime64()は翌月の日付とする
+    timexes = TimexParser().parse("25時30分")
+    results = to_datetime64(timexes, references=pendulum.datetime(2021, 1, 31, tz="Asia/Tokyo"))
+    assert results.tolist() == [pendulum.naive(2021, 2, 1, 1, 30)]
+
+
+def test_to_datetime64_references():
+    timexes = TimexParser().parse("10時と3日後")
+    assert np.isnat(to_datetime64(timexes)).all()
+
+    results = to_datetime64(timexes, references=pendulum.datetime(2021, 7, 18, tz="Asia/Tokyo"))
+    assert results.tolist() == [pendulum.naive(2021, 7, 18, 10), pendulum.naive(2021, 7, 21)]
+
+    results = to_datetime64(
+        timexes, references=[pendulum.datetime(2021, 7, 18, tz="Asia/Tokyo"), pendulum.datetime(2021, 12, 30)]
+    )
+    assert results.tolist() == [pendulum.naive(2021, 7, 18, 10), pendulum.naive(2022, 1, 2)]
+
+    with pytest.raises(ValueError):
+        to_datetime64(timexes, references=[None])
+
+
+def test_to_datetime64_fractional_duration():
+    reference = pendulum.datetime(2021, 7, 18, 12, tz="Asia/Tokyo")
+    timexes = TimexParser(reference=reference).parse("1.5時間後と3時間後と0.5日前と10時")
+    assert [timex.text for timex in timexes] == ["1.5時間後", "3時間後", "0.5日前", "10時"]
+
+    # to_datetime()が例外となる小数の値は、その行のみNaTとする
+    with pytest.raises(ValueError):
+        timexes[0].to_datetime()
+    results = to_datetime64(timexes)
+    assert np.isnat(results).tolist() == [True, False, True, False]
+    assert results[[1, 3]].tolist() == [pendulum.naive(2021, 7, 18, 15), pendulum.naive(2021, 7, 18, 10)]
+
+
+def test_to_datetime64_default_year():
+    timex = TIMEX(
+        type="DATE", value="XXXX-07-18", text="7月18日", parsed={"calendar_month": "07", "calendar_day": "18"}
+    )
+    results = to_datetime64([timex], now=pendulum.datetime(2019, 1, 1))
+    assert results.tolist() == [pendulum.naive(2019, 7, 18)]
+
+
+def test_to_datetime64_invalid_date():
+    timex = TIMEX(
+        type="DATE",
+        value="2021-02-30",
+        text="2021年2月30日",
+        parsed={"calendar_year": "2021", "calendar_month": "02", "calendar_day": "30"},
+    )
+    assert np.isnat(to_datetime64([timex])).all()
@@ -0,0 +1,86 @@
+"""parse()のループ、parse_batch、parse_columnsの処理速度を比較するベンチマーク
+
+Usage:
+    python tools/benchmark_batch.py --n-texts 3460 --repeat 3
+"""
+import argparse
+import random
+import time
+
+from ja_timex.timex import TimexParser
+
+sentences = [
+    "彼は2008年4月から週に3回ジョギングを1時間行ってきた。",
+    "令和3年4月1日午前10時30分に開始する。",
+    "毎年6月から8月にかけて開催される。",
+    "今夜9時スタートです。",
+    "来週の月曜日に打ち合わせがあります。",
+    "2021/07/18の12:30:45pmに到着した。",
+    "紀元前3世紀の遺跡から1,000年前の土器が見つかった。",
+    "第3四半期の売上は前年比で120%だった。",
+    "一昨年と一昨日は言うのに一昨月とは言わない。",
+    "二〇二一年七月十八日の三十分間",
+    "これは時間情報表現を含まない普通の文章です。",
+    "特に記載のない限り、本書の内容は変更されることがあります。",
+]
+
+
+def make_texts(n_texts: int, seed: int = 0) -> list:
+    # 1から3文からなる短い文書
+    random.seed(seed)
+    return ["".join(random.choice(sentences) for _ in range(random.randint(1, 3))) for _ in range(n_texts)]
+
+
+def signature(timexes):
+    return [(timex.type, timex.value, timex.text, timex.span, timex.raw_span) for timex in timexes]
+
+
+def column_signature(columns) -> list:
+    column_dict = columns.to_dict()
+    names = ["doc_id", "type", "value", "text", "start", "end", "raw_start", "raw_end"]
+    return [
+        (doc_id, type_name, value, text, (start, end), (raw_start, raw_end))
+        for doc_id, type_name, value, text, start, end, raw_start, raw_end in zip(
+            *[column_dict[name] for name in names]
+        )
+    ]
+
+
+def best_of(repeat: int, func) -> float:
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed.append(time.perf_counter() - start)
+    return min(elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-texts", type=int, default=3460)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    texts = make_texts(args.n_texts)
+    timex_parser = TimexParser().prepare()
+    print(f"{len(texts)} texts, {sum(len(text) for text in texts)} chars")
+
+    expected = [signature(timex_parser.parse(text)) for text in texts]
+    loop_elapsed = best_of(args.repeat, lambda: [timex_parser.parse(text) for text in texts])
+    print(f"{'parse loop':>22}: {loop_elapsed:.3f} sec (best of {args.repeat})")
+
+    for batch_size in [10, 100, 1000, len(texts)]:
+        batches = [texts[i : i + batch_size] for i in range(0, len(texts), batch_size)]
+        results = [signature(timexes) for batch in batches for timexes in timex_parser.parse_batch(batch)]
+        same = "same" if results == expected else "DIFFERENT"
+        elapsed = best_of(args.repeat, lambda: [timex_parser.parse_batch(batch) for batch in batches])
+        print(f"{f'parse_batch({batch_size})':>22}: {elapsed:.3f} sec (x{loop_elapsed / elapsed:.2f}), output: {same}")
+
+    expected_columns = [(doc_id, *timex) for doc_id, timexes in enumerate(expected) for timex in timexes]
+    same = "same" if column_signature(timex_parser.parse_columns(texts)) == expected_columns else "DIFFERENT"
+    elapsed = best_of(args.repeat, lambda: timex_parser.parse_columns(texts))
+    print(f"{'parse_columns':>22}: {elapsed:.3f} sec (x{loop_elapsed / elapsed:.2f}), output: {same}")
+
+
+if __name__ == "__main__":
+    main()
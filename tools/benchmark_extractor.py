@@ -0,0 +1,64 @@
+"""Extractorごとの抽出速度を比較するベンチマーク
+
+Usage:
+    python tools/benchmark_extractor.py --n-sentences 3000 --repeat 3
+"""
+import argparse
+import random
+import time
+
+from ja_timex.extractor import extractors
+from ja_timex.timex import TimexParser
+
+sentences = [
+    "彼は2008年4月から週に3回ジョギングを1時間行ってきた。",
+    "令和3年4月1日午前10時30分に開始する。",
+    "毎年6月から8月にかけて開催される。",
+    "今夜9時スタートです。",
+    "来週の月曜日に打ち合わせがあります。",
+    "2021/07/18の12:30:45pmに到着した。",
+    "紀元前3世紀の遺跡から1,000年前の土器が見つかった。",
+    "第3四半期の売上は前年比で120%だった。",
+    "これは時間情報表現を含まない普通の文章です。",
+    "特に記載のない限り、本書の内容は変更されることがあります。",
+]
+
+
+def make_document(n_sentences: int, seed: int = 0) -> str:
+    random.seed(seed)
+    return "".join(random.choice(sentences) for _ in range(n_sentences))
+
+
+def signature(timexes):
+    return [(timex.type, timex.value, timex.text, timex.span) for timex in timexes]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-sentences", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    document = make_document(args.n_sentences)
+    print(f"document length: {len(document)} chars")
+
+    expected = None
+    for name in extractors:
+        timex_parser = TimexParser(extractor=name)
+        processed_text = timex_parser._normalize_number(document)
+
+        elapsed = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            timex_parser._extract(processed_text)
+            elapsed.append(time.perf_counter() - start)
+
+        result = signature(timex_parser.parse(document))
+        if expected is None:
+            expected = result
+        same = "same" if result == expected else "DIFFERENT"
+        print(f"{name:>10}: extract {min(elapsed):.3f} sec (best of {args.repeat}), output: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""ja_timexのimportと初回のパースにかかる時間を計測するベンチマーク
+
+python -X importtime の累積時間を、別プロセスで複数回計測した中央値で表示する。
+
+Usage:
+    python tools/benchmark_import_time.py --repeat 5
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+statements = {
+    "import ja_timex": ("import ja_timex", "ja_timex"),
+    "from ja_timex import TimexParser": ("from ja_timex import TimexParser", "ja_timex.timex"),
+    "import ja_timex.pattern.abstime": ("import ja_timex.pattern.abstime", "ja_timex.pattern.abstime"),
+}
+
+first_parse_code = """
+import time
+start = time.perf_counter()
+from ja_timex import TimexParser
+TimexParser().parse("2021年7月18日")
+print(time.perf_counter() - start)
+"""
+
+
+def importtime_usec(statement: str, module: str) -> int:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement], capture_output=True, text=True, check=True
+    )
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        _, cumulative, name = line.split("|")
+        if name.strip() == module:
+            return int(cumulative)
+    raise ValueError(f"{module} is not imported by {statement}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for label, (statement, module) in statements.items():
+        elapsed = [importtime_usec(statement, module) for _ in range(args.repeat)]
+        print(f"{label:>35}: {statistics.median(elapsed) / 1000:.1f} msec")
+
+    elapsed = []
+    for _ in range(args.repeat):
+        result = subprocess.run([sys.executable, "-c", first_parse_code], capture_output=True, text=True, check=True)
+        elapsed.append(float(result.stdout))
+    print(f"{'import and first parse':>35}: {statistics.median(elapsed) * 1000:.1f} msec")
+
+
+if __name__ == "__main__":
+    main()
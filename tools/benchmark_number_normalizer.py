@@ -0,0 +1,74 @@
+"""NumberNormalizerの規格化の速度を文書の長さごとに計測するベンチマーク
+
+漢数字を多く含む文書に対して、処理時間が文書の長さに比例することを確認する。
+また、全角数字とカンマの規格化を、以前のmojimojiとre.searchによる3段階の処理と比較する。
+以前の処理は最初の1箇所しか規格化しないため、処理量は同等ではなく速度の比較のみを目的とする。
+
+Usage:
+    python tools/benchmark_number_normalizer.py --repeat 3
+"""
+
+import argparse
+import re
+import time
+
+import mojimoji
+
+from ja_timex.number_normalizer import NumberNormalizer
+
+sentences = [
+    "平成二十三年三月十一日午後二時四十六分に発生した。",
+    "売上高は１，２３４，５６７千円で、前年比１２．５％増となった。",
+    "一時的に二十人ほどが集まり、三十分後に解散した。",
+    "第百二十三条の規定により、千九百九十九年十二月三十一日まで有効とする。",
+]
+
+
+def legacy_zen_to_han_and_remove_comma(text: str) -> str:
+    text = mojimoji.zen_to_han(text, kana=False, ascii=False)
+    re_match = re.search("[0-9][，．][0-9]", text)
+    if re_match:
+        number_start_i, number_end_i = re_match.span()
+        replaced_text = re_match.group().replace("，", ",").replace("．", ".")
+        text = text[:number_start_i] + replaced_text + text[number_end_i:]
+
+    re_match = re.search("(([0-9]{1,3}(,[0-9]{3})*)(?![0-9]))", text)
+    if re_match:
+        number_start_i, number_end_i = re_match.span()
+        replaced_text = re_match.group().replace(",", "")
+        text = text[:number_start_i] + replaced_text + text[number_end_i:]
+    return text
+
+
+def best_time(func, text: str, repeat: int) -> float:
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        elapsed.append(time.perf_counter() - start)
+    return min(elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    nn = NumberNormalizer()
+    for n_sentences in [100, 1000, 10000]:
+        document = "".join(sentences[i % len(sentences)] for i in range(n_sentences))
+
+        best = best_time(nn.normalize, document, args.repeat)
+        print(f"{len(document):>8} chars: {best:.4f} sec, {best / len(document) * 1e6:.3f} usec/char")
+
+    # 全角数字とカンマの規格化のみの比較
+    document = "".join(sentences[i % len(sentences)] for i in range(10000))
+    legacy = best_time(legacy_zen_to_han_and_remove_comma, document, args.repeat)
+    current = best_time(
+        lambda text: nn._remove_comma_inside_digits(nn._normalize_zen_to_han(text)), document, args.repeat
+    )
+    print(f"zen_to_han + remove comma: legacy {legacy:.4f} sec (first occurrence only), current {current:.4f} sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""和暦の元号の正規表現の形による抽出速度を比較するベンチマーク
+
+元号を"|"で並べた正規表現と、トライ木の形にまとめた正規表現(Place.wareki_prefix)とで、
+和暦を含むパターンの抽出時間と結果を比較する。
+
+Usage:
+    python tools/benchmark_wareki.py --n-sentences 3000 --repeat 3
+"""
+
+import argparse
+import random
+import re
+import time
+
+from ja_timex.pattern.abstime import patterns
+from ja_timex.pattern.place import Place, load_wareki2year
+from ja_timex.timex import TimexParser
+
+# 和暦の日付を多く含む、歴史に関する文章
+sentences = [
+    "天平勝宝4年4月9日に東大寺の大仏の開眼供養が行われた。",
+    "延暦13年10月22日、桓武天皇は平安京に遷都した。",
+    "慶長5年9月15日に関ヶ原の戦いが起こった。",
+    "元禄15年12月14日の夜、赤穂浪士が吉良邸に討ち入った。",
+    "嘉永6年6月3日、ペリーの艦隊が浦賀沖に来航した。",
+    "明治22年2月11日に大日本帝国憲法が発布された。",
+    "昭和39年10月10日、東京オリンピックが開幕した。",
+    "H31.4.30に退位の礼が行われ、翌日に改元された。",
+    "寺の記録によれば、この堂は度々の火災の後に再建されたという。",
+    "境内には室町時代に植えられたと伝わる古木が残っている。",
+]
+
+
+def make_document(n_sentences: int, seed: int = 0) -> str:
+    random.seed(seed)
+    return "".join(random.choice(sentences) for _ in range(n_sentences))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-sentences", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    document = make_document(args.n_sentences)
+    processed_text = TimexParser().number_normalizer.normalize(document)
+    print(f"document length: {len(document)} chars")
+
+    trie_prefix = Place().wareki_prefix
+    alternation_prefix = f"(?P<wareki_prefix>({'|'.join(load_wareki2year().keys())}))"
+    wareki_patterns = [pattern.re_pattern for pattern in patterns if trie_prefix in pattern.re_pattern]
+    print(f"wareki patterns: {len(wareki_patterns)}")
+
+    expected = None
+    for name, prefix in [("alternation", alternation_prefix), ("trie", trie_prefix)]:
+        compiled = [re.compile(re_pattern.replace(trie_prefix, prefix)) for re_pattern in wareki_patterns]
+
+        elapsed = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = [(m.span(), m.group("wareki_prefix")) for c in compiled for m in c.finditer(processed_text)]
+            elapsed.append(time.perf_counter() - start)
+
+        if expected is None:
+            expected = result
+        same = "same" if result == expected else "DIFFERENT"
+        print(f"{name:>12}: extract {min(elapsed):.3f} sec (best of {args.repeat}), output: {same}")
+
+
+if __name__ == "__main__":
+    main()
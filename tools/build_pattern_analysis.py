@@ -0,0 +1,50 @@
+"""デフォルトのパターンの正規表現の解析結果を、ja_timex/dictionary/pattern_analysis.jsonに書き出す
+
+パターンの定義や和暦の辞書を変更した場合に実行する。
+ここに含まれない正規表現は、Patternが初回の参照時に構文木から解析する。
+
+Usage:
+    python tools/build_pattern_analysis.py
+"""
+
+import json
+
+from ja_timex.extractor import BaseExtractor
+from ja_timex.pattern.abstime import patterns as abstime_patterns
+from ja_timex.pattern.duration import patterns as duration_patterns
+from ja_timex.pattern.place import pattern_analysis_path
+from ja_timex.pattern.reltime import patterns as reltime_patterns
+from ja_timex.pattern.set import patterns as set_patterns
+from ja_timex.util import expand_literal_pattern, get_required_chars, may_start_with_digit, parse_pattern
+
+
+def analyze(re_pattern: str, max_keywords: int) -> dict:
+    parsed = parse_pattern(re_pattern)
+    return {
+        "required_chars": "".join(sorted(get_required_chars(parsed))),
+        "starts_with_digit": may_start_with_digit(parsed),
+        "keywords": expand_literal_pattern(parsed, max_strings=max_keywords),
+    }
+
+
+def main():
+    max_keywords = BaseExtractor.max_keywords_per_pattern
+    re_patterns = sorted(
+        {
+            pattern.re_pattern
+            for patterns in [abstime_patterns, duration_patterns, reltime_patterns, set_patterns]
+            for pattern in patterns
+        }
+    )
+    analysis = {
+        "max_keywords": max_keywords,
+        "patterns": {re_pattern: analyze(re_pattern, max_keywords) for re_pattern in re_patterns},
+    }
+    with open(pattern_analysis_path, "w", encoding="utf8") as f:
+        json.dump(analysis, f, ensure_ascii=False, indent=1)
+        f.write("\n")
+    print(f"{len(re_patterns)} patterns -> {pattern_analysis_path}")
+
+
+if __name__ == "__main__":
+    main()